@@ -0,0 +1,156 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compares the Atlas traffic of AtlasProxy description reads and writes with the former full entity fetches.
+
+Serves a synthetic wide table (many columns, each with a long description, all sent back as referred entities
+of the table) from a local Atlas stub, then reads and writes the table description and tags the table, first the
+former way (fetching the whole table entity by unique attribute), then through AtlasProxy, which fetches it
+without its relationships and referred entities. Reports the requests sent, the bytes transferred and the time per
+operation.
+
+Usage:
+    python -m benchmarks.atlas_description_fetch --columns 2000 --iterations 20
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Tuple  # noqa: F401
+from urllib.parse import urlparse
+
+from metadata_service import create_app
+from metadata_service.proxy.atlas_proxy import AtlasProxy
+
+CLUSTER, DB, NAME = 'wide_cluster', 'wide_db', 'wide_table'
+TABLE_URI = 'hive_table://{}.{}/{}'.format(CLUSTER, DB, NAME)
+TABLE_QN = '{}.{}@{}'.format(DB, NAME, CLUSTER)
+TABLE_GUID = 'wide-table-guid'
+
+
+def _wide_table(num_columns: int, description_size: int) -> Dict[str, Any]:
+    columns = {
+        'column-{}'.format(i): {
+            'guid': 'column-{}'.format(i),
+            'typeName': 'hive_column',
+            'status': 'ACTIVE',
+            'attributes': {'qualifiedName': '{}.{}.col_{}@{}'.format(DB, NAME, i, CLUSTER), 'name': 'col_{}'.format(i),
+                           'type': 'int', 'position': i, 'description': 'x' * description_size},
+        } for i in range(num_columns)
+    }
+    table = {
+        'guid': TABLE_GUID,
+        'typeName': 'hive_table',
+        'status': 'ACTIVE',
+        'attributes': {'qualifiedName': TABLE_QN, 'name': NAME, 'description': 'wide table',
+                       'columns': [{'guid': guid, 'typeName': 'hive_column'} for guid in columns]},
+        'relationshipAttributes': {'columns': [{'guid': guid, 'typeName': 'hive_column'} for guid in columns]},
+    }
+    return {'entity': table, 'referredEntities': columns}
+
+
+class _AtlasStub(HTTPServer):
+    """Answers the few Atlas REST calls made by the benchmark and counts the bytes going through it."""
+
+    def __init__(self, table: Dict[str, Any]) -> None:
+        super().__init__(('127.0.0.1', 0), _AtlasStubHandler)
+        self.table_body = json.dumps(table).encode()
+        # minExtInfo leaves the referred entities out, ignoreRelationships the relationship attributes
+        self.header_body = json.dumps({'entity': {key: value for key, value in table['entity'].items()
+                                                  if key != 'relationshipAttributes'}}).encode()
+        self.requests = 0
+        self.bytes = 0
+
+
+class _AtlasStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server = None  # type: _AtlasStub
+
+    def _respond(self) -> None:
+        request_body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        url = urlparse(self.path)
+        if self.command == 'GET' and '/entity/uniqueAttribute/' in url.path:
+            minimal = 'minExtInfo=true' in url.query and 'ignoreRelationships=true' in url.query
+            body = self.server.header_body if minimal else self.server.table_body
+        else:
+            body = b'{}'
+        self.server.requests += 1
+        self.server.bytes += len(self.path) + len(request_body) + len(body)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _respond
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _measure(stub: _AtlasStub, operation: Callable[[], Any], iterations: int) -> Tuple[float, float, float]:
+    """:return: requests, bytes transferred and seconds per call of operation"""
+    stub.requests, stub.bytes = 0, 0
+    start = time.time()
+    for _ in range(iterations):
+        operation()
+    elapsed = time.time() - start
+    return stub.requests / iterations, stub.bytes / iterations, elapsed / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--columns', type=int, default=2000)
+    parser.add_argument('--description-size', type=int, default=200, help='characters per column description')
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    stub = _AtlasStub(_wide_table(args.columns, args.description_size))
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    app = create_app(config_module_class='metadata_service.config.LocalConfig')
+    app.app_context().push()
+    # the debug logs of the Atlas client print every response body, which would dominate the timings
+    logging.disable(logging.INFO)
+    proxy = AtlasProxy(host='127.0.0.1', port=stub.server_address[1])
+
+    def legacy_get_description() -> Any:
+        entity = proxy._driver.entity_unique_attribute('hive_table', qualifiedName=TABLE_QN)
+        return entity.entity['attributes'].get('description')
+
+    def legacy_put_description() -> None:
+        entity = proxy._driver.entity_unique_attribute('hive_table', qualifiedName=TABLE_QN)
+        entity.entity['attributes']['description'] = 'new description'
+        entity.update()
+
+    def legacy_add_tag() -> None:
+        entity = proxy._driver.entity_unique_attribute('hive_table', qualifiedName=TABLE_QN)
+        proxy._driver.entity_bulk_classification.create(data={'classification': {'typeName': 'benchmark'},
+                                                              'entityGuids': [entity.entity['guid']]})
+
+    operations = [
+        ('legacy get description', legacy_get_description),
+        ('get description', lambda: proxy.get_table_description(table_uri=TABLE_URI)),
+        ('legacy put description', legacy_put_description),
+        ('put description', lambda: proxy.put_table_description(table_uri=TABLE_URI, description='new description')),
+        ('legacy add tag', legacy_add_tag),
+        ('add tag', lambda: proxy.add_tag(id=TABLE_URI, tag='benchmark', tag_type='default')),
+    ]  # type: List[Tuple[str, Callable[[], Any]]]
+    try:
+        print('{:<24}{:>10}{:>16}{:>12}'.format('operation', 'requests', 'bytes', 'elapsed'))
+        for label, operation in operations:
+            requests, transferred, elapsed = _measure(stub, operation, args.iterations)
+            print('{:<24}{:>10.1f}{:>16,.0f}{:>11.4f}s'.format(label, requests, transferred, elapsed))
+    finally:
+        stub.shutdown()
+        stub.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
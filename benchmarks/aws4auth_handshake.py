@@ -0,0 +1,62 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the cost of signing the websocket handshakes of Aws4AuthWebsocketTransport.
+
+Signs handshakes to a Neptune url (nothing is sent, the signature is all a connect computes before opening its
+socket) from a rising number of threads, each with its own transport as in the driver's pool, and reports the
+handshakes signed per second, the mean time per handshake and the handshakes failed, e.g. a reconnect storm after a
+failover.
+
+Usage:
+    python -m benchmarks.aws4auth_handshake --handshakes 2000 --concurrency 1 8 32
+"""
+
+import argparse
+import sys
+import threading
+import time
+from typing import List  # noqa: F401
+
+from metadata_service.proxy.aws4authwebsocket.transport import Aws4AuthWebsocketTransport
+
+URL = 'wss://benchmark.cluster-xxxxxxxxxxxx.us-east-1.neptune.amazonaws.com:8182/gremlin'
+
+
+def _sign(transport: Aws4AuthWebsocketTransport, handshakes: int, failures: List[int]) -> None:
+    for _ in range(handshakes):
+        try:
+            headers = transport._make_extra_headers(URL, {})
+            assert 'Authorization' in headers and 'Sec-WebSocket-Key' in headers, headers
+        except Exception:
+            failures.append(1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--handshakes', type=int, default=2000, help='handshakes signed per measurement')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32], help='signing threads')
+    args = parser.parse_args()
+
+    print('{:<10}{:>16}{:>14}{:>10}'.format('threads', 'handshakes/s', 'mean', 'failed'))
+    for concurrency in args.concurrency:
+        failures = []  # type: List[int]
+        threads = [threading.Thread(target=_sign, args=(
+            Aws4AuthWebsocketTransport(aws_access_key_id='benchmark_key', aws_secret_access_key='benchmark_secret',
+                                       service_region='us-east-1'),
+            args.handshakes // concurrency, failures)) for _ in range(concurrency)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        handshakes = args.handshakes // concurrency * concurrency
+        print('{:<10}{:>16.1f}{:>12.3f}ms{:>10}'.format(
+            concurrency, handshakes / elapsed, elapsed / handshakes * 1000, len(failures)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Compares the throughput of the gremlin driver over WebsocketClientTransport with the WebsocketMultiplexer.
+
+Serves Gremlin requests from a local websocket stand-in, which answers each request after a fixed latency (the
+round trip to Neptune) and answers the requests of a websocket concurrently, as Gremlin Server does. Then submits
+requests from a rising number of threads, first with one request at a time per websocket (the driver's pool of
+transports), then with the transports multiplexed over the same number of websockets, and reports the requests
+per second of each.
+
+Usage:
+    python -m benchmarks.gremlin_multiplexing --latency-ms 20 --connections 4 --max-in-flight 16
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import re
+import socketserver
+import struct
+import sys
+import threading
+import time
+from typing import Any, Callable, List, Optional  # noqa: F401
+
+from gremlin_python.driver.client import Client
+
+from metadata_service.proxy.aws4authwebsocket.transport import WebsocketClientTransport, WebsocketMultiplexer
+
+WEBSOCKET_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+REQUEST_ID = re.compile(rb'"requestId"\s*:\s*\{[^{}]*?"@value"\s*:\s*"([^"]+)"')
+OPCODE_BINARY, OPCODE_CLOSE, OPCODE_PING, OPCODE_PONG = 0x2, 0x8, 0x9, 0xA
+
+
+class _GremlinServerStandIn(socketserver.ThreadingTCPServer):
+    """Accepts websockets and answers every Gremlin request on them with a single result, after latency seconds."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(('127.0.0.1', 0), _GremlinServerStandInHandler)
+        self.latency = latency
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        return 'ws://{}:{}/gremlin'.format(*self.server_address)
+
+
+class _GremlinServerStandInHandler(socketserver.StreamRequestHandler):
+    server: _GremlinServerStandIn
+
+    def handle(self) -> None:
+        if not self._handshake():
+            return
+        self.server.connections += 1
+        self.write_lock = threading.Lock()
+        while True:
+            frame = self._read_frame()
+            if frame is None:
+                return
+            opcode, payload = frame
+            if opcode == OPCODE_CLOSE:
+                self._write_frame(OPCODE_CLOSE, payload[:2])
+                return
+            elif opcode == OPCODE_PING:
+                self._write_frame(OPCODE_PONG, payload)
+            elif opcode == OPCODE_BINARY:
+                match = REQUEST_ID.search(payload)
+                if match is not None:
+                    timer = threading.Timer(self.server.latency, self._respond, args=(match.group(1).decode(),))
+                    timer.daemon = True
+                    timer.start()
+
+    def _handshake(self) -> bool:
+        headers = {}
+        self.rfile.readline()
+        while True:
+            line = self.rfile.readline().decode('latin-1').strip()
+            if not line:
+                break
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+        if 'sec-websocket-key' not in headers:
+            return False
+        accept = base64.b64encode(hashlib.sha1(headers['sec-websocket-key'].encode() + WEBSOCKET_GUID).digest())
+        self.wfile.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                         b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        return True
+
+    def _read_frame(self) -> Optional[Any]:
+        head = self.rfile.read(2)
+        if len(head) < 2:
+            return None
+        opcode, length = head[0] & 0x0F, head[1] & 0x7F
+        if length == 126:
+            length, = struct.unpack('!H', self.rfile.read(2))
+        elif length == 127:
+            length, = struct.unpack('!Q', self.rfile.read(8))
+        mask = self.rfile.read(4) if head[1] & 0x80 else b'\x00' * 4
+        payload = self.rfile.read(length)
+        return opcode, bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        if len(payload) < 126:
+            head = struct.pack('!BB', 0x80 | opcode, len(payload))
+        elif len(payload) < 1 << 16:
+            head = struct.pack('!BBH', 0x80 | opcode, 126, len(payload))
+        else:
+            head = struct.pack('!BBQ', 0x80 | opcode, 127, len(payload))
+        with self.write_lock:
+            try:
+                self.wfile.write(head + payload)
+            except OSError:
+                pass
+
+    def _respond(self, request_id: str) -> None:
+        self._write_frame(OPCODE_BINARY, json.dumps({
+            'requestId': request_id,
+            'status': {'message': '', 'code': 200, 'attributes': {'@type': 'g:Map', '@value': []}},
+            'result': {'data': {'@type': 'g:List', '@value': [{'@type': 'g:Int64', '@value': 1}]},
+                       'meta': {'@type': 'g:Map', '@value': []}}}).encode())
+
+
+def _requests_per_second(client: Client, concurrency: int, duration: float) -> float:
+    deadline = time.time() + duration
+    counts = [0] * concurrency
+
+    def submit(index: int) -> None:
+        while time.time() < deadline:
+            client.submit('g.V().count()').all().result()
+            counts[index] += 1
+
+    start = time.time()
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts) / (time.time() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=20, help='round trip of a request to the stand-in')
+    parser.add_argument('--connections', type=int, default=4, help='websockets, and pool size of the driver')
+    parser.add_argument('--max-in-flight', type=int, default=16, help='requests in flight per multiplexed websocket')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64], help='submitting threads')
+    parser.add_argument('--duration', type=float, default=3, help='seconds per measurement')
+    args = parser.parse_args()
+
+    server = _GremlinServerStandIn(latency=args.latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def multiplexed_client() -> Client:
+        multiplexer = WebsocketMultiplexer(num_connections=args.connections, max_in_flight=args.max_in_flight)
+        return Client(server.url, 'g', pool_size=multiplexer.max_requests_in_flight,
+                      max_workers=multiplexer.max_requests_in_flight, transport_factory=multiplexer.transport)
+
+    transports = [('websocket', lambda: Client(server.url, 'g', pool_size=args.connections,
+                                               max_workers=max(args.concurrency),
+                                               transport_factory=WebsocketClientTransport)),
+                  ('multiplexed', multiplexed_client)]  # type: List[Any]
+    print('{:<14}{:>12}{:>14}{:>14}'.format('transport', 'threads', 'requests/s', 'websockets'))
+    try:
+        for label, make_client in transports:
+            for concurrency in args.concurrency:
+                connections = server.connections
+                client = make_client()
+                try:
+                    rate = _requests_per_second(client, concurrency, args.duration)
+                finally:
+                    client.close()
+                print('{:<14}{:>12}{:>14.1f}{:>14}'.format(label, concurrency, rate, server.connections - connections))
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
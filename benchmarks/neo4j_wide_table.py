@@ -0,0 +1,188 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Profiles Neo4jProxy.get_table queries against a synthetic wide table.
+
+Seeds a table with many columns, each with many stats and badges, runs the proxy's column and table level
+queries (and the former chained OPTIONAL MATCH versions as a baseline) with PROFILE and reports db hits and the
+peak number of rows flowing through any operator. Exits with status 1 when a proxy query's peak rows grow
+beyond what independent aggregation needs, i.e. when it regresses back to a cartesian expansion.
+
+Usage:
+    python -m benchmarks.neo4j_wide_table --host bolt://localhost --port 7687 --password test
+"""
+
+import argparse
+import sys
+import textwrap
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple  # noqa: F401
+
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+
+TABLE_KEY = 'benchmark://wide_cluster.wide_schema/wide_table'
+
+LEGACY_COLUMN_QUERY = textwrap.dedent("""
+MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
+-[:TABLE]->(tbl:Table {key: $tbl_key})-[:COLUMN]->(col:Column)
+OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+OPTIONAL MATCH (col:Column)-[:DESCRIPTION]->(col_dscrpt:Description)
+OPTIONAL MATCH (col:Column)-[:STAT]->(stat:Stat)
+OPTIONAL MATCH (col:Column)-[:HAS_BADGE]->(badge:Badge)
+RETURN db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, collect(distinct stat) as col_stats,
+collect(distinct badge) as col_badges
+ORDER BY col.sort_order;""")
+
+LEGACY_TABLE_QUERY = textwrap.dedent("""
+MATCH (tbl:Table {key: $tbl_key})
+OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
+OPTIONAL MATCH (application:Application)-[:GENERATES]->(tbl)
+OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
+OPTIONAL MATCH (owner:User)<-[:OWNER]-(tbl)
+OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag{tag_type: $tag_normal_type})
+OPTIONAL MATCH (tbl)-[:HAS_BADGE]->(badge:Badge)
+OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
+OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description)
+RETURN collect(distinct wmk) as wmk_records,
+application,
+t.last_updated_timestamp as last_updated_timestamp,
+collect(distinct owner) as owner_records,
+collect(distinct tag) as tag_records,
+collect(distinct badge) as badge_records,
+src,
+collect(distinct prog_descriptions) as prog_descriptions
+""")
+
+SEED_QUERIES = [
+    textwrap.dedent("""
+    MERGE (db:Database {key: 'benchmark_database', name: 'benchmark'})
+    MERGE (db)-[:CLUSTER]->(clstr:Cluster {key: 'benchmark://wide_cluster', name: 'wide_cluster'})
+    MERGE (clstr)-[:SCHEMA]->(schema:Schema {key: 'benchmark://wide_cluster.wide_schema', name: 'wide_schema'})
+    MERGE (schema)-[:TABLE]->(tbl:Table {key: $tbl_key, name: 'wide_table', is_view: false})
+    MERGE (tbl)-[:DESCRIPTION]->(:Description {key: $tbl_key + '/_description', description: 'wide table'})
+    WITH tbl
+    UNWIND range(1, $num_table_relations) as i
+    MERGE (tbl)<-[:BELONG_TO_TABLE]-(:Watermark {key: $tbl_key + '/wmk_' + i + '/', partition_key: 'ds',
+                                                 partition_value: toString(i), create_time: 'now'})
+    MERGE (tbl)-[:OWNER]->(:User {key: 'owner_' + i + '@benchmark', email: 'owner_' + i + '@benchmark'})
+    MERGE (tbl)-[:TAGGED_BY]->(:Tag {key: 'benchmark_tag_' + i, tag_type: 'default'})
+    MERGE (tbl)-[:HAS_BADGE]->(:Badge {key: 'benchmark_badge_' + i, category: 'table_status'})
+    """),
+    textwrap.dedent("""
+    MATCH (tbl:Table {key: $tbl_key})
+    UNWIND range(0, $num_columns - 1) as i
+    CREATE (tbl)-[:COLUMN]->(col:Column {key: $tbl_key + '/col_' + i, name: 'col_' + i, type: 'int',
+                                         sort_order: i})
+    CREATE (col)-[:DESCRIPTION]->(:Description {key: $tbl_key + '/col_' + i + '/_description',
+                                                description: 'column ' + i})
+    WITH col
+    UNWIND range(1, $num_stats) as j
+    CREATE (col)-[:STAT]->(:Stat {key: col.key + '/stat_' + j, stat_name: 'stat_' + j, stat_val: '1',
+                                  start_epoch: '1', end_epoch: '2'})
+    WITH DISTINCT col
+    UNWIND range(1, $num_badges) as k
+    MERGE (badge:Badge {key: 'benchmark_column_badge_' + k, category: 'column'})
+    CREATE (col)-[:HAS_BADGE]->(badge)
+    """),
+]
+
+CLEANUP_QUERY = textwrap.dedent("""
+MATCH (n) WHERE n.key STARTS WITH 'benchmark' OR n.key ENDS WITH '@benchmark'
+DETACH DELETE n
+""")
+
+
+class _ProfiledResult:
+    """Fully consumed query result, quacking like BoltStatementResult for Neo4jProxy."""
+
+    def __init__(self, records: List[Any]) -> None:
+        self._records = records
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._records)
+
+    def single(self) -> Optional[Any]:
+        return self._records[0] if self._records else None
+
+
+class ProfilingNeo4jProxy(Neo4jProxy):
+    """Neo4jProxy running every statement with PROFILE and keeping the execution plans."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.profiles = []  # type: List[Tuple[str, Any, int, float]]
+
+    def _execute_cypher_query(self, *, statement: str, param_dict: Dict[str, Any]) -> _ProfiledResult:
+        return self.profile(statement=statement, param_dict=param_dict)
+
+    def profile(self, *, statement: str, param_dict: Dict[str, Any]) -> _ProfiledResult:
+        with self._driver.session() as session:
+            start = time.time()
+            result = session.run('PROFILE ' + statement, **param_dict)
+            records = list(result)
+            elapsed = time.time() - start
+            self.profiles.append((statement, result.summary().profile, len(records), elapsed))
+        return _ProfiledResult(records)
+
+
+def _total_db_hits(plan: Any) -> int:
+    return plan.db_hits + sum(_total_db_hits(child) for child in plan.children)
+
+
+def _peak_rows(plan: Any) -> int:
+    return max([plan.rows] + [_peak_rows(child) for child in plan.children])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='bolt://localhost')
+    parser.add_argument('--port', type=int, default=7687)
+    parser.add_argument('--user', default='neo4j')
+    parser.add_argument('--password', default='test')
+    parser.add_argument('--columns', type=int, default=2000)
+    parser.add_argument('--stats', type=int, default=20, help='stats per column')
+    parser.add_argument('--badges', type=int, default=3, help='badges per column')
+    parser.add_argument('--table-relations', type=int, default=20,
+                        help='watermarks, owners, tags and badges each on the table')
+    parser.add_argument('--keep', action='store_true', help='keep the synthetic graph after the run')
+    args = parser.parse_args()
+
+    proxy = ProfilingNeo4jProxy(host=args.host, port=args.port, user=args.user, password=args.password)
+    params = {'tbl_key': TABLE_KEY, 'num_columns': args.columns, 'num_stats': args.stats,
+              'num_badges': args.badges, 'num_table_relations': args.table_relations}
+    try:
+        with proxy._driver.session() as session:
+            session.run(CLEANUP_QUERY).consume()
+            for seed_query in SEED_QUERIES:
+                session.run(seed_query, **params).consume()
+
+        proxy.profile(statement=LEGACY_COLUMN_QUERY, param_dict={'tbl_key': TABLE_KEY})
+        proxy.profile(statement=LEGACY_TABLE_QUERY, param_dict={'tbl_key': TABLE_KEY, 'tag_normal_type': 'default'})
+        legacy_profiles = len(proxy.profiles)
+        proxy._exec_col_query(TABLE_KEY)
+        proxy._exec_table_query(TABLE_KEY)
+    finally:
+        if not args.keep:
+            with proxy._driver.session() as session:
+                session.run(CLEANUP_QUERY).consume()
+        proxy._driver.close()
+
+    # Independent aggregation touches each relationship once, a cartesian expansion multiplies them.
+    row_budget = args.columns * (args.stats + args.badges + 1) + 4 * args.table_relations
+    labels = ['legacy column query', 'legacy table query', 'column query', 'table query']
+    regressed = False
+    print('{:<22}{:>14}{:>14}{:>10}{:>12}'.format('query', 'db hits', 'peak rows', 'records', 'elapsed'))
+    for index, (label, (_, plan, records, elapsed)) in enumerate(zip(labels, proxy.profiles)):
+        peak_rows = _peak_rows(plan)
+        over_budget = index >= legacy_profiles and peak_rows > row_budget
+        regressed = regressed or over_budget
+        warning = '  <-- cartesian expansion' if over_budget else ''
+        print('{:<22}{:>14}{:>14}{:>10}{:>11.3f}s{}'.format(label, _total_db_hits(plan), peak_rows,
+                                                            records, elapsed, warning))
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Measures the startup of a metadata service worker for each backend.
+
+For each backend, in a fresh interpreter: imports metadata_service, creates the app, then imports the proxy class
+the way get_proxy_client does (instantiating it needs the backend to be up, so it is left out). Reports the time of
+each step, the memory of the worker, and the client libraries of the other backends it loaded, which it should not
+have. Exits with status 1 when a backend loads the libraries of another one.
+
+Usage:
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List  # noqa: F401
+
+from metadata_service import config
+
+BACKENDS = {
+    'NEO4J': config.PROXY_CLIENTS['NEO4J'],
+    'ATLAS': config.PROXY_CLIENTS['ATLAS'],
+    'NEPTUNE': 'metadata_service.proxy.neptune_proxy.NeptuneGremlinProxy',
+    'JANUS': 'metadata_service.proxy.janus_graph_proxy.JanusGraphGremlinProxy',
+}
+
+# client libraries only some of the backends need
+LIBRARIES = {
+    'neo4j': ['NEO4J'],
+    'atlasclient': ['ATLAS'],
+    'gremlin_python': ['NEPTUNE', 'JANUS'],
+    'websocket': ['NEPTUNE', 'JANUS'],
+    'requests_aws4auth': ['NEPTUNE'],
+}
+
+WORKER = '''
+import json, resource, sys, time
+start = time.perf_counter()
+from metadata_service import create_app
+imported = time.perf_counter()
+app = create_app(config_module_class='metadata_service.config.LocalConfig')
+created = time.perf_counter()
+from werkzeug.utils import import_string
+with app.app_context():
+    import_string(sys.argv[1])
+loaded = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': created - imported, 'proxy_import': loaded - created,
+                  'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, 'modules': sorted(sys.modules)}))
+'''
+
+
+def _start_worker(proxy_client: str) -> Dict[str, Any]:
+    output = subprocess.run([sys.executable, '-c', WORKER, proxy_client], check=True, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, universal_newlines=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='workers started per backend, medians are reported')
+    args = parser.parse_args()
+
+    leaked = False
+    print('{:<10}{:>12}{:>14}{:>16}{:>10}{:>12}  {}'.format(
+        'backend', 'import', 'create_app', 'proxy import', 'total', 'max rss', 'other backends loaded'))
+    for backend, proxy_client in BACKENDS.items():
+        runs = [_start_worker(proxy_client) for _ in range(args.repeat)]
+        import_ms, create_app_ms, proxy_import_ms = [statistics.median(run[step] for run in runs) * 1000
+                                                     for step in ('import', 'create_app', 'proxy_import')]
+        maxrss_mb = statistics.median(run['maxrss_kb'] for run in runs) / 1024  # type: float
+        modules = set(runs[0]['modules'])
+        others = [library for library, backends in LIBRARIES.items()
+                  if backend not in backends and library in modules]
+        leaked = leaked or bool(others)
+        print('{:<10}{:>10.1f}ms{:>12.1f}ms{:>14.1f}ms{:>8.1f}ms{:>9.1f}MiB  {}'.format(
+            backend, import_ms, create_app_ms, proxy_import_ms, import_ms + create_app_ms + proxy_import_ms, maxrss_mb,
+            ', '.join(others) or '-'))
+    return 1 if leaked else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -14,19 +14,22 @@ from flasgger import Swagger
 from flask import Flask, Blueprint
 from flask_restful import Api
 
+from metadata_service.api.bulk import BulkAPI
 from metadata_service.api.column import ColumnDescriptionAPI
 from metadata_service.api.dashboard import (DashboardDetailAPI, DashboardDescriptionAPI,
                                             DashboardTagAPI, DashboardBadgeAPI)
 from metadata_service.api.healthcheck import healthcheck
 from metadata_service.api.popular_tables import PopularTablesAPI
-from metadata_service.api.system import Neo4jDetailAPI
-from metadata_service.api.table \
-    import TableDetailAPI, TableOwnerAPI, TableTagAPI, TableBadgeAPI, TableDescriptionAPI, TableDashboardAPI
+from metadata_service.api.system import Neo4jDetailAPI, PoolStatsAPI
+from metadata_service.api.table import (TableDetailAPI, TableOwnerAPI, TableTagAPI, TableBadgeAPI,
+                                        TableDescriptionAPI, TableDashboardAPI, TableColumnsAPI, TablesAPI)
 from metadata_service.api.tag import TagAPI
 from metadata_service.api.badge import BadgeAPI
 from metadata_service.api.user import (UserDetailAPI, UserFollowAPI,
                                        UserFollowsAPI, UserOwnsAPI,
                                        UserOwnAPI, UserReadsAPI)
+from metadata_service.config import NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC
+from metadata_service.proxy import get_proxy_client
 
 # For customized flask use below arguments to override.
 FLASK_APP_MODULE_NAME = os.getenv('FLASK_APP_MODULE_NAME')
@@ -90,8 +93,11 @@ def create_app(*, config_module_class: str) -> Flask:
 
     api.add_resource(PopularTablesAPI, '/popular_tables/')
     api.add_resource(TableDetailAPI, '/table/<path:table_uri>')
+    api.add_resource(TablesAPI, '/tables')
     api.add_resource(TableDescriptionAPI,
                      '/table/<path:id>/description')
+    api.add_resource(TableColumnsAPI,
+                     '/table/<path:id>/columns')
     api.add_resource(TableTagAPI,
                      '/table/<path:id>/tag/<tag>')
     api.add_resource(TableBadgeAPI,
@@ -104,6 +110,8 @@ def create_app(*, config_module_class: str) -> Flask:
                      '/table/<path:table_uri>/column/<column_name>/description')
     api.add_resource(Neo4jDetailAPI,
                      '/latest_updated_ts')
+    api.add_resource(PoolStatsAPI,
+                     '/pool_stats')
     api.add_resource(TagAPI,
                      '/tags/')
     api.add_resource(BadgeAPI,
@@ -129,8 +137,15 @@ def create_app(*, config_module_class: str) -> Flask:
                      '/dashboard/<path:id>/tag/<tag>')
     api.add_resource(DashboardBadgeAPI,
                      '/dashboard/<path:id>/badge/<badge>')
+    api.add_resource(BulkAPI,
+                     '/bulk')
     app.register_blueprint(api_bp)
 
+    if app.config.get(NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC):
+        # Creates the proxy client right away so that the popular tables ranking warms up before the first request
+        with app.app_context():
+            get_proxy_client()
+
     if app.config.get('SWAGGER_ENABLED'):
         Swagger(app, template_file=os.path.join(ROOT_DIR, app.config.get('SWAGGER_TEMPLATE_PATH')), parse=True)
     return app
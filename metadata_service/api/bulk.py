@@ -0,0 +1,140 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, List, Optional, Tuple  # noqa: F401
+
+from flasgger import swag_from
+from flask import current_app as app
+from flask import request
+from flask_restful import Resource
+
+from metadata_service import config
+from metadata_service.api.tag import BADGE_TYPE
+from metadata_service.entity.mutation import Mutation, MutationResult, MutationStatus, MutationType
+from metadata_service.entity.resource_type import ResourceType, to_resource_type
+from metadata_service.proxy import get_proxy_client
+
+_STATUS_CODES = {
+    MutationStatus.Success: HTTPStatus.OK,
+    MutationStatus.NotFound: HTTPStatus.NOT_FOUND,
+    MutationStatus.Failed: HTTPStatus.INTERNAL_SERVER_ERROR,
+}
+
+# Fields each mutation type requires besides type and id
+_REQUIRED_FIELDS = {
+    MutationType.AddTag: ['tag'],
+    MutationType.DeleteTag: ['tag'],
+    MutationType.AddBadge: ['badge_name', 'category'],
+    MutationType.DeleteBadge: ['badge_name', 'category'],
+    MutationType.AddOwner: ['owner'],
+    MutationType.DeleteOwner: ['owner'],
+    MutationType.PutDescription: ['description'],
+}
+
+
+def _to_mutation(item: Dict[str, Any]) -> Mutation:
+    """
+    Builds a Mutation from one item of the request body. Raises ValueError when the item is not valid.
+    """
+    if not isinstance(item, dict):
+        raise ValueError('A mutation must be an object')
+    try:
+        mutation_type = MutationType(item.get('type'))
+        resource_type = to_resource_type(label=item.get('resource_type', ResourceType.Table.name))
+    except (AttributeError, KeyError, ValueError):
+        raise ValueError('Unknown type {} or resource_type {}'.format(item.get('type'), item.get('resource_type')))
+
+    # an empty description is a valid description
+    missing = [field for field in ['id'] + _REQUIRED_FIELDS[mutation_type]
+               if not isinstance(item.get(field), str) or (not item[field] and field != 'description')]
+    if missing:
+        raise ValueError('Missing {} for {}'.format(', '.join(missing), mutation_type.value))
+    if mutation_type in (MutationType.AddOwner, MutationType.DeleteOwner) and resource_type != ResourceType.Table:
+        raise ValueError('Owners can only be changed on tables')
+
+    fields = {field: item[field] for field in ('tag', 'tag_type', 'badge_name', 'category', 'owner', 'description')
+              if field in item}
+    return Mutation(type=mutation_type, id=item['id'], resource_type=resource_type, **fields)
+
+
+def _validate(item: Dict[str, Any]) -> Tuple[Optional[Mutation], Optional[Dict[str, Any]]]:
+    """
+    :return: The mutation of item, or the result rejecting it
+    """
+    try:
+        mutation = _to_mutation(item)
+    except ValueError as e:
+        return None, {'status': HTTPStatus.BAD_REQUEST.value, 'message': str(e)}
+
+    rejection = _check_whitelist(mutation)
+    if rejection:
+        return None, {'status': rejection[1].value, 'message': rejection[0]}
+    return mutation, None
+
+
+def _check_whitelist(mutation: Mutation) -> Optional[Tuple[str, HTTPStatus]]:
+    """
+    Applies the checks of TagCommon.put and BadgeCommon.put.
+    :return: Error message and status if the mutation is rejected, None otherwise
+    """
+    whitelist_badges = app.config.get('WHITELIST_BADGES', [])
+    if mutation.type == MutationType.AddTag:
+        if mutation.tag_type == BADGE_TYPE:
+            return 'Badges should be added using /badges/, tag_type=badge no longer valid', HTTPStatus.NOT_ACCEPTABLE
+        if any(mutation.tag == badge.badge_name for badge in whitelist_badges):
+            return 'The tag {} is reserved for badge'.format(mutation.tag), HTTPStatus.CONFLICT
+    elif mutation.type == MutationType.AddBadge:
+        if not any(mutation.badge_name == badge.badge_name and mutation.category == badge.category
+                   for badge in whitelist_badges):
+            return 'The badge {} with category {} is not part of the whitelist'.format(mutation.badge_name,
+                                                                                       mutation.category), \
+                HTTPStatus.NOT_FOUND
+    return None
+
+
+class BulkAPI(Resource):
+    """
+    BulkAPI applies a list of heterogeneous mutations (tags, badges, owners and descriptions) in one request
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+        super(BulkAPI, self).__init__()
+
+    @swag_from('swagger_doc/bulk/bulk_post.yml')
+    def post(self) -> Iterable[Any]:
+        """
+        Applies the mutations passed as a request body ({"mutations": [...]}) and returns a result per mutation,
+        in the same order. Invalid mutations are reported without preventing the others from being applied.
+        """
+        try:
+            items = json.loads(request.data).get('mutations')
+        except (ValueError, AttributeError):
+            items = None
+        if not isinstance(items, list):
+            return {'message': 'The request body must be an object with a mutations list'}, HTTPStatus.BAD_REQUEST
+
+        max_items = app.config[config.BULK_MUTATION_MAX_ITEMS]
+        if len(items) > max_items:
+            return {'message': 'At most {} mutations are accepted per request'.format(max_items)}, \
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+        results = [None] * len(items)  # type: List[Any]
+        valid = []  # type: List[Tuple[int, Mutation]]
+        for i, item in enumerate(items):
+            mutation, results[i] = _validate(item)
+            if mutation is not None:
+                valid.append((i, mutation))
+
+        if valid:
+            applied = self.client.apply_mutations(mutations=[mutation for _, mutation in valid])
+            for (i, _), result in zip(valid, applied):
+                results[i] = self._to_dict(result)
+
+        return {'results': results}, HTTPStatus.OK
+
+    @staticmethod
+    def _to_dict(result: MutationResult) -> Dict[str, Any]:
+        return {'status': _STATUS_CODES[result.status].value, 'message': result.message or result.status.value}
@@ -7,6 +7,7 @@ from typing import Iterable, Union, Mapping
 from flask_restful import Resource
 from flasgger import swag_from
 
+from metadata_service.entity.pool_stats import PoolStatsSchema
 from metadata_service.proxy import get_proxy_client
 
 
@@ -25,3 +26,19 @@ class Neo4jDetailAPI(Resource):
             return {'neo4j_latest_timestamp': int(last_updated_ts)}, HTTPStatus.OK
         else:
             return {'message': 'neo4j / es hasnt been updated / indexed.'}, HTTPStatus.NO_CONTENT
+
+
+class PoolStatsAPI(Resource):
+    """
+    API to fetch the state of the connection pool of the proxy client
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+    @swag_from('swagger_doc/pool_stats_get.yml')
+    def get(self) -> Iterable[Union[Mapping, int, None]]:
+        pool_stats = self.client.get_pool_stats()
+        if pool_stats is None:
+            return {'message': 'The proxy client does not have a connection pool'}, HTTPStatus.NO_CONTENT
+        return PoolStatsSchema().dump(pool_stats).data, HTTPStatus.OK
@@ -3,22 +3,40 @@
 
 import json
 from http import HTTPStatus
-from typing import Any, Iterable, Mapping, Union, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Set, Union, Optional  # noqa: F401
 
-from amundsen_common.models.table import TableSchema
+from amundsen_common.models.table import Column, ColumnSchema, TableSchema
 from flasgger import swag_from
-from flask import request
-from flask_restful import Resource, reqparse
+from flask import Response, current_app, request, stream_with_context
+from flask_restful import Resource, inputs, reqparse
 
+from metadata_service import config
 from metadata_service.api import BaseAPI
 from metadata_service.api.tag import TagCommon
 from metadata_service.api.badge import BadgeCommon
+from metadata_service.entity.column_field import ColumnField, to_column_fields
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
 from metadata_service.entity.dashboard_summary import DashboardSummarySchema
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
 
 
+def _column_fields(include: str) -> Set[ColumnField]:
+    return to_column_fields(include=include)
+
+
+def _column_args_parser() -> reqparse.RequestParser:
+    """
+    Parser of column paging (offset, limit) and column field selection (include) query parameters
+    """
+    parser = reqparse.RequestParser()
+    parser.add_argument('offset', type=inputs.natural, required=False, default=0, location='args')
+    parser.add_argument('limit', type=inputs.positive, required=False, location='args')
+    parser.add_argument('include', type=_column_fields, required=False, location='args')
+    return parser
+
+
 class TableDetailAPI(Resource):
     """
     TableDetail API
@@ -26,11 +44,21 @@ class TableDetailAPI(Resource):
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
+        self.parser = _column_args_parser()
 
     @swag_from('swagger_doc/table/detail_get.yml')
     def get(self, table_uri: str) -> Iterable[Union[Mapping, int, None]]:
+        args = self.parser.parse_args()
+        column_args = {}  # type: Dict[str, Any]
+        if args['offset']:
+            column_args['column_offset'] = args['offset']
+        if args['limit'] is not None:
+            column_args['column_limit'] = args['limit']
+        if args['include'] is not None:
+            column_args['column_fields'] = args['include']
+
         try:
-            table = self.client.get_table(table_uri=table_uri)
+            table = self.client.get_table(table_uri=table_uri, **column_args)
             schema = TableSchema(strict=True)
             return schema.dump(table).data, HTTPStatus.OK
 
@@ -38,6 +66,86 @@ class TableDetailAPI(Resource):
             return {'message': 'table_uri {} does not exist'.format(table_uri)}, HTTPStatus.NOT_FOUND
 
 
+class TablesAPI(Resource):
+    """
+    Tables API fetching many tables at once
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+
+    @swag_from('swagger_doc/table/tables_post.yml')
+    def post(self) -> Iterable[Union[Mapping, int, None]]:
+        """
+        Fetches the tables whose uris are passed as a request body ({"table_uris": [...], "detail": "summary"}).
+        Tables are returned in the order of table_uris, the ones which do not exist are marked as not found.
+        """
+        try:
+            body = json.loads(request.data)
+            table_uris = body.get('table_uris')
+            detail_level = TableDetailLevel(body.get('detail', TableDetailLevel.Summary.value))
+        except (ValueError, AttributeError):
+            table_uris = None
+        if not isinstance(table_uris, list) or not all(isinstance(table_uri, str) for table_uri in table_uris):
+            return {'message': 'The request body must be an object with a table_uris list and an optional detail '
+                               'level (summary or full)'}, HTTPStatus.BAD_REQUEST
+
+        max_items = current_app.config[config.TABLES_BATCH_MAX_ITEMS]
+        if len(table_uris) > max_items:
+            return {'message': 'At most {} tables are accepted per request'.format(max_items)}, \
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+        tables = self.client.get_tables(table_uris=table_uris, detail_level=detail_level) if table_uris else []
+        schema = TableSchema(strict=True)
+        return {'tables': [{'table_uri': table_uri,
+                            'found': table is not None,
+                            'table': schema.dump(table).data if table is not None else None}
+                           for table_uri, table in zip(table_uris, tables)]}, HTTPStatus.OK
+
+
+class TableColumnsAPI(Resource):
+    """
+    TableColumns API streaming the columns of a table in sort order
+    """
+
+    def __init__(self) -> None:
+        self.client = get_proxy_client()
+        self.parser = _column_args_parser()
+
+    @swag_from('swagger_doc/table/columns_get.yml')
+    def get(self, id: str) -> Any:
+        args = self.parser.parse_args()
+        offset, limit, fields = args['offset'], args['limit'], args['include']
+        page_size = current_app.config[config.TABLE_COLUMNS_PAGE_SIZE]
+
+        # The first page is fetched up front so that a missing table still ends up as 404
+        try:
+            first_page = self.client.get_table_columns(table_uri=id, offset=offset,
+                                                       limit=min(page_size, limit or page_size), fields=fields)
+        except NotFoundException:
+            return {'message': 'table_uri {} does not exist'.format(id)}, HTTPStatus.NOT_FOUND
+
+        return Response(stream_with_context(self._stream_columns(id, first_page, offset, limit, fields, page_size)),
+                        mimetype='application/json')
+
+    def _stream_columns(self, table_uri: str, page: List[Column], offset: int, limit: Optional[int],
+                        fields: Optional[Set[ColumnField]], page_size: int) -> Iterator[str]:
+        schema = ColumnSchema()
+        streamed = 0
+        yield '{"columns": ['
+        while page:
+            for column in page:
+                yield (', ' if streamed else '') + json.dumps(schema.dump(column).data)
+                streamed += 1
+
+            remaining = limit - streamed if limit is not None else page_size
+            if len(page) < page_size or remaining <= 0:
+                break
+            page = self.client.get_table_columns(table_uri=table_uri, offset=offset + streamed,
+                                                 limit=min(page_size, remaining), fields=fields)
+        yield ']}'
+
+
 class TableOwnerAPI(Resource):
     """
     TableOwner API to add / delete owner info
@@ -1,26 +1,56 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import base64
+import binascii
+import json
 import logging
 from http import HTTPStatus
 from typing import Iterable, Mapping, Optional, Union, Dict, List, Any  # noqa: F401
 
 from amundsen_common.models.dashboard import DashboardSummarySchema
-from amundsen_common.models.popular_table import PopularTableSchema
+from amundsen_common.models.popular_table import PopularTable, PopularTableSchema
 from amundsen_common.models.user import UserSchema
 from flasgger import swag_from
-from flask import current_app as app
-from flask_restful import Resource
+from flask import current_app
+from flask_restful import Resource, inputs, reqparse
 
+from metadata_service import config
 from metadata_service.api import BaseAPI
 from metadata_service.entity.resource_type import to_resource_type, ResourceType
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import get_proxy_client
+from metadata_service.proxy.user_details import get_user_details, has_user_detail_method
 from metadata_service.util import UserResourceRel
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _encode_cursor(last_keys: Dict[str, Optional[str]]) -> str:
+    """
+    Opaque cursor of the next page of a listing spanning several resource types
+    :param last_keys: Key of the last resource returned for each resource type with more resources to return
+    """
+    return base64.urlsafe_b64encode(json.dumps(last_keys, sort_keys=True).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Optional[str]]:
+    """
+    :raises ValueError: if the cursor was not made by _encode_cursor
+    """
+    try:
+        last_keys = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as ex:
+        raise ValueError('Invalid cursor {}'.format(cursor)) from ex
+    if not isinstance(last_keys, dict) or not all(isinstance(key, str) for key in last_keys.values()):
+        raise ValueError('Invalid cursor {}'.format(cursor))
+    return last_keys
+
+
+def _table_key(table: PopularTable) -> str:
+    return '{}://{}.{}/{}'.format(table.database, table.cluster, table.schema, table.name)
+
+
 class UserDetailAPI(BaseAPI):
     """
     User detail API for people resources
@@ -32,9 +62,11 @@ class UserDetailAPI(BaseAPI):
 
     @swag_from('swagger_doc/user/detail_get.yml')
     def get(self, *, id: Optional[str] = None) -> Iterable[Union[Mapping, int, None]]:
-        if app.config['USER_DETAIL_METHOD']:
+        if id and has_user_detail_method():
             try:
-                user_data = app.config['USER_DETAIL_METHOD'](id)
+                user_data = get_user_details(id)
+                if user_data is None:
+                    raise NotFoundException('User {} does not exist'.format(id))
                 return UserSchema().dump(user_data).data, HTTPStatus.OK
             except Exception:
                 LOGGER.exception('UserDetailAPI GET Failed - Using "USER_DETAIL_METHOD" config variable')
@@ -50,35 +82,64 @@ class UserFollowsAPI(Resource):
 
     def __init__(self) -> None:
         self.client = get_proxy_client()
+        self.parser = reqparse.RequestParser()
+        self.parser.add_argument('cursor', type=str, required=False, location='args')
+        self.parser.add_argument('limit', type=inputs.positive, required=False, location='args')
 
     @swag_from('swagger_doc/user/follow_get.yml')
     def get(self, user_id: str) -> Iterable[Union[Mapping, int, None]]:
         """
-        Return a list of resources that user has followed
+        Return a list of resources that user has followed, all of them when neither limit nor cursor is given.
+        Otherwise returns a page of at most limit tables and limit dashboards, and next_cursor to pass as cursor to get
+        the next ones (null once all of them were returned). limit then defaults to USER_FOLLOWS_DEFAULT_PAGE_SIZE and
+        is capped at USER_FOLLOWS_MAX_PAGE_SIZE. Pages follow the resource keys, so following or unfollowing a resource
+        between two pages neither skips nor repeats the other ones.
 
         :param user_id:
         :return:
         """
+        args = self.parser.parse_args()
+        limit = None  # type: Optional[int]
+        if args['limit'] or args['cursor']:
+            limit = min(args['limit'] or current_app.config[config.USER_FOLLOWS_DEFAULT_PAGE_SIZE],
+                        current_app.config[config.USER_FOLLOWS_MAX_PAGE_SIZE])
+
+        table_key = ResourceType.Table.name.lower()
+        dashboard_key = ResourceType.Dashboard.name.lower()
         try:
-            resources = self.client.get_table_by_user_relation(user_email=user_id,
-                                                               relation_type=UserResourceRel.follow)
+            # Resource types left out of the cursor were all returned by the previous pages
+            last_keys = _decode_cursor(args['cursor']) if args['cursor'] else {table_key: None, dashboard_key: None}
+        except ValueError:
+            return {'message': 'cursor {} is not valid'.format(args['cursor'])}, HTTPStatus.BAD_REQUEST
 
-            table_key = ResourceType.Table.name.lower()
-            dashboard_key = ResourceType.Dashboard.name.lower()
+        try:
             result = {
                 table_key: [],
                 dashboard_key: []
-            }  # type: Dict[str, List[Any]]
-
-            if resources and table_key in resources and len(resources[table_key]) > 0:
-                result[table_key] = PopularTableSchema(many=True).dump(resources[table_key]).data
-
-            resources = self.client.get_dashboard_by_user_relation(user_email=user_id,
-                                                                   relation_type=UserResourceRel.follow)
-
-            if resources and dashboard_key in resources and len(resources[dashboard_key]) > 0:
-                result[dashboard_key] = DashboardSummarySchema(many=True).dump(resources[dashboard_key]).data
-
+            }  # type: Dict[str, Any]
+            next_last_keys = {}  # type: Dict[str, Optional[str]]
+
+            for resource_key, get_resources, schema, get_key in (
+                    (table_key, self.client.get_table_by_user_relation, PopularTableSchema, _table_key),
+                    (dashboard_key, self.client.get_dashboard_by_user_relation, DashboardSummarySchema,
+                     lambda dashboard: dashboard.uri)):
+                if resource_key not in last_keys:
+                    continue
+
+                # One more than the page, to know whether there is a next page
+                resources = get_resources(user_email=user_id,
+                                          relation_type=UserResourceRel.follow,
+                                          after=last_keys[resource_key],
+                                          limit=limit + 1 if limit else None)
+
+                if resources and resource_key in resources and len(resources[resource_key]) > 0:
+                    page = resources[resource_key]
+                    if limit and len(page) > limit:
+                        page = page[:limit]
+                        next_last_keys[resource_key] = get_key(page[-1])
+                    result[resource_key] = schema(many=True).dump(page).data
+
+            result['next_cursor'] = _encode_cursor(next_last_keys) if next_last_keys else None
             return result, HTTPStatus.OK
 
         except NotFoundException:
@@ -3,7 +3,7 @@
 
 import distutils.util
 import os
-from typing import List, Dict, Optional, Set  # noqa: F401
+from typing import Any, List, Dict, Optional, Set  # noqa: F401
 from metadata_service.entity.badge import Badge
 
 # PROXY configuration keys
@@ -14,15 +14,62 @@ PROXY_PASSWORD = 'PROXY_PASSWORD'
 PROXY_ENCRYPTED = 'PROXY_ENCRYPTED'
 PROXY_VALIDATE_SSL = 'PROXY_VALIDATE_SSL'
 PROXY_CLIENT = 'PROXY_CLIENT'
+PROXY_SINGLE_FLIGHT = 'PROXY_SINGLE_FLIGHT'
+PROXY_CONNECTION_OPTIONS = 'PROXY_CONNECTION_OPTIONS'
 
 PROXY_CLIENTS = {
     'NEO4J': 'metadata_service.proxy.neo4j_proxy.Neo4jProxy',
-    'ATLAS': 'metadata_service.proxy.atlas_proxy.AtlasProxy'
+    'ATLAS': 'metadata_service.proxy.atlas_proxy.AtlasProxy',
+    'CACHING': 'metadata_service.proxy.caching_proxy.CachingProxy'
 }
 
+# CachingProxy configuration keys
+CACHED_PROXY_CLIENT = 'CACHED_PROXY_CLIENT'
+CACHING_PROXY_TTL_SEC = 'CACHING_PROXY_TTL_SEC'
+CACHING_PROXY_MAX_SIZE = 'CACHING_PROXY_MAX_SIZE'
+
 IS_STATSD_ON = 'IS_STATSD_ON'
 USER_OTHER_KEYS = 'USER_OTHER_KEYS'
 
+USER_DETAIL_METHOD = 'USER_DETAIL_METHOD'
+USER_DETAIL_BATCH_METHOD = 'USER_DETAIL_BATCH_METHOD'
+USER_DETAIL_CACHE_TTL_SEC = 'USER_DETAIL_CACHE_TTL_SEC'
+USER_DETAIL_CACHE_NEGATIVE_TTL_SEC = 'USER_DETAIL_CACHE_NEGATIVE_TTL_SEC'
+USER_DETAIL_CACHE_MAX_SIZE = 'USER_DETAIL_CACHE_MAX_SIZE'
+
+# Neo4jProxy.get_table fetch strategies
+NEO4J_GET_TABLE_MODE = 'NEO4J_GET_TABLE_MODE'
+NEO4J_GET_TABLE_MULTI_QUERY = 'multi_query'
+NEO4J_GET_TABLE_SINGLE_QUERY = 'single_query'
+NEO4J_GET_TABLE_CONCURRENT = 'concurrent'
+NEO4J_QUERY_EXECUTOR_POOL_RATIO = 'NEO4J_QUERY_EXECUTOR_POOL_RATIO'
+
+NEO4J_BULK_MUTATION_CHUNK_SIZE = 'NEO4J_BULK_MUTATION_CHUNK_SIZE'
+NEO4J_WRITE_MAX_RETRY_TIME_SEC = 'NEO4J_WRITE_MAX_RETRY_TIME_SEC'
+BULK_MUTATION_MAX_ITEMS = 'BULK_MUTATION_MAX_ITEMS'
+
+NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC = 'NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC'
+NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES = 'NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES'
+NEO4J_POPULAR_TABLES_WARM_UP_TIMEOUT_SEC = 'NEO4J_POPULAR_TABLES_WARM_UP_TIMEOUT_SEC'
+
+TABLE_COLUMNS_PAGE_SIZE = 'TABLE_COLUMNS_PAGE_SIZE'
+TABLES_BATCH_MAX_ITEMS = 'TABLES_BATCH_MAX_ITEMS'
+USER_FOLLOWS_DEFAULT_PAGE_SIZE = 'USER_FOLLOWS_DEFAULT_PAGE_SIZE'
+USER_FOLLOWS_MAX_PAGE_SIZE = 'USER_FOLLOWS_MAX_PAGE_SIZE'
+
+GREMLIN_RETRY_DEADLINE_SEC = 'GREMLIN_RETRY_DEADLINE_SEC'
+GREMLIN_RETRY_BASE_DELAY_SEC = 'GREMLIN_RETRY_BASE_DELAY_SEC'
+GREMLIN_RETRY_MAX_DELAY_SEC = 'GREMLIN_RETRY_MAX_DELAY_SEC'
+
+ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC = 'ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC'
+ATLAS_ENTITY_BULK_CHUNK_SIZE = 'ATLAS_ENTITY_BULK_CHUNK_SIZE'
+ATLAS_ENTITY_BULK_MAX_PARALLELISM = 'ATLAS_ENTITY_BULK_MAX_PARALLELISM'
+ATLAS_FREQUENTLY_USED_TABLES_NUM_ENTRIES = 'ATLAS_FREQUENTLY_USED_TABLES_NUM_ENTRIES'
+ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC = 'ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC'
+ATLAS_SEARCH_PAGE_SIZE = 'ATLAS_SEARCH_PAGE_SIZE'
+ATLAS_GUID_INDEX_TTL_SEC = 'ATLAS_GUID_INDEX_TTL_SEC'
+ATLAS_GUID_INDEX_MAX_SIZE = 'ATLAS_GUID_INDEX_MAX_SIZE'
+
 
 class Config:
     LOG_FORMAT = '%(asctime)s.%(msecs)03d [%(levelname)s] %(module)s.%(funcName)s:%(lineno)d (%(process)d:' \
@@ -48,6 +95,15 @@ class Config:
 
     IS_STATSD_ON = False
 
+    # Extra keyword arguments of the proxy client's constructor, used to size its connection pool against the number
+    # of gunicorn workers and threads, e.g. {'num_conns': 20, 'connection_timeout_sec': 5} for Neo4jProxy,
+    # {'pool_maxsize': 20} for AtlasProxy or {'driver_remote_connection_options': {'pool_size': 8}} for gremlin proxies.
+    # The state of the pool is available at /pool_stats.
+    PROXY_CONNECTION_OPTIONS = {}  # type: Dict[str, Any]
+
+    # Concurrent identical reads (same method, same arguments) share one backend call
+    PROXY_SINGLE_FLIGHT = True
+
     # Used to differentiate tables with other entities in Atlas. For more details:
     # https://github.com/amundsen-io/amundsenmetadatalibrary/blob/master/docs/proxy/atlas_proxy.md
     ATLAS_TABLE_ENTITY = 'Table'
@@ -55,6 +111,28 @@ class Config:
     # The relationalAttribute name of Atlas Entity that identifies the database entity.
     ATLAS_DB_ATTRIBUTE = 'db'
 
+    # AtlasProxy.get_table looks owners, reports and readers up concurrently. One still running after that many
+    # seconds is left out of the table (empty list) rather than failing the request. None waits for all of them.
+    ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC = 5.0  # type: Optional[float]
+
+    # AtlasProxy fetches entities by guid (readers, reports, owned and batched tables) ATLAS_ENTITY_BULK_CHUNK_SIZE
+    # guids per entity_bulk call, running at most ATLAS_ENTITY_BULK_MAX_PARALLELISM calls at a time
+    ATLAS_ENTITY_BULK_CHUNK_SIZE = 100
+    ATLAS_ENTITY_BULK_MAX_PARALLELISM = 4
+
+    # AtlasProxy.get_frequently_used_tables returns the tables a user read the most, at most that many of them,
+    # cached per user for ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC seconds (0 disables the cache)
+    ATLAS_FREQUENTLY_USED_TABLES_NUM_ENTRIES = 50
+    ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC = 60
+
+    # AtlasProxy pages through the bookmarks of a user ATLAS_SEARCH_PAGE_SIZE entities per basic search
+    ATLAS_SEARCH_PAGE_SIZE = 1000
+
+    # AtlasProxy keeps the guids of the tables, columns and users it read for ATLAS_GUID_INDEX_TTL_SEC seconds (0
+    # disables the index), so writes do not need to look them up again. At most ATLAS_GUID_INDEX_MAX_SIZE are kept.
+    ATLAS_GUID_INDEX_TTL_SEC = 3600
+    ATLAS_GUID_INDEX_MAX_SIZE = 100000
+
     # Configurable dictionary to influence format of column statistics displayed in UI
     STATISTICS_FORMAT_SPEC: Dict[str, Dict] = {}
 
@@ -65,6 +143,17 @@ class Config:
 
     USER_DETAIL_METHOD = None   # type: Optional[function]
 
+    # Optional method resolving many users at once: takes a list of user ids and returns the details of each of them
+    # by user id, users it does not know being left out. Used instead of USER_DETAIL_METHOD when set.
+    USER_DETAIL_BATCH_METHOD = None   # type: Optional[function]
+
+    # Seconds the results of USER_DETAIL_METHOD / USER_DETAIL_BATCH_METHOD are cached for (0 disables the cache),
+    # unknown users being cached for USER_DETAIL_CACHE_NEGATIVE_TTL_SEC. At most USER_DETAIL_CACHE_MAX_SIZE users are
+    # kept, least recently used ones being dropped first.
+    USER_DETAIL_CACHE_TTL_SEC = 3600  # type: int
+    USER_DETAIL_CACHE_NEGATIVE_TTL_SEC = 300  # type: int
+    USER_DETAIL_CACHE_MAX_SIZE = 10000  # type: int
+
     RESOURCE_REPORT_CLIENT = None   # type: Optional[function]
 
     # On User detail method, these keys will be added into amundsen_common.models.user.User.other_key_values
@@ -76,6 +165,62 @@ class Config:
     # List of regexes which will exclude certain parameters from appearing as Programmatic Descriptions
     PROGRAMMATIC_DESCRIPTIONS_EXCLUDE_FILTERS = []  # type: list
 
+    # How Neo4jProxy.get_table fetches table details: 'multi_query' runs the column, usage and table level
+    # queries one after another, 'single_query' fetches everything in one round trip and 'concurrent' runs
+    # the three queries in parallel on the proxy's query executor
+    NEO4J_GET_TABLE_MODE = NEO4J_GET_TABLE_MULTI_QUERY  # type: str
+
+    # Size of Neo4jProxy's query executor relative to its connection pool size (num_conns)
+    NEO4J_QUERY_EXECUTOR_POOL_RATIO = 0.5  # type: float
+
+    # When set, Neo4jProxy recomputes the popular table ranking in the background every that many seconds (starting
+    # right away, when the app is created) and keeps serving the previous ranking meanwhile. The ranking holds the top
+    # NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES tables, larger requests go through the request time cache.
+    NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC = None  # type: Optional[int]
+    NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES = 100  # type: int
+    # Max seconds a request waits for the first ranking, before going through the request time cache instead
+    NEO4J_POPULAR_TABLES_WARM_UP_TIMEOUT_SEC = 1.0  # type: float
+
+    # Max number of mutations accepted by one /bulk request
+    BULK_MUTATION_MAX_ITEMS = 10000
+    # Number of mutations Neo4jProxy applies per transaction
+    NEO4J_BULK_MUTATION_CHUNK_SIZE = 1000
+
+    # Time during which Neo4jProxy keeps retrying a write transaction failing with a transient error
+    NEO4J_WRITE_MAX_RETRY_TIME_SEC = 30.0  # type: float
+
+    # Time during which the gremlin proxies keep retrying a call failing with an exception they deem retryable (e.g.
+    # ConcurrentModificationException for Neptune). Before retry n (from 0) they sleep a random time between 0 and
+    # min(GREMLIN_RETRY_MAX_DELAY_SEC, GREMLIN_RETRY_BASE_DELAY_SEC * 2 ** n)
+    GREMLIN_RETRY_DEADLINE_SEC = 30.0  # type: float
+    GREMLIN_RETRY_BASE_DELAY_SEC = 0.1  # type: float
+    GREMLIN_RETRY_MAX_DELAY_SEC = 5.0  # type: float
+
+    # Max number of tables fetched by one /tables request
+    TABLES_BATCH_MAX_ITEMS = 500
+
+    # Number of columns fetched from the proxy at a time while streaming /table/<uri>/columns
+    TABLE_COLUMNS_PAGE_SIZE = 500  # type: int
+
+    # Number of tables and of dashboards returned per /user/<id>/follow/ page when no limit is given, and max limit
+    USER_FOLLOWS_DEFAULT_PAGE_SIZE = 100  # type: int
+    USER_FOLLOWS_MAX_PAGE_SIZE = 1000  # type: int
+
+    # Proxy client wrapped by CachingProxy, when PROXY_CLIENT is set to it
+    CACHED_PROXY_CLIENT = PROXY_CLIENTS['NEO4J']  # type: str
+
+    # Seconds CachingProxy keeps the result of each read method, methods not listed here are not cached
+    CACHING_PROXY_TTL_SEC = {
+        'get_table': 300,
+        'get_table_description': 300,
+        'get_dashboard': 300,
+        'get_tags': 60,
+        'get_user': 3600,
+    }  # type: Dict[str, int]
+
+    # Number of results CachingProxy keeps at most, across all read methods, least recently used ones are dropped first
+    CACHING_PROXY_MAX_SIZE = 10000  # type: int
+
 
 class LocalConfig(Config):
     DEBUG = True
@@ -86,6 +231,7 @@ class LocalConfig(Config):
     PROXY_HOST = os.environ.get('PROXY_HOST', f'bolt://{LOCAL_HOST}')
     PROXY_PORT = os.environ.get('PROXY_PORT', 7687)
     PROXY_CLIENT = PROXY_CLIENTS[os.environ.get('PROXY_CLIENT', 'NEO4J')]
+    CACHED_PROXY_CLIENT = PROXY_CLIENTS[os.environ.get('CACHED_PROXY_CLIENT', 'NEO4J')]
     PROXY_ENCRYPTED = bool(distutils.util.strtobool(os.environ.get(PROXY_ENCRYPTED, 'True')))
     PROXY_VALIDATE_SSL = bool(distutils.util.strtobool(os.environ.get(PROXY_VALIDATE_SSL, 'False')))
 
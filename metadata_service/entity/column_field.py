@@ -0,0 +1,20 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from enum import Enum
+from typing import Set
+
+
+class ColumnField(Enum):
+    """
+    Optional parts of a table column which can be selected when loading columns
+    """
+    Stats = 'stats'
+    Badges = 'badges'
+
+
+def to_column_fields(*, include: str) -> Set[ColumnField]:
+    """
+    Parses comma separated field names (e.g. 'stats,badges'). Raises ValueError on an unknown name.
+    """
+    return {ColumnField(name.strip().lower()) for name in include.split(',') if name.strip()}
@@ -0,0 +1,51 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from enum import Enum
+from typing import Optional
+
+import attr
+
+from metadata_service.entity.resource_type import ResourceType
+
+
+class MutationType(Enum):
+    """
+    Changes which can be applied in bulk, named after the matching proxy methods
+    """
+    AddTag = 'add_tag'
+    DeleteTag = 'delete_tag'
+    AddBadge = 'add_badge'
+    DeleteBadge = 'delete_badge'
+    AddOwner = 'add_owner'
+    DeleteOwner = 'delete_owner'
+    PutDescription = 'put_description'
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class Mutation:
+    """
+    One change of a bulk request. id is the key of the resource changed, only the fields used by type are set
+    (tag and tag_type for tags, badge_name and category for badges, owner for owners, description for descriptions).
+    """
+    type: MutationType = attr.ib()
+    id: str = attr.ib()
+    resource_type: ResourceType = attr.ib(default=ResourceType.Table)
+    tag: str = attr.ib(default='')
+    tag_type: str = attr.ib(default='default')
+    badge_name: str = attr.ib(default='')
+    category: str = attr.ib(default='')
+    owner: str = attr.ib(default='')
+    description: str = attr.ib(default='')
+
+
+class MutationStatus(Enum):
+    Success = 'success'
+    NotFound = 'not_found'
+    Failed = 'failed'
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class MutationResult:
+    status: MutationStatus = attr.ib()
+    message: Optional[str] = attr.ib(default=None)
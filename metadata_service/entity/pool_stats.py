@@ -0,0 +1,25 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import attr
+from marshmallow_annotations.ext.attrs import AttrsSchema
+
+
+@attr.s(auto_attribs=True, kw_only=True)
+class PoolStats:
+    """
+    Snapshot of the connection pool of a proxy. Counters (acquisitions, acquisition_wait_ms, opened, closed) are
+    totals since the proxy was created.
+    """
+    in_use: int = attr.ib()
+    idle: int = attr.ib()
+    acquisitions: int = attr.ib(default=0)
+    acquisition_wait_ms: float = attr.ib(default=0.0)
+    opened: int = attr.ib(default=0)
+    closed: int = attr.ib(default=0)
+
+
+class PoolStatsSchema(AttrsSchema):
+    class Meta:
+        target = PoolStats
+        register_as_scheme = True
@@ -0,0 +1,14 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from enum import Enum
+
+
+class TableDetailLevel(Enum):
+    """
+    How much of a table is loaded when fetching many tables at once
+    """
+    # Table level fields only (description, owners, tags, badges, ...), no columns nor readers
+    Summary = 'summary'
+    # Everything get_table returns
+    Full = 'full'
@@ -34,6 +34,7 @@ def get_proxy_client() -> BaseProxy:
             password = current_app.config[config.PROXY_PASSWORD]
             encrypted = current_app.config[config.PROXY_ENCRYPTED]
             validate_ssl = current_app.config[config.PROXY_VALIDATE_SSL]
+            connection_options = current_app.config.get(config.PROXY_CONNECTION_OPTIONS) or {}
 
             client = import_string(current_app.config[config.PROXY_CLIENT])
             _proxy_client = client(host=host,
@@ -41,6 +42,7 @@ def get_proxy_client() -> BaseProxy:
                                    user=user,
                                    password=password,
                                    encrypted=encrypted,
-                                   validate_ssl=validate_ssl)
+                                   validate_ssl=validate_ssl,
+                                   **connection_options)
 
     return _proxy_client
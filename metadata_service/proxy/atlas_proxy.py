@@ -3,8 +3,12 @@
 
 import logging
 import re
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
 from random import randint
-from typing import Any, Dict, List, Union, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Union, Optional, Set, Tuple
 
 from amundsen_common.models.dashboard import DashboardSummary
 from amundsen_common.models.popular_table import PopularTable
@@ -19,14 +23,27 @@ from atlasclient.utils import (make_table_qualified_name,
                                extract_entities)
 from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
-from flask import current_app as app
-
+from flask import current_app as app, g, has_app_context, has_request_context
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout as RequestsTimeout
+from urllib3.util.retry import Retry
+
+from metadata_service import config
+from metadata_service.entity.column_field import ColumnField
 from metadata_service.entity.dashboard_detail import DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
+from metadata_service.entity.pool_stats import PoolStats
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy import BaseProxy
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.bounded_executor import BoundedExecutor
+from metadata_service.proxy.guid_index import GuidIndex
+from metadata_service.proxy.pool_telemetry import PoolTelemetry
+from metadata_service.proxy.user_details import get_user_details, get_users_details, has_user_detail_method
 from metadata_service.util import UserResourceRel
 
 LOGGER = logging.getLogger(__name__)
@@ -40,15 +57,79 @@ class Status:
     DELETED = "DELETED"
 
 
+# Attribute of flask.g holding the entities fetched during the request, see AtlasProxy._get_memoized_entity
+_ENTITY_MEMO_ATTR = '_atlas_entity_memo'
+_ENTITY_MEMO_LOCK = threading.Lock()
+
+
+# A table of an entity_bulk response, along with the entities it refers to
+_BulkTableEntity = NamedTuple('_BulkTableEntity', [('entity', Dict), ('referredEntities', Dict)])
+
+
+# Deadline of the Atlas requests sent by the current thread, see _DeadlineHTTPAdapter
+_request_deadline = threading.local()
+
+
+def _remaining_sec() -> Optional[float]:
+    deadline = getattr(_request_deadline, 'deadline', None)
+    return None if deadline is None else deadline - time.time()
+
+
+class _DeadlineRetry(Retry):
+    """
+    Retry giving up once the deadline of the thread passed, rather than retrying timed out requests
+    """
+
+    def is_exhausted(self) -> bool:
+        remaining = _remaining_sec()
+        return super().is_exhausted() or (remaining is not None and remaining <= 0)
+
+
+class _DeadlineHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter capping the timeout of the requests sent by a thread to the deadline the thread set, if any. A lookup
+    of get_table given up on would otherwise keep its thread of the query executor for the whole Atlas timeout.
+    """
+
+    def __init__(self, *, max_retries: int, **kwargs: Any) -> None:
+        super().__init__(max_retries=_DeadlineRetry.from_int(max_retries), **kwargs)
+
+    def send(self, request: PreparedRequest, stream: bool = False, timeout: Any = None, verify: Any = True,
+             cert: Any = None, proxies: Any = None) -> Response:
+        remaining = _remaining_sec()
+        if remaining is not None:
+            if remaining <= 0:
+                raise RequestsTimeout('Deadline passed before sending {}'.format(request.url), request=request)
+            if isinstance(timeout, tuple):
+                timeout = tuple(remaining if t is None else min(t, remaining) for t in timeout)
+            else:
+                timeout = remaining if timeout is None else min(timeout, remaining)
+        return super().send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+
+def _with_deadline(fn: Callable, deadline: Optional[float]) -> Callable:
+    """
+    :return: fn, sending its Atlas requests with timeouts capped to deadline (see _DeadlineHTTPAdapter)
+    """
+    if deadline is None:
+        return fn
+
+    def bound(*args: Any, **kwargs: Any) -> Any:
+        _request_deadline.deadline = deadline
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _request_deadline.deadline = None
+
+    return bound
+
+
 # noinspection PyMethodMayBeStatic
 class AtlasProxy(BaseProxy):
     """
     Atlas Proxy client for the amundsen metadata
     {ATLAS_API_DOCS} = https://atlas.apache.org/api/v2/
     """
-    TABLE_ENTITY = app.config['ATLAS_TABLE_ENTITY']
-    DB_ATTRIBUTE = app.config['ATLAS_DB_ATTRIBUTE']
-    STATISTICS_FORMAT_SPEC = app.config['STATISTICS_FORMAT_SPEC']
     BOOKMARK_TYPE = 'Bookmark'
     USER_TYPE = 'User'
     READER_TYPE = 'Reader'
@@ -68,17 +149,68 @@ class AtlasProxy(BaseProxy):
                  user: str = 'admin',
                  password: str = '',
                  encrypted: bool = False,
-                 validate_ssl: bool = False) -> None:
+                 validate_ssl: bool = False,
+                 timeout_sec: int = 10,
+                 max_retries: int = 5,
+                 pool_maxsize: int = 10) -> None:
         """
         Initiate the Apache Atlas client with the provided credentials
+        :param timeout_sec: timeout of each request sent to Atlas
+        :param max_retries: retries of a request failing to connect
+        :param pool_maxsize: number of connections to Atlas kept open for reuse. Requests sent while they are all
+        in use do not wait: they open an extra connection, closed once done, which shows as churn in get_pool_stats.
+
+        Lookups of get_table which do not depend on each other run on an executor of pool_maxsize threads, chunks
+        of entity_bulk calls on another one of ATLAS_ENTITY_BULK_MAX_PARALLELISM threads (at most pool_maxsize).
         """
+        # read here rather than in the class body, so that the module can be imported without an app context
+        self.TABLE_ENTITY = app.config['ATLAS_TABLE_ENTITY']
+        self.DB_ATTRIBUTE = app.config['ATLAS_DB_ATTRIBUTE']
+        self.STATISTICS_FORMAT_SPEC = app.config['STATISTICS_FORMAT_SPEC']
         protocol = 'https' if encrypted else 'http'
         self._driver = Atlas(host=host,
                              port=port,
                              username=user,
                              password=password,
                              protocol=protocol,
-                             validate_ssl=validate_ssl)
+                             validate_ssl=validate_ssl,
+                             timeout=timeout_sec,
+                             max_retries=max_retries)
+        # All requests go to a single host, so a single urllib3 pool is needed
+        self._http_adapter = _DeadlineHTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize,
+                                                  max_retries=max_retries)
+        self._driver.client.session.mount('{}://'.format(protocol), self._http_adapter)
+        self._pool_telemetry = PoolTelemetry(metric_prefix=__name__)
+        # lookups run on the executor share the entities memoized by the request which submitted them
+        self._query_executor = BoundedExecutor(max_workers=pool_maxsize,
+                                               name='query_executor',
+                                               metric_prefix=__name__,
+                                               g_attrs=(_ENTITY_MEMO_ATTR,))
+        # Separate from the query executor: lookups running there fetch entities in chunks, waiting for chunks
+        # queued behind them on the same executor would deadlock
+        self._bulk_executor = BoundedExecutor(
+            max_workers=min(pool_maxsize, app.config.get(config.ATLAS_ENTITY_BULK_MAX_PARALLELISM, 4)),
+            name='entity_bulk_executor',
+            metric_prefix=__name__)
+        self._guid_index = GuidIndex(ttl_sec=app.config.get(config.ATLAS_GUID_INDEX_TTL_SEC, 0),
+                                     max_size=app.config.get(config.ATLAS_GUID_INDEX_MAX_SIZE, 100000),
+                                     metric_prefix=__name__)
+
+    def get_pool_stats(self) -> Optional[PoolStats]:
+        pools = self._http_adapter.poolmanager.pools
+        in_use, idle, opened = 0, 0, 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:
+                continue
+            # the queue of the pool holds idle connections, and None placeholders for connections never opened
+            # or handed out
+            idle_count = sum(1 for connection in list(pool.pool.queue) if connection is not None)
+            idle += idle_count
+            in_use += max(0, pool.maxsize - pool.pool.qsize())
+            opened += pool.num_connections
+        return self._pool_telemetry.stats(in_use=in_use, idle=idle, opened=opened,
+                                          closed=max(0, opened - in_use - idle))
 
     def _get_ids_from_basic_search(self, *, params: Dict) -> List[str]:
         """
@@ -181,14 +313,22 @@ class AtlasProxy(BaseProxy):
         Helper function to help get the user details if the `USER_DETAIL_METHOD` is configured,
         else uses the user_id for both email and user_id properties.
         :param user_id: The Unique user id of a user entity
-        :return: a dictionary of user details
+        :return: a dictionary of user details, None if `USER_DETAIL_METHOD` does not know the user
         """
-        if app.config.get('USER_DETAIL_METHOD'):
-            user_details = app.config.get('USER_DETAIL_METHOD')(user_id)  # type: ignore
-        else:
-            user_details = {'email': user_id, 'user_id': user_id}
+        if has_user_detail_method():
+            return get_user_details(user_id)  # type: ignore
 
-        return user_details
+        return {'email': user_id, 'user_id': user_id}
+
+    def _get_users_details(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Resolves the details of many users with a single call when `USER_DETAIL_BATCH_METHOD` is configured.
+        Users without details get the user_id for both email and user_id properties.
+        :return: a dictionary of user details by user id
+        """
+        users_details = get_users_details(user_ids)
+        return {user_id: users_details.get(user_id) or {'email': user_id, 'user_id': user_id}
+                for user_id in user_ids}
 
     def _get_table_entity(self, *, table_uri: str) -> EntityUniqueAttribute:
         """
@@ -207,7 +347,7 @@ class AtlasProxy(BaseProxy):
                                              )
 
         try:
-            return self._driver.entity_unique_attribute(table_info['entity'], qualifiedName=table_qn)
+            return self._get_entity_by_qn(table_info['entity'], table_qn)
         except Exception as ex:
             LOGGER.exception(f'Table not found. {str(ex)}')
             raise NotFoundException('Table URI( {table_uri} ) does not exist'
@@ -220,16 +360,186 @@ class AtlasProxy(BaseProxy):
         :return:
         """
         try:
-            return self._driver.entity_unique_attribute("User",
-                                                        qualifiedName=user_id)
+            return self._get_entity_by_qn(self.USER_TYPE, user_id)
         except Exception as ex:
             raise NotFoundException('(User {user_id}) does not exist'
                                     .format(user_id=user_id))
 
-    def _create_bookmark(self, entity: EntityUniqueAttribute, user_guid: str, bookmark_qn: str,
+    def _get_entity_header(self, type_name: str, qualified_name: str,
+                           ignore_relationships: bool = True) -> Optional[Dict]:
+        """
+        Fetches an entity by unique attribute without the entities it refers to (e.g. every column of a table), which
+        is all the description, tag and owner paths need.
+        :param ignore_relationships: False to get the relationship headers (guid, relationshipGuid, status) too
+        :return: Entity, with guid, typeName and attributes, None if there is no such entity
+        """
+        entity = self._driver.entity_unique_attribute(type_name, qualifiedName=qualified_name, minExtInfo=True,
+                                                      ignoreRelationships=ignore_relationships).entity
+        if not entity:
+            return None
+        self._guid_index.put(('entity', type_name, qualified_name), entity[self.GUID_KEY])
+        return entity
+
+    def _get_table_header(self, *, table_uri: str, ignore_relationships: bool = True) -> Dict:
+        """
+        Lightweight alternative to _get_table_entity, for the methods reading or writing a few attributes of a table
+        :return: Table entity, with guid, typeName and attributes
+        """
+        table_info = self._extract_info_from_uri(table_uri=table_uri)
+        header = None
+        if table_info:
+            table_qn = make_table_qualified_name(table_info.get('name'),
+                                                 table_info.get('cluster'),
+                                                 table_info.get('db'))
+            header = self._get_entity_header(table_info['entity'], table_qn, ignore_relationships)
+        if header is None:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'
+                                    .format(table_uri=table_uri))
+        return header
+
+    def _table_guid_key(self, table_uri: str) -> Tuple[str, str, str]:
+        table_info = self._extract_info_from_uri(table_uri=table_uri)
+        return ('entity', table_info.get('entity', ''), make_table_qualified_name(table_info.get('name'),
+                                                                                  table_info.get('cluster'),
+                                                                                  table_info.get('db')))
+
+    def _get_table_guid(self, table_uri: str) -> str:
+        """
+        :return: guid of the table, from the guid index if it is known, from the table entity otherwise
+        """
+        return self._guid_index.get(self._table_guid_key(table_uri)) or \
+            self._get_table_header(table_uri=table_uri)[self.GUID_KEY]
+
+    def _get_user_guid(self, user_id: str) -> str:
+        """
+        :return: guid of the user, from the guid index if it is known, from the user entity otherwise
+        """
+        guid = self._guid_index.get(('entity', self.USER_TYPE, user_id))
+        if guid is None:
+            user_header = self._get_entity_header(self.USER_TYPE, user_id)
+            if user_header is None:
+                raise NotFoundException('(User {user_id}) does not exist'.format(user_id=user_id))
+            guid = user_header[self.GUID_KEY]
+        return guid
+
+    def _get_column_guid(self, table_uri: str, column_name: str) -> str:
+        """
+        :return: guid of the column, from the guid index if it is known, from the table entity otherwise
+        """
+        _, _, table_qn = self._table_guid_key(table_uri)
+        return self._guid_index.get(('column', table_qn, column_name)) or \
+            self._get_column(table_uri=table_uri, column_name=column_name)[self.GUID_KEY]
+
+    def _index_guids(self, type_name: str, qualified_name: str, entity: EntityUniqueAttribute) -> None:
+        """
+        Adds the guid of a fetched entity to the guid index, along with the guids of its columns for tables
+        """
+        if not entity.entity:
+            return
+        self._guid_index.put(('entity', type_name, qualified_name), entity.entity.get(self.GUID_KEY))
+        referred_entities = entity.referredEntities or dict()
+        for column in (entity.entity.get(self.REL_ATTRS_KEY) or dict()).get('columns') or list():
+            column_entity = referred_entities.get(column.get(self.GUID_KEY)) or dict()
+            column_name = (column_entity.get(self.ATTRS_KEY) or dict()).get('name')
+            if column_name:
+                self._guid_index.put(('column', qualified_name, column_name), column_entity.get(self.GUID_KEY))
+
+    def _write_with_guids(self, keys: List[Hashable], get_guids: Callable[[], Any], write: Callable[[Any], None],
+                          not_found_message: str) -> None:
+        """
+        Runs write with guids taken from the guid index when they are known. An indexed guid may be stale (e.g. the
+        entity was deleted and created again): when the write fails with NotFound or Conflict while any of the guids
+        came from the index, they are invalidated and the write is retried once with guids resolved from Atlas.
+        :param keys: Keys of the guids in the guid index
+        :param get_guids: Returns the guids write needs, from the guid index when they are known
+        :param write: Sends the write, given the guids
+        :param not_found_message: Message of the NotFoundException raised when the write fails with NotFound with
+        guids resolved from Atlas
+        :raises Conflict: if the write fails with Conflict with guids resolved from Atlas
+        """
+        retry = any(self._guid_index.get(key) is not None for key in keys)
+        while True:
+            guids = get_guids()
+            try:
+                write(guids)
+                return
+            except (NotFound, Conflict) as ex:
+                self._guid_index.invalidate(*keys)
+                if retry:
+                    LOGGER.info('Retrying with guids resolved from Atlas after {}'.format(str(ex)))
+                    statsd_utilities.incr(prefix=__name__, stat='guid_index.stale')
+                    retry = False
+                    continue
+                if isinstance(ex, NotFound):
+                    raise NotFoundException(not_found_message) from ex
+                raise
+
+    def _update_entity_attribute(self, *, guid: str, attribute: str, value: Any) -> None:
+        """
+        Sets a single attribute of an entity (partial update by guid), without fetching the entity first
+        API Ref: /resource_EntityREST.html#resource_EntityREST_partialUpdateEntityAttrByGuid_PUT
+        """
+        url = '{}/api/atlas/v2/entity/guid/{}'.format(self._driver.base_url, guid)
+        self._driver.client.put(url, params={'name': attribute}, data=value)
+
+    def _get_entity_by_qn(self, type_name: str, qualified_name: str) -> EntityUniqueAttribute:
+        def fetch() -> EntityUniqueAttribute:
+            entity = self._driver.entity_unique_attribute(type_name, qualifiedName=qualified_name)
+            self._index_guids(type_name, qualified_name, entity)
+            return entity
+
+        return self._get_memoized_entity((type_name, qualified_name), fetch)
+
+    def _get_memoized_entity(self, key: Tuple[str, str], fetch: Callable[[], Any]) -> Any:
+        """
+        Fetches an entity at most once per request: one operation often needs the same table or user entity several
+        times (e.g. to create a bookmark, then to read it). Entities are kept on flask.g, so they are dropped when the
+        request ends. Outside of a request, the entity is always fetched.
+        :param key: (type name, qualifiedName), or ('guid', guid) for entities fetched by guid
+        :param fetch: Fetches the entity when it is not known yet
+        """
+        memo = self._get_entity_memo()
+        if memo is None:
+            return fetch()
+        with _ENTITY_MEMO_LOCK:
+            if key in memo:
+                return memo[key]
+        entity = fetch()
+        with _ENTITY_MEMO_LOCK:
+            return memo.setdefault(key, entity)
+
+    @staticmethod
+    def _get_entity_memo() -> Optional[Dict[Tuple[str, str], Any]]:
+        """
+        :return: The entities fetched during the request, None outside of a request. Tasks handed the memo of a
+        request through flask.g (see BoundedExecutor g_attrs) share it with the request, hence the lock around it.
+        """
+        if has_request_context():
+            return g.setdefault(_ENTITY_MEMO_ATTR, dict())
+        return g.get(_ENTITY_MEMO_ATTR) if has_app_context() else None
+
+    def _forget_entity(self, key: Tuple[str, str]) -> None:
+        """
+        Drops an entity from the request memo, for changes not made through the memoized entity itself (relationships,
+        classifications, new entities)
+        """
+        memo = self._get_entity_memo()
+        if memo is not None:
+            with _ENTITY_MEMO_LOCK:
+                memo.pop(key, None)
+
+    def _forget_table_entity(self, table_uri: str) -> None:
+        table_info = self._extract_info_from_uri(table_uri=table_uri)
+        self._forget_entity((table_info.get('entity', ''),
+                             make_table_qualified_name(table_info.get('name'),
+                                                       table_info.get('cluster'),
+                                                       table_info.get('db'))))
+
+    def _create_bookmark(self, table_guid: str, user_guid: str, bookmark_qn: str,
                          table_uri: str) -> None:
         """
         Creates a bookmark entity for a specific user and table uri.
+        :param table_guid: Table's guid
         :param user_guid: User's guid
         :param bookmark_qn: Bookmark qualifiedName
         :return:
@@ -242,12 +552,20 @@ class AtlasProxy(BaseProxy):
                                self.BOOKMARK_ACTIVE_KEY: True,
                                'entityUri': table_uri,
                                'user': {'guid': user_guid},
-                               'entity': {'guid': entity.entity[self.GUID_KEY]}}
+                               'entity': {'guid': table_guid}}
             }
         }
 
         self._driver.entity_post.create(data=bookmark_entity)
 
+    def _make_bookmark_qn(self, table_uri: str, user_id: str) -> str:
+        table_info = self._extract_info_from_uri(table_uri=table_uri)
+        return '{}.{}.{}.{}.bookmark@{}'.format(table_info.get('db'),
+                                                table_info.get('name'),
+                                                table_info.get('entity'),
+                                                user_id,
+                                                table_info.get('cluster'))
+
     def _get_bookmark_entity(self, entity_uri: str, user_id: str) -> EntityUniqueAttribute:
         """
         Fetch a Bookmark entity from parsing table uri and user id.
@@ -256,25 +574,21 @@ class AtlasProxy(BaseProxy):
         :param user_id: Qualified Name of a user
         :return:
         """
-        table_info = self._extract_info_from_uri(table_uri=entity_uri)
-        bookmark_qn = '{}.{}.{}.{}.bookmark@{}'.format(table_info.get('db'),
-                                                       table_info.get('name'),
-                                                       table_info.get('entity'),
-                                                       user_id,
-                                                       table_info.get('cluster'))
+        bookmark_qn = self._make_bookmark_qn(entity_uri, user_id)
 
         try:
-            bookmark_entity = self._driver.entity_unique_attribute(self.BOOKMARK_TYPE, qualifiedName=bookmark_qn)
+            bookmark_entity = self._get_entity_by_qn(self.BOOKMARK_TYPE, bookmark_qn)
 
             if not bookmark_entity.entity:
-                table_entity = self._get_table_entity(table_uri=entity_uri)
-                # Fetch user entity from user_id for relation
-                user_entity = self._get_user_entity(user_id)
                 # Create bookmark entity with the user relation.
-                self._create_bookmark(table_entity,
-                                      user_entity.entity[self.GUID_KEY], bookmark_qn, entity_uri)
+                self._write_with_guids(
+                    [self._table_guid_key(entity_uri), ('entity', self.USER_TYPE, user_id)],
+                    lambda: (self._get_table_guid(entity_uri), self._get_user_guid(user_id)),
+                    lambda guids: self._create_bookmark(guids[0], guids[1], bookmark_qn, entity_uri),
+                    'Table URI( {table_uri} ) does not exist'.format(table_uri=entity_uri))
                 # Fetch bookmark entity after creating it.
-                bookmark_entity = self._driver.entity_unique_attribute(self.BOOKMARK_TYPE, qualifiedName=bookmark_qn)
+                self._forget_entity((self.BOOKMARK_TYPE, bookmark_qn))
+                bookmark_entity = self._get_entity_by_qn(self.BOOKMARK_TYPE, bookmark_qn)
 
             return bookmark_entity
 
@@ -304,17 +618,23 @@ class AtlasProxy(BaseProxy):
             LOGGER.exception(f'Column not found: {str(ex)}')
             raise NotFoundException(f'Column not found: {column_name}')
 
-    def _serialize_columns(self, *, entity: EntityUniqueAttribute) -> \
+    def _serialize_columns(self, *, entity: EntityUniqueAttribute,
+                           offset: int = 0,
+                           limit: Optional[int] = None,
+                           fields: Optional[Set[ColumnField]] = None) -> \
             Union[List[Column], List]:
         """
         Helper function to fetch the columns from entity and serialize them
         using Column and Statistics model.
         :param entity: EntityUniqueAttribute object,
         along with relationshipAttributes
+        :param offset: Number of columns (in sort order) to skip
+        :param limit: Max number of columns to serialize, all of them if None
+        :param fields: Optional column fields to serialize, all of them if None
         :return: A list of Column objects, if there are any columns available,
         else an empty list.
         """
-        columns = list()
+        active_columns = list()
         for column in entity.entity[self.REL_ATTRS_KEY].get('columns') or list():
             column_status = column.get('entityStatus', 'inactive').lower()
 
@@ -322,39 +642,16 @@ class AtlasProxy(BaseProxy):
                 continue
 
             col_entity = entity.referredEntities[column[self.GUID_KEY]]
-            col_attrs = col_entity[self.ATTRS_KEY]
-            statistics = list()
-
-            for stats in col_attrs.get('statistics') or list():
-                stats_attrs = stats['attributes']
+            active_columns.append(col_entity[self.ATTRS_KEY])
 
-                stat_type = stats_attrs.get('stat_name')
+        # Only the requested page of columns gets serialized
+        active_columns.sort(key=lambda col_attrs: col_attrs.get('position') or 9999)
+        end = offset + limit if limit is not None else None
 
-                stat_format = self.STATISTICS_FORMAT_SPEC.get(stat_type, dict())
-
-                if not stat_format.get('drop', False):
-                    stat_type = stat_format.get('new_name', stat_type)
-
-                    stat_val = stats_attrs.get('stat_val')
-
-                    format_val = stat_format.get('format')
-
-                    if format_val:
-                        stat_val = format_val.format(stat_val)
-                    else:
-                        stat_val = str(stat_val)
-
-                    start_epoch = stats_attrs.get('start_epoch')
-                    end_epoch = stats_attrs.get('end_epoch')
-
-                    statistics.append(
-                        Statistics(
-                            stat_type=stat_type,
-                            stat_val=stat_val,
-                            start_epoch=start_epoch,
-                            end_epoch=end_epoch,
-                        )
-                    )
+        columns = list()
+        for col_attrs in active_columns[offset:end]:
+            statistics = self._serialize_column_stats(col_attrs) \
+                if fields is None or ColumnField.Stats in fields else list()
 
             columns.append(
                 Column(
@@ -365,13 +662,104 @@ class AtlasProxy(BaseProxy):
                     stats=statistics,
                 )
             )
-        return sorted(columns, key=lambda item: item.sort_order)
+        return columns
+
+    def _serialize_column_stats(self, col_attrs: Dict) -> List[Statistics]:
+        statistics = list()
+
+        for stats in col_attrs.get('statistics') or list():
+            stats_attrs = stats['attributes']
+
+            stat_type = stats_attrs.get('stat_name')
+
+            stat_format = self.STATISTICS_FORMAT_SPEC.get(stat_type, dict())
+
+            if not stat_format.get('drop', False):
+                stat_type = stat_format.get('new_name', stat_type)
+
+                stat_val = stats_attrs.get('stat_val')
+
+                format_val = stat_format.get('format')
+
+                if format_val:
+                    stat_val = format_val.format(stat_val)
+                else:
+                    stat_val = str(stat_val)
+
+                start_epoch = stats_attrs.get('start_epoch')
+                end_epoch = stats_attrs.get('end_epoch')
+
+                statistics.append(
+                    Statistics(
+                        stat_type=stat_type,
+                        stat_val=stat_val,
+                        start_epoch=start_epoch,
+                        end_epoch=end_epoch,
+                    )
+                )
+
+        return statistics
+
+    def _get_entities_by_guids(self, guids: List[str], **params: Any) -> Iterator[Any]:
+        """
+        Fetches entities with entity_bulk calls of at most ATLAS_ENTITY_BULK_CHUNK_SIZE guids each, see
+        _fetch_in_chunks.
+
+        :param guids:
+        :param params: Extra parameters of entity_bulk, e.g. ignoreRelationships
+        :return: Entities of each chunk, in the order of the chunks, as soon as the chunk is fetched
+        """
+        def fetch(chunk: List[str]) -> List[Any]:
+            # entity_bulk collections are lazy, the request is only sent when iterating over them
+            return list(extract_entities(self._driver.entity_bulk(guid=chunk, **params)))
+
+        return self._fetch_in_chunks(guids, fetch)
+
+    def _fetch_in_chunks(self, items: List[Any], fetch: Callable[[List[Any]], List[Any]],
+                         name: str = 'entity_bulk') -> Iterator[Any]:
+        """
+        Calls fetch with chunks of at most ATLAS_ENTITY_BULK_CHUNK_SIZE items each, running concurrently on the bulk
+        executor, so that no Atlas request carries an unbounded query string or body. A chunk failing is logged and
+        left out (<name>.chunk_fail is reported to statsd), the error is only raised when every chunk failed.
+
+        :param items: e.g. guids
+        :param fetch: Fetches the results of a chunk of items
+        :return: Results of each chunk, in the order of the chunks, as soon as the chunk is fetched
+        """
+        chunk_size = max(1, app.config.get(config.ATLAS_ENTITY_BULK_CHUNK_SIZE, 100))
+        chunks = [items[index:index + chunk_size] for index in range(0, len(items), chunk_size)]
+
+        if len(chunks) <= 1:
+            return iter(fetch(chunks[0]) if chunks else [])
+
+        # chunks fetched for a lookup of get_table are bound to its deadline too
+        fetch = _with_deadline(fetch, getattr(_request_deadline, 'deadline', None))
+
+        # Submitted right away rather than from the generator, so chunks are fetched while the first ones are
+        # consumed, each in an app context of its own (see BoundedExecutor)
+        futures = [self._bulk_executor.submit(fetch, chunk) for chunk in chunks]
+        return self._iter_chunks(futures, name)
+
+    def _iter_chunks(self, futures: List[Any], name: str) -> Iterator[Any]:
+        error = None  # type: Optional[Exception]
+        failures = 0
+        for future in futures:
+            try:
+                results = future.result()
+            except Exception as ex:
+                LOGGER.exception('Error while fetching a chunk of {}, leaving it out'.format(name))
+                statsd_utilities.incr(prefix=__name__, stat='{}.chunk_fail'.format(name))
+                error = ex
+                failures += 1
+                continue
+            yield from results
+        if error is not None and failures == len(futures):
+            raise error
 
     def _get_reports(self, guids: List[str]) -> List[ResourceReport]:
         reports = []
         if guids:
-            report_entities_collection = self._driver.entity_bulk(guid=guids)
-            for report_entity in extract_entities(report_entities_collection):
+            for report_entity in self._get_entities_by_guids(guids):
                 try:
                     if report_entity.status == Status.ACTIVE:
                         report_attrs = report_entity.attributes
@@ -399,15 +787,16 @@ class AtlasProxy(BaseProxy):
                                data_owners)
 
         for owner in active_owners:
-            owner_qn = owner['displayText']
-            owner_data = self._get_user_details(owner_qn)
-            owners_detail.append(User(**owner_data))
-            active_owners_list.append(owner_qn)
+            active_owners_list.append(owner['displayText'])
 
         # To avoid the duplication,
         # we are checking if the fallback is not in data_owners
         if fallback_owner and (fallback_owner not in active_owners_list):
-            owners_detail.append(User(**self._get_user_details(fallback_owner)))
+            active_owners_list.append(fallback_owner)
+
+        users_details = self._get_users_details(active_owners_list)
+        for owner_qn in active_owners_list:
+            owners_detail.append(User(**users_details[owner_qn]))
 
         return owners_detail
 
@@ -417,15 +806,35 @@ class AtlasProxy(BaseProxy):
     def get_users(self) -> List[UserEntity]:
         pass
 
-    def get_table(self, *, table_uri: str) -> Table:
+    def get_table(self, *, table_uri: str,
+                  column_offset: int = 0,
+                  column_limit: Optional[int] = None,
+                  column_fields: Optional[Set[ColumnField]] = None) -> Table:
         """
         Gathers all the information needed for the Table Detail Page.
         :param table_uri:
+        :param column_offset: Number of columns (in sort order) to skip
+        :param column_limit: Max number of columns to return, all of them if None
+        :param column_fields: Optional column fields to load, all of them if None
         :return: A Table object with all the information available
         or gathered from different entities.
         """
         entity = self._get_table_entity(table_uri=table_uri)
+        return self._serialize_table(entity=entity, table_uri=table_uri, column_offset=column_offset,
+                                     column_limit=column_limit, column_fields=column_fields)
+
+    def _serialize_table(self, *, entity: Any, table_uri: str,
+                         detail_level: TableDetailLevel = TableDetailLevel.Full,
+                         column_offset: int = 0,
+                         column_limit: Optional[int] = None,
+                         column_fields: Optional[Set[ColumnField]] = None) -> Table:
+        """
+        :param entity: EntityUniqueAttribute, or any object with the table as entity and its columns in
+        referredEntities
+        :param detail_level: Summary skips columns, readers and reports
+        """
         table_details = entity.entity
+        is_full = detail_level == TableDetailLevel.Full
 
         try:
             attrs = table_details[self.ATTRS_KEY]
@@ -446,10 +855,20 @@ class AtlasProxy(BaseProxy):
                     )
                 )
 
-            columns = self._serialize_columns(entity=entity)
+            columns = self._serialize_columns(entity=entity, offset=column_offset, limit=column_limit,
+                                              fields=column_fields) if is_full else []
 
             reports_guids = [report.get("guid") for report in attrs.get("reports") or list()]
 
+            lookups = {
+                'owners': lambda: self._get_owners(table_details[self.REL_ATTRS_KEY].get('ownedBy', []),
+                                                   attrs.get('owner')),
+            }  # type: Dict[str, Callable[[], List]]
+            if is_full:
+                lookups['reports'] = lambda: self._get_reports(guids=reports_guids)
+                lookups['readers'] = lambda: self._get_readers(attrs.get(self.QN_KEY))
+            results = self._run_lookups(lookups, table_uri=table_uri)
+
             is_view = True if attrs.get('tableType', 'table').lower().find('view') != -1 else False
 
             table = Table(
@@ -459,12 +878,11 @@ class AtlasProxy(BaseProxy):
                 name=attrs.get('name') or table_qn.get("table_name", ''),
                 tags=tags,
                 description=attrs.get('description') or attrs.get('comment'),
-                owners=self._get_owners(
-                    table_details[self.REL_ATTRS_KEY].get('ownedBy', []), attrs.get('owner')),
-                resource_reports=self._get_reports(guids=reports_guids),
+                owners=results['owners'],
+                resource_reports=results['reports'] if is_full else None,
                 columns=columns,
                 is_view=is_view,
-                table_readers=self._get_readers(attrs.get(self.QN_KEY)),
+                table_readers=results['readers'] if is_full else [],
                 last_updated_timestamp=self._parse_date(table_details.get('updateTime')),
                 programmatic_descriptions=programmatic_descriptions)
 
@@ -476,26 +894,176 @@ class AtlasProxy(BaseProxy):
                              'are missing in : ( {table_uri} )'
                              .format(table_uri=table_uri))
 
+    def _run_lookups(self, lookups: Dict[str, Callable[[], List]], *, table_uri: str) -> Dict[str, List]:
+        """
+        Runs the independent lookups of a table (owners, reports, readers), which each call Atlas or
+        USER_DETAIL_METHOD, concurrently on the query executor. A lookup not done ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC
+        seconds after they were all submitted, or failing past that deadline, is given up on: its result is an empty
+        list, so a slow lookup degrades the page rather than failing it, and <name>.timeout is reported to statsd. Any
+        other error is raised.
+
+        Cancelling a lookup given up on only helps while it waits for a thread. Once running, it is stopped by its
+        Atlas calls timing out at the deadline, which frees its thread for the next requests. USER_DETAIL_METHOD
+        calls are not bound, they keep the thread until they return.
+        :param lookups: Lookup functions by name
+        :return: Result of each lookup by name
+        """
+        timeout_sec = app.config.get(config.ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC)
+        deadline = time.time() + timeout_sec if timeout_sec else None
+        # created before submitting, for the lookups to get the memo of the request
+        self._get_entity_memo()
+        futures = {name: self._query_executor.submit(_with_deadline(lookup, deadline))
+                   for name, lookup in lookups.items()}
+
+        results = dict()  # type: Dict[str, List]
+        try:
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result(timeout=max(0.0, deadline - time.time()) if deadline else None)
+                    continue
+                except FutureTimeoutError:
+                    pass
+                except Exception:
+                    # e.g. the Atlas request of the lookup timing out right at the deadline
+                    if deadline is None or time.time() < deadline:
+                        raise
+                future.cancel()
+                LOGGER.warning('Gave up on the {} of {} after {} seconds'.format(name, table_uri, timeout_sec))
+                statsd_utilities.incr(prefix=__name__, stat='{}.timeout'.format(name))
+                results[name] = []
+        except Exception:
+            for future in futures.values():
+                future.cancel()
+            raise
+        return results
+
+    def get_tables(self, *, table_uris: List[str],
+                   detail_level: TableDetailLevel = TableDetailLevel.Summary) -> List[Optional[Table]]:
+        """
+        Resolves the guids of the tables with basic searches and fetches the tables with entity_bulk calls, both
+        ATLAS_ENTITY_BULK_CHUNK_SIZE tables at a time (see _fetch_in_chunks). The tables of a chunk failing are
+        reported as not found. The full detail level still looks readers and reports up table by table.
+
+        :param table_uris:
+        :param detail_level: Summary leaves columns, readers and reports out
+        :return: The table of each uri, in the order of table_uris, None for the tables which do not exist
+        """
+        guids = self._get_table_guids(table_uris)
+        uris = {guid: table_uri for table_uri, guid in guids.items()}
+
+        def fetch(chunk: List[str]) -> List[_BulkTableEntity]:
+            # Columns are referred entities, which are only needed for the full detail level. Each table keeps the
+            # referred entities of its own collection.
+            collections = self._driver.entity_bulk(guid=chunk, minExtInfo=detail_level == TableDetailLevel.Summary)
+            return [_BulkTableEntity(entity=table_entity, referredEntities=collection.referredEntities or {})
+                    for collection in collections
+                    for table_entity in collection.entities]
+
+        tables = {}  # type: Dict[str, Table]
+        for bulk_table in self._fetch_in_chunks(sorted(uris), fetch):
+            table_entity = bulk_table.entity
+            entity = _BulkTableEntity(entity=self._get_bulk_entity_details(table_entity),
+                                      referredEntities=bulk_table.referredEntities)
+            try:
+                tables[table_entity.guid] = self._serialize_table(
+                    entity=entity, table_uri=uris[table_entity.guid], detail_level=detail_level)
+            except BadRequest:
+                LOGGER.exception('Skipping table {}'.format(uris[table_entity.guid]))
+
+        return [tables.get(guids.get(table_uri, '')) for table_uri in table_uris]
+
+    def _get_table_guids(self, table_uris: List[str]) -> Dict[str, str]:
+        """
+        Searches the tables of each type ATLAS_ENTITY_BULK_CHUNK_SIZE qualified names at a time
+        :return: guid of each table uri, tables which do not exist are left out
+        """
+        uris_by_type = dict()  # type: Dict[str, Dict[str, str]]
+        for table_uri in table_uris:
+            table_info = self._extract_info_from_uri(table_uri=table_uri)
+            if table_info:
+                table_qn = make_table_qualified_name(table_info.get('name'),
+                                                     table_info.get('cluster'),
+                                                     table_info.get('db'))
+                uris_by_type.setdefault(table_info['entity'], dict())[table_qn] = table_uri
+
+        def search(type_name: str, table_qns: List[str]) -> List[Tuple[str, str]]:
+            params = {
+                'typeName': type_name,
+                'excludeDeletedEntities': True,
+                'limit': len(table_qns),
+                'attributes': [self.QN_KEY],
+                'entityFilters': {
+                    'condition': 'OR',
+                    'criterion': [{'attributeName': self.QN_KEY, 'operator': '=', 'attributeValue': table_qn}
+                                  for table_qn in table_qns]
+                }
+            }
+            return [(entity.attributes.get(self.QN_KEY), entity.guid)
+                    for entity in self._driver.search_basic.create(data=params).entities]
+
+        # the searches of every type are submitted before any of them is waited for
+        found = [(type_name, self._fetch_in_chunks(list(uris_by_qn), partial(search, type_name), name='search_basic'))
+                 for type_name, uris_by_qn in uris_by_type.items()]
+
+        guids = dict()  # type: Dict[str, str]
+        for type_name, found_guids in found:
+            uris_by_qn = uris_by_type[type_name]
+            for found_qn, guid in found_guids:
+                if found_qn in uris_by_qn:
+                    guids[uris_by_qn[found_qn]] = guid
+                    self._guid_index.put(('entity', type_name, found_qn), guid)
+        return guids
+
+    def _get_bulk_entity_details(self, entity: Any) -> Dict:
+        """
+        Shapes an entity of an entity_bulk response like the entity of an EntityUniqueAttribute
+        """
+        return {
+            'typeName': entity.typeName,
+            'updateTime': entity.updateTime,
+            'classifications': [{'typeName': name} for name in entity.classificationNames or list()],
+            self.ATTRS_KEY: entity.attributes,
+            self.REL_ATTRS_KEY: entity.relationshipAttributes or dict(),
+        }
+
+    def get_table_columns(self, *, table_uri: str,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Set[ColumnField]] = None) -> List[Column]:
+        entity = self._get_table_entity(table_uri=table_uri)
+        return self._serialize_columns(entity=entity, offset=offset, limit=limit, fields=fields)
+
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         """
         :param table_uri:
         :param owner:
         :return:
         """
-        table = self._get_table_entity(table_uri=table_uri)
-        table_entity = table.entity
+        # the relationship headers are enough to find the ownership, the columns are not needed
+        table_entity = self._get_table_header(table_uri=table_uri, ignore_relationships=False)
+        owned_by = (table_entity.get(self.REL_ATTRS_KEY) or dict()).get('ownedBy')
+
+        if owned_by:
+            user_key = ('entity', self.USER_TYPE, owner)
+            retry = self._guid_index.get(user_key) is not None
+            while True:
+                try:
+                    owner_guid = self._get_user_guid(owner)
+                except NotFoundException:
+                    raise BadRequest('You can not delete this owner.')
+                active_owners = [item for item in owned_by
+                                 if item['relationshipStatus'] == Status.ACTIVE and item[self.GUID_KEY] == owner_guid]
+                if active_owners or not retry:
+                    break
+                # the indexed guid may be the one of a user created again since
+                self._guid_index.invalidate(user_key)
+                retry = False
 
-        if table_entity[self.REL_ATTRS_KEY].get("ownedBy"):
+            if not active_owners:
+                raise BadRequest('You can not delete this owner.')
             try:
-                active_owners = filter(lambda item:
-                                       item['relationshipStatus'] == Status.ACTIVE
-                                       and item['displayText'] == owner,
-                                       table_entity[self.REL_ATTRS_KEY]['ownedBy'])
-                if list(active_owners):
-                    self._driver.relationship_guid(next(active_owners)
-                                                   .get('relationshipGuid')).delete()
-                else:
-                    raise BadRequest('You can not delete this owner.')
+                self._driver.relationship_guid(active_owners[0].get('relationshipGuid')).delete()
+                self._forget_table_entity(table_uri)
             except NotFound as ex:
                 LOGGER.exception('Error while removing table data owner. {}'
                                  .format(str(ex)))
@@ -514,30 +1082,42 @@ class AtlasProxy(BaseProxy):
         if not owner_info:
             raise NotFoundException(f'User "{owner}" does not exist.')
 
-        user_dict = {
-            "entity": {
-                "typeName": "User",
-                "attributes": {"qualifiedName": owner},
-            }
-        }
-
-        # Get or Create a User
-        user_entity = self._driver.entity_post.create(data=user_dict)
-        user_guid = next(iter(user_entity.get("guidAssignments").values()))
+        user_key = ('entity', self.USER_TYPE, owner)
 
-        table = self._get_table_entity(table_uri=table_uri)
+        def get_guids() -> Tuple[str, str]:
+            user_guid = self._guid_index.get(user_key)
+            if user_guid is None:
+                user_dict = {
+                    "entity": {
+                        "typeName": "User",
+                        "attributes": {"qualifiedName": owner},
+                    }
+                }
+
+                # Get or Create a User
+                user_entity = self._driver.entity_post.create(data=user_dict)
+                user_guid = next(iter(user_entity.get("guidAssignments").values()))
+                self._guid_index.put(user_key, user_guid)
+            return self._get_table_guid(table_uri), user_guid
+
+        def create_relationship(guids: Tuple[str, str]) -> None:
+            table_guid, user_guid = guids
+            entity_def = {
+                "typeName": "DataSet_Users_Owner",
+                "end1": {
+                    "guid": table_guid, "typeName": "Table",
+                },
+                "end2": {
+                    "guid": user_guid, "typeName": "User",
+                },
+            }
+            self._driver.relationship.create(data=entity_def)
 
-        entity_def = {
-            "typeName": "DataSet_Users_Owner",
-            "end1": {
-                "guid": table.entity.get("guid"), "typeName": "Table",
-            },
-            "end2": {
-                "guid": user_guid, "typeName": "User",
-            },
-        }
         try:
-            self._driver.relationship.create(data=entity_def)
+            self._write_with_guids([self._table_guid_key(table_uri), user_key], get_guids, create_relationship,
+                                   'Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+            self._forget_table_entity(table_uri)
+            self._forget_entity((self.USER_TYPE, owner))
         except Conflict as ex:
             LOGGER.exception('Error while adding the owner information. {}'
                              .format(str(ex)))
@@ -550,8 +1130,8 @@ class AtlasProxy(BaseProxy):
         :param table_uri:
         :return: The description of the table as a string
         """
-        entity = self._get_table_entity(table_uri=table_uri)
-        return entity.entity[self.ATTRS_KEY].get('description')
+        table = self._get_table_header(table_uri=table_uri)
+        return table[self.ATTRS_KEY].get('description')
 
     def put_table_description(self, *,
                               table_uri: str,
@@ -562,9 +1142,12 @@ class AtlasProxy(BaseProxy):
         :param description: Description string
         :return: None
         """
-        entity = self._get_table_entity(table_uri=table_uri)
-        entity.entity[self.ATTRS_KEY]['description'] = description
-        entity.update()
+        self._write_with_guids([self._table_guid_key(table_uri)],
+                               lambda: self._get_table_guid(table_uri),
+                               lambda guid: self._update_entity_attribute(guid=guid, attribute='description',
+                                                                          value=description),
+                               'Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+        self._forget_table_entity(table_uri)
 
     def add_tag(self, *, id: str, tag: str, tag_type: str,
                 resource_type: ResourceType = ResourceType.Table) -> None:
@@ -576,10 +1159,14 @@ class AtlasProxy(BaseProxy):
         :param tag_type
         :return: None
         """
-        entity = self._get_table_entity(table_uri=id)
-        entity_bulk_tag = {"classification": {"typeName": tag},
-                           "entityGuids": [entity.entity[self.GUID_KEY]]}
-        self._driver.entity_bulk_classification.create(data=entity_bulk_tag)
+        def classify(table_guid: str) -> None:
+            entity_bulk_tag = {"classification": {"typeName": tag},
+                               "entityGuids": [table_guid]}
+            self._driver.entity_bulk_classification.create(data=entity_bulk_tag)
+
+        self._write_with_guids([self._table_guid_key(id)], lambda: self._get_table_guid(id), classify,
+                               'Table URI( {table_uri} ) does not exist'.format(table_uri=id))
+        self._forget_table_entity(id)
 
     def add_badge(self, *, id: str, badge_name: str, category: str = '',
                   resource_type: ResourceType) -> None:
@@ -596,8 +1183,8 @@ class AtlasProxy(BaseProxy):
         :return:
         """
         try:
-            entity = self._get_table_entity(table_uri=id)
-            guid_entity = self._driver.entity_guid(entity.entity[self.GUID_KEY])
+            guid_entity = self._driver.entity_guid(self._get_table_guid(id))
+            self._forget_table_entity(id)
             guid_entity.classifications(tag).delete()
         except Exception as ex:
             # FixMe (Verdan): Too broad exception. Please make it specific
@@ -619,14 +1206,15 @@ class AtlasProxy(BaseProxy):
         :param description: The description string
         :return: None, as it simply updates the description of a column
         """
-        column_detail = self._get_column(
-            table_uri=table_uri,
-            column_name=column_name)
-        col_guid = column_detail[self.GUID_KEY]
-
-        entity = self._driver.entity_guid(col_guid)
-        entity.entity[self.ATTRS_KEY]['description'] = description
-        entity.update(attribute='description')
+        _, _, table_qn = self._table_guid_key(table_uri)
+        self._write_with_guids([('column', table_qn, column_name)],
+                               lambda: self._get_column_guid(table_uri, column_name),
+                               lambda guid: self._update_entity_attribute(guid=guid, attribute='description',
+                                                                          value=description),
+                               'Column {column_name} of table URI( {table_uri} ) does not exist'
+                               .format(column_name=column_name, table_uri=table_uri))
+        # the table entity refers to the column with its former description
+        self._forget_table_entity(table_uri)
 
     def get_column_description(self, *,
                                table_uri: str,
@@ -634,18 +1222,34 @@ class AtlasProxy(BaseProxy):
         """
         :param table_uri:
         :param column_name:
-        :return: The column description using the referredEntities
-        information of a table entity
+        :return: The column description, from the column entity alone when the guid of the column is known, using
+        the referredEntities information of the table entity otherwise
         """
+        _, _, table_qn = self._table_guid_key(table_uri)
+        column_key = ('column', table_qn, column_name)
+        column_guid = self._guid_index.get(column_key)
+        if column_guid is not None:
+            try:
+                column_entities = list(self._get_entities_by_guids([column_guid], minExtInfo=True,
+                                                                   ignoreRelationships=True))
+            except NotFound:
+                column_entities = []
+            for column_entity in column_entities:
+                if column_entity.status == Status.ACTIVE:
+                    return column_entity.attributes.get('description')
+            # the column was deleted since its guid was indexed, the table entity tells whether it exists again
+            self._guid_index.invalidate(column_key)
+            statsd_utilities.incr(prefix=__name__, stat='guid_index.stale')
+
         column_detail = self._get_column(
             table_uri=table_uri,
             column_name=column_name)
         return column_detail[self.ATTRS_KEY].get('description')
 
-    def _serialize_popular_tables(self, entities: list) -> List[PopularTable]:
+    def _serialize_popular_tables(self, entities: Iterable) -> List[PopularTable]:
         """
         Gets a list of entities and serialize the popular tables.
-        :param entities: List of entities from atlas client
+        :param entities: Entities from atlas client
         :return: a list of PopularTable objects
         """
         popular_tables = list()
@@ -719,19 +1323,39 @@ class AtlasProxy(BaseProxy):
         # Not implemented
         return []
 
-    def _get_resources_followed_by_user(self, user_id: str, resource_type: str) \
+    def _iter_basic_search(self, params: Dict[str, Any], limit: Optional[int] = None) -> Iterator[Any]:
+        """
+        Pages lazily through the results of a basic search, ATLAS_SEARCH_PAGE_SIZE entities per search, so that only
+        one page is held at a time. params should sort the results, for pages not to overlap.
+        :param params: Basic search parameters, without offset and limit
+        :param limit: Maximum number of entities to return, all of them if None
+        """
+        page_size = max(1, app.config.get(config.ATLAS_SEARCH_PAGE_SIZE, 1000))
+        fetched = 0
+        while limit is None or fetched < limit:
+            size = page_size if limit is None else min(page_size, limit - fetched)
+            page = list(self._driver.search_basic.create(data=dict(params, offset=str(fetched),
+                                                                   limit=str(size))).entities)
+            yield from page
+            fetched += len(page)
+            if len(page) < size:
+                return
+
+    def _get_resources_followed_by_user(self, user_id: str, resource_type: str,
+                                        after: Optional[str] = None, limit: Optional[int] = None) \
             -> List[Union[PopularTable, DashboardSummary]]:
         """
         ToDo (Verdan): Dashboard still needs to be implemented.
         Helper function to get the resource, table, dashboard etc followed by a user.
         :param user_id: User ID of a user
         :param resource_type: Type of a resource that returns, could be table, dashboard etc.
+        :param after: Key of the last table of the previous page, the tables whose bookmark comes after its bookmark
+        in qualifiedName order are returned
+        :param limit: Maximum number of resources to return, all of them if None
         :return: A list of PopularTable, DashboardSummary or any other resource.
         """
         params = {
             'typeName': self.BOOKMARK_TYPE,
-            'offset': '0',
-            'limit': '1000',
             'excludeDeletedEntities': True,
             'entityFilters': {
                 'condition': 'AND',
@@ -748,13 +1372,20 @@ class AtlasProxy(BaseProxy):
                     }
                 ]
             },
-            'attributes': ['count', self.QN_KEY, self.ENTITY_URI_KEY]
-        }
-        # Fetches the bookmark entities based on filters
-        search_results = self._driver.search_basic.create(data=params)
+            'attributes': ['count', self.QN_KEY, self.ENTITY_URI_KEY],
+            'sortBy': self.QN_KEY,
+            'sortOrder': 'ASCENDING'
+        }  # type: Dict[str, Any]
+        if after is not None:
+            params['entityFilters']['criterion'].append({
+                'attributeName': self.QN_KEY,
+                'operator': 'gt',
+                'attributeValue': self._make_bookmark_qn(after, user_id)
+            })
 
         resources = []
-        for record in search_results.entities:
+        # Fetches the bookmark entities based on filters
+        for record in self._iter_basic_search(params, limit=limit):
             table_info = self._extract_info_from_uri(table_uri=record.attributes[self.ENTITY_URI_KEY])
             res = self._parse_bookmark_qn(record.attributes[self.QN_KEY])
             resources.append(PopularTable(
@@ -782,7 +1413,7 @@ class AtlasProxy(BaseProxy):
             LOGGER.exception(f'Resource Type ({resource_type}) is not yet implemented')
             raise NotImplemented
 
-        user_entity = self._driver.entity_unique_attribute(self.USER_TYPE, qualifiedName=user_id).entity
+        user_entity = self._get_entity_by_qn(self.USER_TYPE, user_id).entity
 
         if not user_entity:
             LOGGER.exception(f'User ({user_id}) not found in Atlas')
@@ -815,7 +1446,7 @@ class AtlasProxy(BaseProxy):
             resource_guids.add(table.guid)
 
         if resource_guids:
-            entities = extract_entities(self._driver.entity_bulk(guid=list(resource_guids), ignoreRelationships=True))
+            entities = self._get_entities_by_guids(list(resource_guids), ignoreRelationships=True)
             if resource_type == ResourceType.Table.name:
                 resources = self._serialize_popular_tables(entities)
         else:
@@ -823,15 +1454,18 @@ class AtlasProxy(BaseProxy):
 
         return resources
 
-    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) \
+    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                       after: Optional[str] = None, limit: Optional[int] = None) \
             -> Dict[str, List[DashboardSummary]]:
         pass
 
-    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) -> Dict[str, Any]:
+    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                   after: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
         tables = list()
         if relation_type == UserResourceRel.follow:
             tables = self._get_resources_followed_by_user(user_id=user_email,
-                                                          resource_type=ResourceType.Table.name)
+                                                          resource_type=ResourceType.Table.name,
+                                                          after=after, limit=limit)
         elif relation_type == UserResourceRel.own:
             tables = self._get_resources_owned_by_user(user_id=user_email,
                                                        resource_type=ResourceType.Table.name)
@@ -839,41 +1473,61 @@ class AtlasProxy(BaseProxy):
         return {'table': tables}
 
     def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, List[PopularTable]]:
-        user = self._driver.entity_unique_attribute(self.USER_TYPE, qualifiedName=user_email).entity
-
-        readers_guids = []
-        for user_reads in user['relationshipAttributes'].get('entityReads'):
-            entity_status = user_reads['entityStatus']
-            relationship_status = user_reads['relationshipStatus']
-
-            if entity_status == Status.ACTIVE and relationship_status == Status.ACTIVE:
-                readers_guids.append(user_reads['guid'])
-
-        readers = extract_entities(self._driver.entity_bulk(guid=readers_guids, ignoreRelationships=True))
-
-        _results = {}
-        for reader in readers:
-            entity_uri = reader.attributes.get(self.ENTITY_URI_KEY)
-            count = reader.attributes.get('count')
-
-            if count:
-                details = self._extract_info_from_uri(table_uri=entity_uri)
+        """
+        Tables the user read the most, most read first. The Reader entities of the user are sorted and limited to
+        ATLAS_FREQUENTLY_USED_TABLES_NUM_ENTRIES by Atlas, and the result is cached per user for
+        ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC seconds.
 
-                _results[count] = dict(cluster=details.get('cluster'),
-                                       name=details.get('name'),
-                                       schema=details.get('db'),
-                                       database=details.get('entity'))
+        :param user_email:
+        :return:
+        """
+        ttl_sec = app.config.get(config.ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC, 0)
+        num_entries = app.config.get(config.ATLAS_FREQUENTLY_USED_TABLES_NUM_ENTRIES, 50)
+        if not ttl_sec:
+            return {'table': self._get_frequently_used_tables(user_email, num_entries)}
+
+        cache = self._CACHE.get_cache('frequently_used_tables', type='memory', expire=ttl_sec)
+        tables = cache.get(key='{}:{}'.format(user_email, num_entries),
+                           createfunc=lambda: self._get_frequently_used_tables(user_email, num_entries))
+        return {'table': tables}
 
-        sorted_counts = sorted(_results.keys())
+    def _get_frequently_used_tables(self, user_email: str, num_entries: int) -> List[PopularTable]:
+        # Reader qualifiedName is <db>.<table>.<user>.reader@<cluster>
+        params = {
+            'typeName': self.READER_TYPE,
+            'offset': '0',
+            'limit': num_entries,
+            'excludeDeletedEntities': True,
+            'entityFilters': {
+                'condition': 'AND',
+                'criterion': [
+                    {
+                        'attributeName': self.QN_KEY,
+                        'operator': 'contains',
+                        'attributeValue': '.{}.reader@'.format(user_email)
+                    },
+                    {
+                        'attributeName': 'count',
+                        'operator': 'gt',
+                        'attributeValue': '0'
+                    }
+                ]
+            },
+            'attributes': ['count', self.QN_KEY, self.ENTITY_URI_KEY],
+            'sortBy': 'count',
+            'sortOrder': 'DESCENDING'
+        }
 
         results = []
-        for count in sorted_counts:
-            data: dict = _results.get(count, dict())
-            table = PopularTable(**data)
-
-            results.append(table)
+        for reader in self._driver.search_basic.create(data=params).entities:
+            details = self._extract_info_from_uri(table_uri=reader.attributes.get(self.ENTITY_URI_KEY) or '')
+            if details and reader.attributes.get('count'):
+                results.append(PopularTable(cluster=details.get('cluster'),
+                                            name=details.get('name'),
+                                            schema=details.get('db'),
+                                            database=details.get('entity')))
 
-        return {'table': results}
+        return results
 
     def add_resource_relation_by_user(self, *,
                                       id: str,
@@ -947,12 +1601,13 @@ class AtlasProxy(BaseProxy):
         results = []
 
         if readers:
-            read_entities = extract_entities(self._driver.entity_bulk(guid=readers, ignoreRelationships=False))
+            read_entities = list(self._get_entities_by_guids(readers, ignoreRelationships=False))
+            users_details = self._get_users_details([read_entity.relationshipAttributes['user']['displayText']
+                                                     for read_entity in read_entities])
 
             for read_entity in read_entities:
                 reader_qn = read_entity.relationshipAttributes['user']['displayText']
-                reader_details = self._get_user_details(reader_qn)
-                reader = Reader(user=User(**reader_details), read_count=read_entity.attributes['count'])
+                reader = Reader(user=User(**users_details[reader_qn]), read_count=read_entity.attributes['count'])
 
                 results.append(reader)
 
@@ -1,74 +1,25 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import base64
 from gremlin_python.driver.transport import AbstractBaseTransport
-import mocket.mocket
-import mocket.mockhttp
+import json
+import logging
 from overrides import overrides
 import os
+import queue
+import re
 from requests import PreparedRequest
-from requests_aws4auth import AWS4Auth
 import threading
-from typing import Any, Callable, List, Mapping, Optional, Tuple, TypeVar, Union
-from urllib.parse import urlparse
-from websocket import create_connection
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar, Union
+from websocket import WebSocket, create_connection
+from websocket._url import parse_url
 
 
-__all__ = ["WebsocketClientTransport", "Aws4AuthWebsocketTransport"]
-
-
-def monkey_patch_mocket() -> None:
-    # monkey patch this method since the existing behavior is really broken
-    T = TypeVar('T', bound=mocket.mocket.MocketSocket)
-
-    def monkey_fileno(self: T) -> int:
-        if mocket.mocket.Mocket.r_fd is None and mocket.mocket.Mocket.w_fd is None:
-            mocket.mocket.Mocket.r_fd, mocket.mocket.Mocket.w_fd = os.pipe()
-        return mocket.mocket.Mocket.r_fd
-
-    mocket.mocket.MocketSocket.fileno = monkey_fileno
-
-
-monkey_patch_mocket()
-
-
-class SelfRecordingWebSocketEntry(mocket.mocket.MocketEntry):
-    """
-    This is like  mocket.mockhttp.Entry, but it is less picky about the data and records locally.
-    """
-    request_cls = mocket.mockhttp.Request
-    response_cls = mocket.mockhttp.Response
-
-    def __init__(self, host: str, port: int, responses: Any) -> None:
-        self.host: str = host
-        self.port: int = port
-        self._data: List[bytes] = []
-        self._data_lock = threading.Lock()
-        super(SelfRecordingWebSocketEntry, self).__init__(location=(host, port), responses=responses)
-
-    @overrides
-    def collect(self, data: bytes) -> None:
-        with self._data_lock:
-            self._data.append(data)
-
-    def get_data(self) -> bytes:
-        with self._data_lock:
-            return b''.join(self._data)
-
-    @classmethod
-    def register(cls, *, uri: str, body: str = '', status: int = 101,
-                 headers: Mapping[str, str] = {'Connection': 'Upgrade', 'Upgrade': 'WebSocket'}) \
-            -> 'SelfRecordingWebSocketEntry':
-        host, port = cls.host_and_port(uri)
-        entry = cls(host, port, cls.response_cls(body=body, status=status, headers=headers))
-        mocket.Mocket.register(entry)
-        return entry
-
-    @classmethod
-    def host_and_port(cls, uri: str) -> Tuple[str, int]:
-        parsed = urlparse(uri)
-        return (parsed.hostname, parsed.port or (443 if parsed.scheme.endswith('s') else 80))
+__all__ = ["WebsocketClientTransport", "Aws4AuthWebsocketTransport", "WebsocketMultiplexer",
+           "MultiplexedWebsocketTransport"]
 
+LOGGER = logging.getLogger(__name__)
 
 V = TypeVar('V')
 
@@ -76,11 +27,17 @@ V = TypeVar('V')
 class WebsocketClientTransport(AbstractBaseTransport):
     """
     An AbstractBaseTransport based on the websocket-client library instead of Tornado
+
+    A read and a write can run at the same time (e.g. a reader thread waiting for responses while requests are written,
+    see WebsocketMultiplexer), reads and writes are each serialized.
     """  # noqa
 
     def __init__(self, *, extra_websocket_options: Mapping[str, Any] = {}) -> None:
         self.extra_websocket_options: Mapping[str, str] = extra_websocket_options
+        # guards _connection, _connected, _headers and _url. Never held while sending or receiving
         self._connection_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
         self._connection = None
         self._connected: bool = False
         self._headers: Optional[Mapping[str, Any]] = None
@@ -102,25 +59,22 @@ class WebsocketClientTransport(AbstractBaseTransport):
     @overrides
     def write(self, message: Union[str, bytes]) -> None:
         if isinstance(message, bytes):
-            def write() -> None:
-                self._connection.send_binary(message)
+            def write(connection: WebSocket) -> None:
+                connection.send_binary(message)
         elif isinstance(message, str):
             # send text
-            def write() -> None:
-                self._connection.send(message)
+            def write(connection: WebSocket) -> None:
+                connection.send(message)
         else:
             # what is it?
             raise RuntimeError(f'''got a message that is neither a str nor bytes: {type(message)}''')
-        with self._connection_lock:
-            self._ensure_connect_or_raise()
+        with self._write_lock:
             self._run_except(write)
 
     @overrides
     def read(self) -> Union[str, bytes]:
-        data = None
-        with self._connection_lock:
-            self._ensure_connect_or_raise()
-            data = self._run_except(self._connection.recv)
+        with self._read_lock:
+            data = self._run_except(lambda connection: connection.recv())
         # always return bytes.  the client will decode for us if it's a text message
         # but using recv_data() seems wrong since it skips the readlock
         if isinstance(data, str):
@@ -132,7 +86,7 @@ class WebsocketClientTransport(AbstractBaseTransport):
         with self._connection_lock:
             self._connected = False
             try:
-                if self._connection is not None and not self._connection.closed():
+                if self._connection is not None and self._connection.connected:
                     self._connection.close()
             finally:
                 self._connection = None
@@ -140,7 +94,7 @@ class WebsocketClientTransport(AbstractBaseTransport):
     @overrides
     def closed(self) -> bool:
         with self._connection_lock:
-            return not self._connected and (self._connection is None or self._connection.closed())
+            return not self._connected and (self._connection is None or not self._connection.connected)
 
     def _ensure_connect_or_raise(self) -> None:
         assert self._connection_lock.locked(), f'not locked!'
@@ -149,51 +103,270 @@ class WebsocketClientTransport(AbstractBaseTransport):
             return
         if not self._connected:
             raise RuntimeError(f'connection is closed!')
+        # reads and writes may run concurrently, so let websocket-client lock its sends (e.g. of pongs while reading)
+        websocket_options = dict(enable_multithread=True)
+        websocket_options.update(self.extra_websocket_options)
         try:
-            self._connection = create_connection(url=self._url, header=self._headers, **self.extra_websocket_options)
+            self._connection = create_connection(url=self._url, header=self._headers, **websocket_options)
         except Exception:
             self._connection = None
             raise
 
         assert self._connection is not None, f'connection is closed!'
 
-    def _run_except(self, callable: Callable[[], V]) -> V:
+    def _run_except(self, callable: Callable[[WebSocket], V]) -> V:
         """
+        calls callable with the connection, (re)connecting first if need be
         if exception is raised:
            close the connection
            let the exception bubble up
            set a flag allowing reconnect
         """
-        assert self._connection_lock.locked(), f'not locked!'
+        with self._connection_lock:
+            self._ensure_connect_or_raise()
+            connection = self._connection
         try:
-            return callable()
+            return callable(connection)
         except Exception:
             # what is it? close
+            with self._connection_lock:
+                try:
+                    if connection.connected:
+                        connection.close()
+                except Exception:
+                    # close quietly
+                    pass
+                finally:
+                    # unless a concurrent read or write already reconnected
+                    if self._connection is connection:
+                        self._connection = None
+            # raise the original
+            raise
+
+
+# request id of a request, or of a response, of the Gremlin Server protocol, which goes first in GraphSON messages
+_REQUEST_ID = re.compile(rb'"requestId"\s*:\s*(?:\{[^{}]*?"@value"\s*:\s*)?"([^"]+)"')
+# status code of a response, which comes before its result
+_STATUS_CODE = re.compile(rb'"status"\s*:\s*\{[^{}]*?"code"\s*:\s*(\d+)')
+# status codes of the responses which are followed by others for the same request: partial content, authenticate
+_NON_FINAL_STATUS_CODES = (206, 407)
+
+
+def _request_id(message: bytes) -> str:
+    """
+    :return: id of the request message serialized by the gremlin driver (mime type header followed by GraphSON)
+    """
+    match = _REQUEST_ID.search(message, 0, 512)
+    if match is None:
+        raise RuntimeError(f'no request id in message: {message[:512]!r}')
+    return match.group(1).decode('utf-8')
+
+
+def _response_head(data: bytes) -> Tuple[str, bool]:
+    """
+    :return: the request id of the response and whether it is the last one for that request. Only the head of the
+    response is looked at (the driver parses the whole response later), unless it does not have the expected layout
+    """
+    request_id = _REQUEST_ID.search(data, 0, 512)
+    status_code = _STATUS_CODE.search(data, 0, 4096)
+    if request_id is not None and status_code is not None:
+        return request_id.group(1).decode('utf-8'), int(status_code.group(1)) not in _NON_FINAL_STATUS_CODES
+    response = json.loads(data.decode('utf-8'))
+    request_id_value = response['requestId']
+    if isinstance(request_id_value, Mapping):
+        request_id_value = request_id_value['@value']
+    return request_id_value, response['status']['code'] not in _NON_FINAL_STATUS_CODES
+
+
+class _MultiplexedWebsocket:
+    """
+    One websocket carrying the requests of many MultiplexedWebsocketTransports, up to max_in_flight of them at a time.
+    A reader thread routes each response to the transport which wrote its request.
+    """
+
+    def __init__(self, *, transport_factory: Callable[[], WebsocketClientTransport], max_in_flight: int) -> None:
+        self._transport_factory = transport_factory
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        # guards _url, _headers, _transport and _routes
+        self._lock = threading.Lock()
+        self._url: Optional[str] = None
+        self._headers: Optional[Mapping[str, Any]] = None
+        self._transport: Optional[WebsocketClientTransport] = None
+        # request id -> responses queue of the transport waiting for them
+        self._routes: Dict[str, queue.Queue] = {}
+        # number of MultiplexedWebsocketTransports using this websocket
+        self.users = 0
+
+    def set_url(self, url: str, headers: Optional[Mapping[str, Any]]) -> None:
+        with self._lock:
+            self._url, self._headers = url, headers
+
+    def send(self, message: bytes, responses: queue.Queue) -> None:
+        request_id = _request_id(message)
+        with self._lock:
+            # e.g. the credentials of a request the server asked to authenticate
+            follow_up = request_id in self._routes
+        if not follow_up:
+            self._in_flight.acquire()
+        with self._lock:
             try:
-                if self._connection is not None and not self._connection.closed():
-                    self._connection.close()
+                transport = self._connected_transport()
             except Exception:
-                # close quietly
-                pass
-            finally:
-                self._connection = None
-            # raise the original
+                if not follow_up:
+                    self._in_flight.release()
+                raise
+            self._routes[request_id] = responses
+        try:
+            transport.write(message)
+        except Exception as e:
+            # the error is raised to this request, the other ones in flight get it through their responses
+            with self._lock:
+                routed = self._routes.pop(request_id, None) is not None
+            if routed:
+                self._in_flight.release()
+            self._fail(transport, e)
             raise
 
+    def _connected_transport(self) -> WebsocketClientTransport:
+        assert self._lock.locked(), f'not locked!'
+        if self._transport is None:
+            if self._url is None:
+                raise RuntimeError(f'not connected!')
+            transport = self._transport_factory()
+            transport.connect(self._url, self._headers)
+            self._transport = transport
+            threading.Thread(target=self._read_responses, args=(transport,), name='gremlin-websocket-reader',
+                             daemon=True).start()
+        return self._transport
+
+    def _read_responses(self, transport: WebsocketClientTransport) -> None:
+        while True:
+            try:
+                data = transport.read()
+                request_id, final = _response_head(data)
+            except Exception as e:
+                self._fail(transport, e)
+                return
+            with self._lock:
+                responses = self._routes.pop(request_id, None) if final else self._routes.get(request_id)
+            if responses is None:
+                LOGGER.warning(f'dropping a response to unknown request {request_id}')
+                continue
+            responses.put(data)
+            if final:
+                self._in_flight.release()
+
+    def _fail(self, transport: WebsocketClientTransport, exception: Exception) -> None:
+        """
+        Closes transport and fails every request in flight on it. The next request reconnects.
+        """
+        with self._lock:
+            if self._transport is not transport:
+                return
+            self._transport = None
+            routes, self._routes = self._routes, {}
+        try:
+            transport.close()
+        except Exception:
+            pass
+        for responses in routes.values():
+            responses.put(exception)
+            self._in_flight.release()
+
+    def close(self) -> None:
+        with self._lock:
+            transport = self._transport
+        if transport is not None:
+            self._fail(transport, RuntimeError('connection is closed!'))
 
-class Aws4AuthWebsocketTransport(WebsocketClientTransport):
+
+class WebsocketMultiplexer:
+    """
+    Pipelines the requests of the gremlin driver: the driver sends one request at a time per transport, the transports
+    made by transport() share num_connections websockets (made by transport_factory), which carry up to max_in_flight
+    requests each at a time. Responses are routed back by request id.
+
+    The driver makes pool_size transports and needs a thread of its executor (max_workers) per request in flight, so
+    both should be set to max_requests_in_flight (num_connections * max_in_flight).
+
+    >>> multiplexer = WebsocketMultiplexer(num_connections=2, max_in_flight=16)
+    >>> remote_connection = DriverRemoteConnection(url=url, traversal_source='g', pool_size=32, max_workers=32,
+    ...                                            transport_factory=multiplexer.transport)
     """
 
-    This is super janky/awesome.  We don't have a good hook like netty (java, big on pipelines) or
-    requests (which doesn't do websockets, but positions the authenticator at the end of the
-    processesing and esssentially asks it to just return a new request that's properly
-    authenticated).  What we do is use a mocking library (usually used for testing...) fake the
-    websockets handshake request, and use that to construct the proper headers with AWS4Auth and
-    then add those to a real websockets handshake.
+    def __init__(self, *, num_connections: int = 1, max_in_flight: int = 16,
+                 transport_factory: Callable[[], WebsocketClientTransport] = WebsocketClientTransport) -> None:
+        if num_connections < 1 or max_in_flight < 1:
+            raise ValueError(f'num_connections and max_in_flight must be positive')
+        self._websockets = [_MultiplexedWebsocket(transport_factory=transport_factory, max_in_flight=max_in_flight)
+                            for _ in range(num_connections)]
+        self._lock = threading.Lock()
+        self.max_requests_in_flight = num_connections * max_in_flight
+
+    def transport(self) -> 'MultiplexedWebsocketTransport':
+        return MultiplexedWebsocketTransport(multiplexer=self)
+
+    def _acquire_websocket(self) -> _MultiplexedWebsocket:
+        with self._lock:
+            websocket = min(self._websockets, key=lambda ws: ws.users)
+            websocket.users += 1
+            return websocket
 
+    def _release_websocket(self, websocket: _MultiplexedWebsocket) -> None:
+        with self._lock:
+            websocket.users -= 1
+            if websocket.users == 0:
+                websocket.close()
 
-    Where could this go wrong? Mocket seems a little exciting, so that's a good spot to start if we
-    didn't get a raw request back. (There's an exception for that.)
+
+class MultiplexedWebsocketTransport(AbstractBaseTransport):
+    """
+    A transport of the gremlin driver sending its requests over a websocket shared through a WebsocketMultiplexer
+    """
+
+    def __init__(self, *, multiplexer: WebsocketMultiplexer) -> None:
+        self._multiplexer = multiplexer
+        self._websocket: Optional[_MultiplexedWebsocket] = None
+        self._responses: queue.Queue = queue.Queue()
+        super().__init__()
+
+    @overrides
+    def connect(self, url: str, headers: Optional[Mapping[str, Any]] = None) -> None:
+        if not self.closed():
+            raise RuntimeError(f'already connected!')
+        self._websocket = self._multiplexer._acquire_websocket()
+        self._websocket.set_url(url, headers)
+
+    @overrides
+    def write(self, message: Union[str, bytes]) -> None:
+        if self._websocket is None:
+            raise RuntimeError(f'connection is closed!')
+        self._websocket.send(message.encode('utf-8') if isinstance(message, str) else message, self._responses)
+
+    @overrides
+    def read(self) -> Union[str, bytes]:
+        data = self._responses.get()
+        if isinstance(data, Exception):
+            raise data
+        return data
+
+    @overrides
+    def close(self) -> None:
+        websocket, self._websocket = self._websocket, None
+        if websocket is not None:
+            self._multiplexer._release_websocket(websocket)
+
+    @overrides
+    def closed(self) -> bool:
+        return self._websocket is None
+
+
+class Aws4AuthWebsocketTransport(WebsocketClientTransport):
+    """
+    A WebsocketClientTransport signing its websocket handshakes with AWS4Auth (AWS Signature Version 4), as Neptune
+    IAM authentication requires. AWS4Auth is meant to work with requests, so we build the handshake request
+    websocket-client is going to send as a PreparedRequest, have it signed, and pass the signature headers (and the
+    Sec-WebSocket-* ones, which are signed too) to the real handshake.
 
     >>> from aws4authwebsocket.transport import Aws4AuthWebsocketTransport
     >>> factory = lambda: Aws4AuthWebsocketTransport(aws_access_key_id=secret['aws_access_key_id'], aws_secret_access_key=secret['aws_secret_access_key'], service_region=secret['service_region'])
@@ -205,11 +378,16 @@ class Aws4AuthWebsocketTransport(WebsocketClientTransport):
     def __init__(self, *, aws_access_key_id: str, aws_secret_access_key: str, service_region: str,
                  service_name: str = 'neptune-db', extra_aws4auth_options: Mapping[str, Any] = {},
                  extra_websocket_options: Mapping[str, Any] = {}) -> None:
+        # only Neptune with IAM authentication needs it, not every user of this module
+        from requests_aws4auth import AWS4Auth
+
         # override any of these extra options (because we rely on their behavior)
         extra_aws4auth_options = dict(extra_aws4auth_options)
         extra_aws4auth_options.update(include_hdrs='*', raise_invalid_date=True)
         self.aws4auth = AWS4Auth(
             aws_access_key_id, aws_secret_access_key, service_region, service_name, **extra_aws4auth_options)
+        # AWS4Auth regenerates its signing key when the date changes, so don't let concurrent connects sign meanwhile
+        self._aws4auth_lock = threading.Lock()
         super().__init__(extra_websocket_options=extra_websocket_options)
 
     def _make_extra_headers(self, url: str, headers: Mapping[str, Any]) -> Mapping[str, Any]:
@@ -218,16 +396,16 @@ class Aws4AuthWebsocketTransport(WebsocketClientTransport):
         authentication ones as well as the Sec-WebSocket-* ones (which might vary and mess up the signatures used in
         authentication)
         """
-        raw_request: bytes = self._get_raw_request_for(url=url, header=headers, **self.extra_websocket_options)
-        request: PreparedRequest = self._parse_raw_request(raw_request)
+        request: PreparedRequest = self._get_handshake_request(url, header=headers, **self.extra_websocket_options)
         before_auth = set([k.lower() for k in request.headers.keys()])
         # we're always supposed to exclude these but AWS4Auth will include them with include_hdrs='*', so just delete
-        # from the fake PreparedRequest we pass to AWS4Auth
+        # from the PreparedRequest we pass to AWS4Auth
         for k in set(request.headers.keys()):
             if k.lower() in ('connection', 'x-amzn-trace-id'):
                 del request.headers[k]
         # usually mutates request (contract is to return it though, so cover our bases)
-        request = self.aws4auth(request)
+        with self._aws4auth_lock:
+            request = self.aws4auth(request)
         # keep header if added by websocket client or aws4auth
         extra_headers = dict()
         for k, v in request.headers.items():
@@ -236,62 +414,43 @@ class Aws4AuthWebsocketTransport(WebsocketClientTransport):
         return extra_headers
 
     @classmethod
-    def _get_raw_request_for(cls, url: str, *args: Any, **kwargs: Any) -> bytes:
+    def _get_handshake_request(cls, url: str, *, header: Optional[Union[Mapping[str, Any], List[str]]] = None,
+                               host: Optional[str] = None, origin: Optional[str] = None, suppress_origin: bool = False,
+                               subprotocols: Optional[List[str]] = None, cookie: Optional[str] = None,
+                               **kwargs: Any) -> PreparedRequest:
         """
-        args are passed to websocket.create_connection, and then we get the request data returned.
+        The handshake request websocket.create_connection(url, header=header, ...) sends, built the way
+        websocket-client does (see websocket._handshake._get_handshake_headers), with a new Sec-WebSocket-Key unless
+        header has one. The other websocket options (kwargs) don't change the request.
         """
-        # we fake a response to the handshake, just so we can get the request
-        entry = SelfRecordingWebSocketEntry.register(uri=url)
-        exception: Optional[Exception] = None     # noqa: E701
-        # TODO: should fail if Mocketizer already enabled
-        with mocket.Mocketizer():
-            ws = None
-            try:
-                ws = create_connection(url=url, *args, **kwargs)
-            except Exception as e:
-                exception = e
-            finally:
-                if ws is not None:
-                    try:
-                        ws.close()
-                    except Exception:
-                        pass
-        # return the request we got
-        data = entry.get_data()
-        if data is not None and len(data) > 0:
-            return data
-        elif exception is not None:
-            raise exception
-        else:
-            raise RuntimeError(f'We did not get a raw request back from our attempts to fake a handshake to {url}, nor'
-                               f'did we get an exception')
+        hostname, port, resource, _ = parse_url(url)
+        hostport = f'[{hostname}]' if ':' in hostname else hostname
+        if port not in (80, 443):
+            hostport = f'{hostport}:{port}'
+        if isinstance(header, list):
+            header = dict([(k.strip(), v.strip()) for k, v in [h.split(':', 1) for h in header]])
+        header = header or {}
+
+        headers: Dict[str, str] = {'Upgrade': 'websocket', 'Connection': 'Upgrade'}
+        headers['Host'] = host if host is not None else hostport
+        if not suppress_origin:
+            headers['Origin'] = origin if origin is not None else f'http://{hostport}'
+        if 'Sec-WebSocket-Key' not in header:
+            headers['Sec-WebSocket-Key'] = base64.b64encode(os.urandom(16)).decode('utf-8')
+        if 'Sec-WebSocket-Version' not in header:
+            headers['Sec-WebSocket-Version'] = '13'
+        if subprotocols:
+            headers['Sec-WebSocket-Protocol'] = ','.join(subprotocols)
+        headers.update([(k, v) for k, v in header.items() if v is not None])
+        if cookie:
+            headers['Cookie'] = cookie
 
-    @classmethod
-    def _parse_raw_request(cls, raw_request: bytes) -> PreparedRequest:
-        """
-        ok, this is kind of janky, but AWS4Auth is meant to work with requests, so expects a PreparedRequest
-        """
-        body: Optional[str] = None
-        headers, body = raw_request.decode('utf-8').split('\r\n\r\n', 1)
-        # strip the trailing \r\n if present
-        if len(body) == 0:
-            body = None
-        elif body.endswith('\r\n'):
-            body = body[:-2]
-        # hi!  if you get here looking for folded headers, that's obsolete and we ought not be generating them
-        method_et_al, headers = headers.split('\r\n', 1)
-        headers_as_dict: Mapping[str, str] = \
-            dict([(k.strip(), v.strip()) for k, v in [h.split(':', 1) for h in headers.split('\r\n')]])
-        # this is a little janky, really should be one or more spaces
-        method, path_et_al, version = method_et_al.split(' ', 2)
         # this is very sketchy looking but I promise that we don't care about the host, port, or scheme here
-        url = 'https://nope/' + path_et_al
         req = PreparedRequest()
-        req.prepare_method(method)
-        req.prepare_url(url, {})
-        req.prepare_headers(headers_as_dict)
-        req.prepare_body(data=body, files=None)
-        # don't req.prepare_content_length, we already had that in headers surely
+        req.prepare_method('GET')
+        req.prepare_url('https://nope' + resource, {})
+        req.prepare_headers(headers)
+        req.prepare_body(data=None, files=None)
         return req
 
     @overrides
@@ -0,0 +1,113 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import os
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Optional  # noqa: F401
+
+from flask import Flask, current_app, has_app_context
+
+from metadata_service.proxy import statsd_utilities
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BackgroundRefresher:
+    """
+    Keeps the result of an expensive function fresh by recomputing it on a schedule in a daemon thread
+    (stale-while-revalidate). Readers always get the last computed value right away and never wait for a recomputation,
+    except before the very first one, which is started as soon as the refresher starts (warm up). A process forked after
+    the refresher started (e.g. a gunicorn worker of a preloaded app) gets its own refresher thread on its first read.
+
+    A failed refresh is logged and the previous value keeps being served until the next scheduled refresh.
+    Following metrics are emitted under metric_prefix:
+      - <name>.refresh: duration of a successful refresh
+      - <name>.refresh_fail: failed refreshes
+      - <name>.staleness: seconds since the value being served was computed
+    """
+
+    def __init__(self, *,
+                 name: str,
+                 refresh_fn: Callable[[], Any],
+                 interval_sec: float,
+                 metric_prefix: str = __name__) -> None:
+        self._name = name
+        self._refresh_fn = refresh_fn
+        self._interval_sec = interval_sec
+        self._metric_prefix = metric_prefix
+        self._value = None  # type: Any
+        self._refreshed_at = None  # type: Optional[float]
+        self._first_attempt_done = Event()
+        self._stopped = Event()
+        self._thread = None  # type: Optional[Thread]
+        self._app = None  # type: Optional[Flask]
+        self._pid = None  # type: Optional[int]
+        self._start_lock = Lock()
+
+    def start(self) -> None:
+        """
+        Starts refreshing in the background. The refresh function runs in the application context of the caller.
+        """
+        self._app = current_app._get_current_object() if has_app_context() else None
+        self._start_thread()
+
+    def _start_thread(self) -> None:
+        self._pid = os.getpid()
+        self._thread = Thread(target=self._run, args=(self._app,), name='{}_refresher'.format(self._name), daemon=True)
+        self._thread.start()
+
+    def _restart_if_forked(self) -> None:
+        """
+        Threads do not survive a fork: restarts refreshing in a process forked from the one which started it
+        """
+        if self._pid is None or self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                LOGGER.info('Restarting the {} refresher in forked process {}'.format(self._name, os.getpid()))
+                self._start_thread()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        :param timeout: Max seconds to wait for the warm up to finish
+        :return: The last computed value, None if no refresh succeeded yet
+        """
+        self._restart_if_forked()
+        self._first_attempt_done.wait(timeout)
+        staleness_sec = self.staleness_sec
+        if staleness_sec is not None:
+            statsd_utilities.gauge(prefix=self._metric_prefix, stat='{}.staleness'.format(self._name),
+                                   value=staleness_sec)
+        return self._value
+
+    @property
+    def staleness_sec(self) -> Optional[float]:
+        return time.time() - self._refreshed_at if self._refreshed_at is not None else None
+
+    def refresh(self) -> None:
+        start = time.time()
+        try:
+            # Readers keep getting the previous value until this one is swapped in
+            self._value = self._refresh_fn()
+            self._refreshed_at = time.time()
+            statsd_utilities.timing(prefix=self._metric_prefix, stat='{}.refresh'.format(self._name),
+                                    delta_ms=(self._refreshed_at - start) * 1000)
+        except Exception:
+            LOGGER.exception('Failed to refresh {}, serving the previous value'.format(self._name))
+            statsd_utilities.incr(prefix=self._metric_prefix, stat='{}.refresh_fail'.format(self._name))
+        finally:
+            self._first_attempt_done.set()
+
+    def _run(self, app: Optional[Flask]) -> None:
+        while not self._stopped.is_set():
+            if app is not None:
+                with app.app_context():
+                    self.refresh()
+            else:
+                self.refresh()
+            self._stopped.wait(self._interval_sec)
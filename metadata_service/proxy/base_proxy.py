@@ -1,19 +1,28 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Optional, Set, Union
 
+import attr
 from amundsen_common.models.popular_table import PopularTable
-from amundsen_common.models.table import Table
+from amundsen_common.models.table import Column, Table
 from amundsen_common.models.user import User as UserEntity
 from amundsen_common.models.dashboard import DashboardSummary
 
+from metadata_service.entity.column_field import ColumnField
 from metadata_service.entity.dashboard_detail import DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
+from metadata_service.entity.mutation import Mutation, MutationResult, MutationStatus, MutationType
+from metadata_service.entity.pool_stats import PoolStats
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
+from metadata_service.exception import NotFoundException
 from metadata_service.util import UserResourceRel
 
+LOGGER = logging.getLogger(__name__)
+
 
 class BaseProxy(metaclass=ABCMeta):
     """
@@ -30,9 +39,40 @@ class BaseProxy(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_table(self, *, table_uri: str) -> Table:
+    def get_table(self, *, table_uri: str,
+                  column_offset: int = 0,
+                  column_limit: Optional[int] = None,
+                  column_fields: Optional[Set[ColumnField]] = None) -> Table:
         pass
 
+    @abstractmethod
+    def get_table_columns(self, *, table_uri: str,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Set[ColumnField]] = None) -> List[Column]:
+        pass
+
+    def get_tables(self, *, table_uris: List[str],
+                   detail_level: TableDetailLevel = TableDetailLevel.Summary) -> List[Optional[Table]]:
+        """
+        Fetches many tables at once. This default fetches them one at a time through get_table, proxies able to
+        fetch them together should override it.
+
+        :param table_uris:
+        :param detail_level: Summary leaves columns and readers out
+        :return: The table of each uri, in the order of table_uris, None for the tables which do not exist
+        """
+        tables = []  # type: List[Optional[Table]]
+        for table_uri in table_uris:
+            try:
+                table = self.get_table(table_uri=table_uri)
+            except NotFoundException:
+                tables.append(None)
+                continue
+            tables.append(attr.evolve(table, columns=[], table_readers=[])
+                          if detail_level == TableDetailLevel.Summary else table)
+        return tables
+
     @abstractmethod
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
@@ -91,6 +131,15 @@ class BaseProxy(metaclass=ABCMeta):
     def get_latest_updated_ts(self) -> int:
         pass
 
+    def get_pool_stats(self) -> Optional[PoolStats]:
+        """
+        Reports the state of the connection pool of the backend driver, used to size it against the number of
+        workers and threads of the service. Proxies whose driver does not pool connections keep this default.
+
+        :return: Pool snapshot, None if the proxy has no pool to report on
+        """
+        return None
+
     @abstractmethod
     def get_tags(self) -> List:
         pass
@@ -100,13 +149,15 @@ class BaseProxy(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) \
+    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                       after: Optional[str] = None, limit: Optional[int] = None) \
             -> Dict[str, List[DashboardSummary]]:
         pass
 
     @abstractmethod
     def get_table_by_user_relation(self, *, user_email: str,
-                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+                                   relation_type: UserResourceRel,
+                                   after: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
         pass
 
     @abstractmethod
@@ -151,3 +202,47 @@ class BaseProxy(metaclass=ABCMeta):
                                   id: str,
                                   resource_type: ResourceType) -> Dict[str, List[DashboardSummary]]:
         pass
+
+    def apply_mutations(self, *, mutations: List[Mutation]) -> List[MutationResult]:
+        """
+        Applies the mutations in order, one at a time through the single item methods (add_tag, add_owner, ...).
+        A failing mutation does not stop the others. Proxies able to batch changes should override this.
+
+        :param mutations:
+        :return: The result of each mutation, in the order of mutations
+        """
+        results = []  # type: List[MutationResult]
+        for mutation in mutations:
+            try:
+                self._apply_mutation(mutation)
+                results.append(MutationResult(status=MutationStatus.Success))
+            except NotFoundException as e:
+                results.append(MutationResult(status=MutationStatus.NotFound, message=str(e)))
+            except Exception as e:
+                LOGGER.exception('Failed to apply {}'.format(mutation))
+                results.append(MutationResult(status=MutationStatus.Failed, message=str(e)))
+        return results
+
+    def _apply_mutation(self, mutation: Mutation) -> None:
+        if mutation.type == MutationType.AddTag:
+            self.add_tag(id=mutation.id, tag=mutation.tag, tag_type=mutation.tag_type,
+                         resource_type=mutation.resource_type)
+        elif mutation.type == MutationType.DeleteTag:
+            self.delete_tag(id=mutation.id, tag=mutation.tag, tag_type=mutation.tag_type,
+                            resource_type=mutation.resource_type)
+        elif mutation.type == MutationType.AddBadge:
+            self.add_badge(id=mutation.id, badge_name=mutation.badge_name, category=mutation.category,
+                           resource_type=mutation.resource_type)
+        elif mutation.type == MutationType.DeleteBadge:
+            self.delete_badge(id=mutation.id, badge_name=mutation.badge_name, category=mutation.category,
+                              resource_type=mutation.resource_type)
+        elif mutation.type == MutationType.AddOwner:
+            self.add_owner(table_uri=mutation.id, owner=mutation.owner)
+        elif mutation.type == MutationType.DeleteOwner:
+            self.delete_owner(table_uri=mutation.id, owner=mutation.owner)
+        elif mutation.type == MutationType.PutDescription and mutation.resource_type == ResourceType.Dashboard:
+            self.put_dashboard_description(id=mutation.id, description=mutation.description)
+        elif mutation.type == MutationType.PutDescription:
+            self.put_table_description(table_uri=mutation.id, description=mutation.description)
+        else:
+            raise ValueError('Unsupported mutation {}'.format(mutation.type))
@@ -0,0 +1,100 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple  # noqa: F401
+
+from flask import Flask, current_app, g, has_app_context  # noqa: F401
+
+from metadata_service.proxy import statsd_utilities
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """
+    Fixed size thread pool used by proxies to run independent backend calls concurrently.
+
+    Tasks run inside an application context of their own, for the application of the caller, so config lookups and
+    statsd metrics keep working on worker threads. flask.g is not shared between threads: the attributes of the g of
+    the caller listed in g_attrs are copied to the g of the task when it is submitted. Following metrics are emitted
+    under metric_prefix:
+      - <name>.queue_depth: tasks submitted but not started yet
+      - <name>.active: tasks currently running
+      - <name>.queue_wait: time a task spent waiting for a worker
+    """
+
+    def __init__(self, *,
+                 max_workers: int,
+                 name: str,
+                 metric_prefix: str = __name__,
+                 g_attrs: Tuple[str, ...] = ()) -> None:
+        self.max_workers = max(1, max_workers)
+        self._name = name
+        self._metric_prefix = metric_prefix
+        self._g_attrs = g_attrs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._lock = Lock()
+        self._queue_depth = 0
+        self._active = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue_depth
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        app = current_app._get_current_object() if has_app_context() else None  # type: Optional[Flask]
+        g_values = {attr: g.get(attr) for attr in self._g_attrs if attr in g} if app is not None else dict()
+        self._update_gauges(queued=1, active=0)
+        try:
+            future = self._executor.submit(self._run, app, g_values, time.time(), fn, *args, **kwargs)
+        except Exception:
+            self._update_gauges(queued=-1, active=0)
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, app: Optional[Flask], g_values: Dict[str, Any], submitted_at: float,
+             fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if app is None:
+            return self._call(submitted_at, fn, *args, **kwargs)
+        with app.app_context():
+            for attr, value in g_values.items():
+                setattr(g, attr, value)
+            return self._call(submitted_at, fn, *args, **kwargs)
+
+    def _call(self, submitted_at: float, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        statsd_utilities.timing(prefix=self._metric_prefix,
+                                stat='{}.queue_wait'.format(self._name),
+                                delta_ms=(time.time() - submitted_at) * 1000)
+        self._update_gauges(queued=-1, active=1)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._update_gauges(queued=0, active=-1)
+
+    def _on_done(self, future: Future) -> None:
+        # A task cancelled before it started never reaches _run
+        if future.cancelled():
+            self._update_gauges(queued=-1, active=0)
+
+    def _update_gauges(self, *, queued: int, active: int) -> None:
+        with self._lock:
+            self._queue_depth += queued
+            self._active += active
+            queue_depth, active_count = self._queue_depth, self._active
+
+        statsd_utilities.gauge(prefix=self._metric_prefix, stat='{}.queue_depth'.format(self._name),
+                               value=queue_depth)
+        statsd_utilities.gauge(prefix=self._metric_prefix, stat='{}.active'.format(self._name),
+                               value=active_count)
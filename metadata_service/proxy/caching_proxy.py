@@ -0,0 +1,311 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union  # noqa: F401
+
+from amundsen_common.models.dashboard import DashboardSummary
+from amundsen_common.models.popular_table import PopularTable
+from amundsen_common.models.table import Column, Table
+from amundsen_common.models.user import User as UserEntity
+from flask import current_app, has_app_context
+from werkzeug.utils import import_string
+
+from metadata_service import config
+from metadata_service.entity.column_field import ColumnField
+from metadata_service.entity.dashboard_detail import DashboardDetail as DashboardDetailEntity
+from metadata_service.entity.description import Description
+from metadata_service.entity.mutation import Mutation, MutationResult, MutationType
+from metadata_service.entity.pool_stats import PoolStats
+from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.util import UserResourceRel, normalize_arg
+
+LOGGER = logging.getLogger(__name__)
+
+_TAGS_KEY = 'tags'
+_BADGES_KEY = 'badges'
+
+
+def _table_key(table_uri: str) -> str:
+    return 'table:{}'.format(table_uri)
+
+
+def _dashboard_key(dashboard_uri: str) -> str:
+    return 'dashboard:{}'.format(dashboard_uri)
+
+
+def _resource_key(resource_type: ResourceType, id: str) -> str:
+    return _dashboard_key(id) if resource_type == ResourceType.Dashboard else _table_key(id)
+
+
+class CachingProxy(BaseProxy):
+    """
+    Proxy wrapping any other BaseProxy implementation and caching results of its read methods.
+
+    Each read method listed in CACHING_PROXY_TTL_SEC is cached for its own number of seconds. Mutations made through
+    this proxy invalidate the cached reads of the resource they touch. Caches are in memory, hence per process:
+    changes made through other processes become visible once the TTL expires. At most CACHING_PROXY_MAX_SIZE results
+    are kept, the least recently used ones being dropped first.
+    """
+
+    def __init__(self, *,
+                 proxy: Optional[BaseProxy] = None,
+                 ttls: Optional[Dict[str, int]] = None,
+                 max_size: Optional[int] = None,
+                 **proxy_kwargs: Any) -> None:
+        """
+        :param proxy: Proxy to wrap. If None, CACHED_PROXY_CLIENT is instantiated with proxy_kwargs.
+        :param ttls: Seconds to cache each read method for, CACHING_PROXY_TTL_SEC if None
+        :param max_size: Number of results cached at most, CACHING_PROXY_MAX_SIZE if None
+        :param proxy_kwargs: host, port, user, password, ... of the wrapped proxy
+        """
+        if proxy is None:
+            proxy = import_string(current_app.config[config.CACHED_PROXY_CLIENT])(**proxy_kwargs)
+        if ttls is None:
+            ttls = current_app.config[config.CACHING_PROXY_TTL_SEC] if has_app_context() else {}
+        if max_size is None:
+            max_size = current_app.config[config.CACHING_PROXY_MAX_SIZE] if has_app_context() else 10000
+
+        self._proxy = proxy  # type: BaseProxy
+        self._ttls = ttls
+        self._max_size = max_size
+        # guards _entries and the generations
+        self._lock = Lock()
+        # (method, resource key, generation, arguments) -> (expiry time, result), least recently used first
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, Tuple[float, Any]]
+        # Invalidating a resource gives it a new generation, which is part of the cache key of every read of that
+        # resource. This drops all variants of a read (e.g. every column page of a table) at once, including the ones
+        # still being read, which get stored under the former generation and are never read (evicted as LRU).
+        self._generations = {}  # type: Dict[str, int]
+        # generation of the resources not in _generations
+        self._base_generation = 0
+        self._next_generation = 1
+
+    @property
+    def proxy(self) -> BaseProxy:
+        return self._proxy
+
+    def _cached(self, method: str, resource_key: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls method of the wrapped proxy through the cache, when a TTL is configured for it.
+        :param method: Name of the read method
+        :param resource_key: Identifies the resource the result belongs to, used for invalidation
+        :param args: Positional arguments of the read method
+        :param kwargs: Keyword arguments of the read method
+        """
+        fn = getattr(self._proxy, method)
+        ttl = self._ttls.get(method)
+        if not ttl or self._max_size <= 0:
+            return fn(*args, **kwargs)
+
+        with self._lock:
+            key = (method, resource_key, self._generations.get(resource_key, self._base_generation),
+                   str([normalize_arg(arg) for arg in args]),
+                   str(sorted((name, normalize_arg(value)) for name, value in kwargs.items())))
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        statsd_utilities.incr(prefix=__name__, stat='{}.{}'.format(method, 'hit' if entry else 'miss'))
+        if entry is not None:
+            return entry[1]
+
+        result = fn(*args, **kwargs)
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return result
+
+    def _invalidate(self, *resource_keys: str) -> None:
+        with self._lock:
+            for resource_key in resource_keys:
+                self._generations[resource_key] = self._next_generation
+                self._next_generation += 1
+            if len(self._generations) > self._max_size:
+                # generations would otherwise pile up for every resource ever changed: start all resources over from
+                # a generation newer than any cached read, i.e. drop them all
+                self._base_generation = self._next_generation
+                self._next_generation += 1
+                self._generations.clear()
+                self._entries.clear()
+
+    def get_user(self, *, id: str) -> Union[UserEntity, None]:
+        return self._cached('get_user', 'user:{}'.format(id), id=id)
+
+    def get_users(self) -> List[UserEntity]:
+        return self._proxy.get_users()
+
+    def get_table(self, *, table_uri: str,
+                  column_offset: int = 0,
+                  column_limit: Optional[int] = None,
+                  column_fields: Optional[Set[ColumnField]] = None) -> Table:
+        return self._cached('get_table', _table_key(table_uri), table_uri=table_uri, column_offset=column_offset,
+                            column_limit=column_limit, column_fields=column_fields)
+
+    def get_table_columns(self, *, table_uri: str,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Set[ColumnField]] = None) -> List[Column]:
+        return self._cached('get_table_columns', _table_key(table_uri),
+                            table_uri=table_uri, offset=offset, limit=limit, fields=fields)
+
+    def get_tables(self, *, table_uris: List[str],
+                   detail_level: TableDetailLevel = TableDetailLevel.Summary) -> List[Optional[Table]]:
+        return self._proxy.get_tables(table_uris=table_uris, detail_level=detail_level)
+
+    def delete_owner(self, *, table_uri: str, owner: str) -> None:
+        try:
+            self._proxy.delete_owner(table_uri=table_uri, owner=owner)
+        finally:
+            self._invalidate(_table_key(table_uri))
+
+    def add_owner(self, *, table_uri: str, owner: str) -> None:
+        try:
+            self._proxy.add_owner(table_uri=table_uri, owner=owner)
+        finally:
+            self._invalidate(_table_key(table_uri))
+
+    def get_table_description(self, *,
+                              table_uri: str) -> Union[str, None]:
+        return self._cached('get_table_description', _table_key(table_uri), table_uri=table_uri)
+
+    def put_table_description(self, *,
+                              table_uri: str,
+                              description: str) -> None:
+        try:
+            self._proxy.put_table_description(table_uri=table_uri, description=description)
+        finally:
+            self._invalidate(_table_key(table_uri))
+
+    def add_tag(self, *, id: str, tag: str, tag_type: str, resource_type: ResourceType) -> None:
+        try:
+            self._proxy.add_tag(id=id, tag=tag, tag_type=tag_type, resource_type=resource_type)
+        finally:
+            self._invalidate(_resource_key(resource_type, id), _TAGS_KEY)
+
+    def add_badge(self, *, id: str, badge_name: str, category: str = '',
+                  resource_type: ResourceType) -> None:
+        try:
+            self._proxy.add_badge(id=id, badge_name=badge_name, category=category, resource_type=resource_type)
+        finally:
+            self._invalidate(_resource_key(resource_type, id), _BADGES_KEY)
+
+    def delete_tag(self, *, id: str, tag: str, tag_type: str, resource_type: ResourceType) -> None:
+        try:
+            self._proxy.delete_tag(id=id, tag=tag, tag_type=tag_type, resource_type=resource_type)
+        finally:
+            self._invalidate(_resource_key(resource_type, id), _TAGS_KEY)
+
+    def delete_badge(self, *, id: str, badge_name: str, category: str,
+                     resource_type: ResourceType) -> None:
+        try:
+            self._proxy.delete_badge(id=id, badge_name=badge_name, category=category, resource_type=resource_type)
+        finally:
+            self._invalidate(_resource_key(resource_type, id), _BADGES_KEY)
+
+    def put_column_description(self, *,
+                               table_uri: str,
+                               column_name: str,
+                               description: str) -> None:
+        try:
+            self._proxy.put_column_description(table_uri=table_uri, column_name=column_name,
+                                               description=description)
+        finally:
+            self._invalidate(_table_key(table_uri))
+
+    def get_column_description(self, *,
+                               table_uri: str,
+                               column_name: str) -> Union[str, None]:
+        return self._cached('get_column_description', _table_key(table_uri),
+                            table_uri=table_uri, column_name=column_name)
+
+    def get_popular_tables(self, *, num_entries: int) -> List[PopularTable]:
+        return self._cached('get_popular_tables', 'popular_tables', num_entries=num_entries)
+
+    def get_latest_updated_ts(self) -> int:
+        return self._proxy.get_latest_updated_ts()
+
+    def get_pool_stats(self) -> Optional[PoolStats]:
+        return self._proxy.get_pool_stats()
+
+    def get_tags(self) -> List:
+        return self._cached('get_tags', _TAGS_KEY)
+
+    def get_badges(self) -> List:
+        return self._cached('get_badges', _BADGES_KEY)
+
+    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                       after: Optional[str] = None, limit: Optional[int] = None) \
+            -> Dict[str, List[DashboardSummary]]:
+        return self._proxy.get_dashboard_by_user_relation(user_email=user_email, relation_type=relation_type,
+                                                          after=after, limit=limit)
+
+    def get_table_by_user_relation(self, *, user_email: str,
+                                   relation_type: UserResourceRel,
+                                   after: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        return self._proxy.get_table_by_user_relation(user_email=user_email, relation_type=relation_type,
+                                                      after=after, limit=limit)
+
+    def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
+        return self._proxy.get_frequently_used_tables(user_email=user_email)
+
+    def add_resource_relation_by_user(self, *,
+                                      id: str,
+                                      user_id: str,
+                                      relation_type: UserResourceRel,
+                                      resource_type: ResourceType) -> None:
+        self._proxy.add_resource_relation_by_user(id=id, user_id=user_id, relation_type=relation_type,
+                                                  resource_type=resource_type)
+
+    def delete_resource_relation_by_user(self, *,
+                                         id: str,
+                                         user_id: str,
+                                         relation_type: UserResourceRel,
+                                         resource_type: ResourceType) -> None:
+        self._proxy.delete_resource_relation_by_user(id=id, user_id=user_id, relation_type=relation_type,
+                                                     resource_type=resource_type)
+
+    def apply_mutations(self, *, mutations: List[Mutation]) -> List[MutationResult]:
+        try:
+            return self._proxy.apply_mutations(mutations=mutations)
+        finally:
+            keys = {_resource_key(mutation.resource_type, mutation.id) for mutation in mutations}
+            types = {mutation.type for mutation in mutations}
+            if types & {MutationType.AddTag, MutationType.DeleteTag}:
+                keys.add(_TAGS_KEY)
+            if types & {MutationType.AddBadge, MutationType.DeleteBadge}:
+                keys.add(_BADGES_KEY)
+            self._invalidate(*keys)
+
+    def get_dashboard(self,
+                      dashboard_uri: str,
+                      ) -> DashboardDetailEntity:
+        return self._cached('get_dashboard', _dashboard_key(dashboard_uri), dashboard_uri)
+
+    def get_dashboard_description(self, *,
+                                  id: str) -> Description:
+        return self._cached('get_dashboard_description', _dashboard_key(id), id=id)
+
+    def put_dashboard_description(self, *,
+                                  id: str,
+                                  description: str) -> None:
+        try:
+            self._proxy.put_dashboard_description(id=id, description=description)
+        finally:
+            self._invalidate(_dashboard_key(id))
+
+    def get_resources_using_table(self, *,
+                                  id: str,
+                                  resource_type: ResourceType) -> Dict[str, List[DashboardSummary]]:
+        return self._proxy.get_resources_using_table(id=id, resource_type=resource_type)
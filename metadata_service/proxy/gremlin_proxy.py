@@ -1,24 +1,39 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
+import inspect
 import json
 import logging
-from typing import Any, Dict, List, Mapping, Optional, Union
+import random
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Union
 
 import gremlin_python
 from amundsen_common.models.popular_table import PopularTable
-from amundsen_common.models.table import Table
+from amundsen_common.models.table import (Application, Badge, Column, ProgrammaticDescription, Reader, Source,
+                                          Statistics, Table, Tag, User, Watermark)
 from amundsen_common.models.user import User as UserEntity
 from amundsen_common.models.dashboard import DashboardSummary
+from flask import current_app, has_app_context
 from gremlin_python.driver.driver_remote_connection import \
     DriverRemoteConnection
 from gremlin_python.process.anonymous_traversal import traversal
-from gremlin_python.process.graph_traversal import GraphTraversalSource
+from gremlin_python.process.graph_traversal import GraphTraversal, GraphTraversalSource, __
+from gremlin_python.process.traversal import Order, P
 
+from metadata_service import config
+from metadata_service.entity.column_field import ColumnField
 from metadata_service.entity.dashboard_detail import DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.description import Description
+from metadata_service.entity.pool_stats import PoolStats
 from metadata_service.entity.resource_type import ResourceType
-from metadata_service.proxy import BaseProxy
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy import BaseProxy, statsd_utilities
+from metadata_service.proxy.pool_telemetry import PoolTelemetry
+from metadata_service.proxy.statsd_utilities import timer_with_counter
 from metadata_service.util import UserResourceRel
 
 __all__ = ['AbstractGremlinProxy', 'GenericGremlinProxy']
@@ -33,11 +48,125 @@ def _parse_gremlin_server_error(exception: Exception) -> Dict[str, Any]:
     return json.loads(exception.args[0][exception.args[0].index(': ') + 1:])
 
 
+def _properties(value_map: Optional[Mapping[Any, Any]]) -> Dict[str, Any]:
+    """
+    valueMap() lists the values of each property, this unwraps the ones holding a single value
+    """
+    return {key: value[0] if isinstance(value, list) and len(value) == 1 else value
+            for key, value in (value_map or {}).items()}
+
+
+def _first(values: List[Any]) -> Any:
+    """
+    :return: the single value of a folded relation, None if there is none
+    """
+    return values[0] if values else None
+
+
+def _table_path() -> Dict[str, GraphTraversal]:
+    """
+    by() modulators of the names of the database, cluster and schema of a table, and of the table itself
+    """
+    return {
+        'database': __.in_('TABLE').in_('SCHEMA').in_('CLUSTER').values('name').fold(),
+        'cluster': __.in_('TABLE').in_('SCHEMA').values('name').fold(),
+        'schema': __.in_('TABLE').values('name').fold(),
+        'name': __.values('name').fold(),
+    }
+
+
+def _project(graph_traversal: GraphTraversal, projections: Mapping[str, GraphTraversal]) -> GraphTraversal:
+    """
+    project() of graph_traversal with one by() per projection. Each projection must always produce a value (fold() the
+    ones which may not), project() fails on a by() producing nothing.
+    """
+    graph_traversal = graph_traversal.project(*projections.keys())
+    for projection in projections.values():
+        graph_traversal = graph_traversal.by(projection)
+    return graph_traversal
+
+
+# methods of the gremlin proxies which do not call the server, thus are not retried
+_NOT_RETRIED = {'get_pool_stats'}
+
+# whether a call of a gremlin proxy method is already in progress, and retried, on the current thread
+_retry_state = threading.local()
+
+
+def _retry_settings() -> Tuple[float, float, float]:
+    """
+    :return: GREMLIN_RETRY_DEADLINE_SEC, GREMLIN_RETRY_BASE_DELAY_SEC and GREMLIN_RETRY_MAX_DELAY_SEC
+    """
+    if not has_app_context():
+        return 30.0, 0.1, 5.0
+    return (current_app.config.get(config.GREMLIN_RETRY_DEADLINE_SEC, 30.0),
+            current_app.config.get(config.GREMLIN_RETRY_BASE_DELAY_SEC, 0.1),
+            current_app.config.get(config.GREMLIN_RETRY_MAX_DELAY_SEC, 5.0))
+
+
+def _retrying(method_name: str, method: Callable) -> Callable:
+    """
+    Wraps method of a gremlin proxy so that a call failing with an exception which _is_retryable_exception deems
+    retryable for method_name is retried, with exponential backoff and full jitter, as long as the next attempt would
+    start before GREMLIN_RETRY_DEADLINE_SEC since the call. Calls made during the call on the same thread (e.g. of
+    _submit) are not retried on their own, the outermost call is retried as a whole.
+
+    Following metrics are emitted under the module of the proxy class:
+      - <method_name>.retry: attempts after the first one
+      - <method_name>.retry_exhausted: calls failing with a retryable exception once out of time
+    """
+    @wraps(method)
+    def wrapper(self: 'AbstractGremlinProxy', *args: Any, **kwargs: Any) -> Any:
+        if getattr(_retry_state, 'in_call', False):
+            return method(self, *args, **kwargs)
+
+        deadline_sec, base_delay_sec, max_delay_sec = _retry_settings()
+        deadline = time.time() + deadline_sec
+        metric_prefix = self.__class__.__module__
+        _retry_state.in_call = True
+        try:
+            retry = 0
+            while True:
+                try:
+                    return method(self, *args, **kwargs)
+                except Exception as e:
+                    if not self._is_retryable_exception(method_name=method_name, exception=e):
+                        raise
+                    delay = random.uniform(0, min(max_delay_sec, base_delay_sec * 2 ** retry))
+                    if time.time() + delay > deadline:
+                        statsd_utilities.incr(prefix=metric_prefix, stat='{}.retry_exhausted'.format(method_name))
+                        raise
+                    LOGGER.info('Retrying {} in {:.3f}s after: {}'.format(method_name, delay, e))
+                    time.sleep(delay)
+                    retry += 1
+                    statsd_utilities.incr(prefix=metric_prefix, stat='{}.retry'.format(method_name))
+        finally:
+            _retry_state.in_call = False
+
+    return wrapper
+
+
+def _with_retries(cls: type) -> None:
+    """
+    Wraps the public methods, and _submit, defined by cls with _retrying
+    """
+    for name, member in list(vars(cls).items()):
+        if inspect.isfunction(member) and name not in _NOT_RETRIED and (name == '_submit' or not name.startswith('_')):
+            setattr(cls, name, _retrying(name, member))
+
+
 class AbstractGremlinProxy(BaseProxy):
     """
     Gremlin Proxy client for the amundsen metadata
+
+    Its public methods and _submit, including the ones of subclasses, retry the exceptions _is_retryable_exception
+    deems retryable for them (see _retrying).
     """
 
+    def __init_subclass__(cls) -> None:
+        super().__init_subclass__()
+        _with_retries(cls)
+
     def __init__(self, *, key_property_name: str, remote_connection: DriverRemoteConnection) -> None:
         # these might vary from datastore type to another, but if you change these while talking to the same instance
         # without migration, it will go poorly
@@ -48,6 +177,13 @@ class AbstractGremlinProxy(BaseProxy):
 
         self._g: GraphTraversalSource = traversal().withRemote(self.remote_connection)
 
+        # the client opens its pool_size connections upfront and keeps them, taking one out of its queue per request
+        self._pool_telemetry = PoolTelemetry(metric_prefix=self.__class__.__module__)
+        pool = self._client_pool()
+        if pool is not None:
+            self._pool_telemetry.record_churn(opened=pool.qsize())
+            pool.get = self._pool_telemetry.timed(pool.get)
+
     @property
     def g(self) -> GraphTraversalSource:
         """
@@ -56,10 +192,30 @@ class AbstractGremlinProxy(BaseProxy):
         """
         return self._g
 
+    def _client_pool(self) -> Any:
+        """
+        :return: Queue of the idle connections of the gremlin client, None if the remote connection has none
+        """
+        client = getattr(self.remote_connection, '_client', None)
+        return getattr(client, '_pool', None)
+
+    def get_pool_stats(self) -> Optional[PoolStats]:
+        """
+        Reports the connections of the gremlin client. Their number is set through the pool_size of the
+        driver_remote_connection_options, which also bounds the requests sent at once.
+        """
+        pool = self._client_pool()
+        if pool is None:
+            return None
+        idle = pool.qsize()
+        pool_size = getattr(self.remote_connection._client, '_pool_size', idle)
+        return self._pool_telemetry.stats(in_use=max(0, pool_size - idle), idle=idle)
+
     @classmethod
     def _is_retryable_exception(cls, *, method_name: str, exception: Exception) -> bool:
         """
-        overridde this if you want to retry the exception for the given method_name
+        overridde this if you want to retry the exception for the given method_name. The whole method is run again, so
+        only deem retryable the exceptions after which it is safe to do so (e.g. a write which was rolled back).
         """
         return False
 
@@ -99,8 +255,144 @@ class AbstractGremlinProxy(BaseProxy):
     def get_users(self) -> List[UserEntity]:
         pass
 
-    def get_table(self, *, table_uri: str) -> Table:
-        pass
+    def _table(self, table_uri: str) -> GraphTraversal:
+        return self.g.V().has('Table', self.key_property_name, table_uri)
+
+    @timer_with_counter
+    def get_table(self, *, table_uri: str,
+                  column_offset: int = 0,
+                  column_limit: Optional[int] = None,
+                  column_fields: Optional[Set[ColumnField]] = None) -> Table:
+        """
+        Fetches the table with a single traversal: every relation shown on the table page (columns with their
+        descriptions, stats and badges, owners, tags, readers...) is a by() of one project() of the table vertex.
+
+        :param table_uri: Table URI
+        :param column_offset: Number of columns (in sort order) to skip
+        :param column_limit: Max number of columns to return, all of them if None
+        :param column_fields: Optional column fields to load, all of them if None
+        :return:  A Table object
+        """
+        readers = (__.inE('READ').order().by('read_count', Order.desc).limit(5)
+                   .project('user', 'read_count').by(__.outV().valueMap()).by(__.values('read_count')))
+        projections = dict(_table_path(), **{
+            'tbl': __.valueMap(),
+            'tbl_dscrpt': __.out('DESCRIPTION').hasLabel('Description').values('description').fold(),
+            'col_records': self._column_records(column_offset, column_limit, column_fields),
+            'readers': readers.fold(),
+            'wmk_records': __.in_('BELONG_TO_TABLE').hasLabel('Watermark').valueMap().fold(),
+            'application': __.in_('GENERATES').hasLabel('Application').valueMap().fold(),
+            'last_updated_timestamp': __.out('LAST_UPDATED_AT').hasLabel('Timestamp')
+                                        .values('last_updated_timestamp').fold(),
+            'owner_records': __.out('OWNER').hasLabel('User').valueMap().fold(),
+            'tag_records': __.out('TAGGED_BY').has('Tag', 'tag_type', 'default').valueMap().fold(),
+            'badge_records': __.out('HAS_BADGE').hasLabel('Badge').valueMap().fold(),
+            'src': __.out('SOURCE').hasLabel('Source').valueMap().fold(),
+            'prog_descriptions': __.out('DESCRIPTION').hasLabel('Programmatic_Description').valueMap().fold(),
+        })
+        table_record = _first(_project(self._table(table_uri), projections).toList())
+        if table_record is None:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        return self._build_table(table_record)
+
+    @timer_with_counter
+    def get_table_columns(self, *, table_uri: str,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Set[ColumnField]] = None) -> List[Column]:
+        table_record = _first(_project(self._table(table_uri),
+                                       {'col_records': self._column_records(offset, limit, fields)}).toList())
+        if table_record is None:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        return self._build_columns(table_record['col_records'])
+
+    @staticmethod
+    def _column_records(offset: int, limit: Optional[int], fields: Optional[Set[ColumnField]]) -> GraphTraversal:
+        """
+        by() modulator of the columns of a table, paged in sort order before anything else is loaded for a column.
+        Stats and badges which are not selected are projected as empty lists.
+        """
+        def is_selected(field: ColumnField) -> bool:
+            return fields is None or field in fields
+
+        columns = __.out('COLUMN').hasLabel('Column').order().by('sort_order', Order.asc)
+        if offset or limit is not None:
+            columns = columns.range_(offset, offset + limit if limit is not None else -1)
+
+        return _project(columns, {
+            'col': __.valueMap(),
+            'col_dscrpt': __.out('DESCRIPTION').hasLabel('Description').values('description').fold(),
+            'col_stats': __.out('STAT').hasLabel('Stat').valueMap().fold() if is_selected(ColumnField.Stats)
+            else __.limit(0).fold(),
+            'col_badges': __.out('HAS_BADGE').hasLabel('Badge').valueMap().fold() if is_selected(ColumnField.Badges)
+            else __.limit(0).fold(),
+        }).fold()
+
+    def _build_columns(self, col_records: List[Mapping[str, Any]]) -> List[Column]:
+        cols = []
+        for col_record in col_records:
+            col = _properties(col_record['col'])
+            stats = [_properties(stat) for stat in col_record['col_stats']]
+            badges = [_properties(badge) for badge in col_record['col_badges']]
+            cols.append(Column(name=col['name'],
+                               description=_first(col_record['col_dscrpt']),
+                               col_type=col.get('type'),
+                               sort_order=int(col['sort_order']),
+                               stats=[Statistics(stat_type=stat['stat_name'],
+                                                 stat_val=stat['stat_val'],
+                                                 start_epoch=int(float(stat['start_epoch'])),
+                                                 end_epoch=int(float(stat['end_epoch']))) for stat in stats],
+                               badges=[Badge(badge_name=badge[self.key_property_name], category=badge['category'])
+                                       for badge in badges]))
+        return sorted(cols, key=lambda item: item.sort_order)
+
+    def _build_table(self, table_record: Mapping[str, Any]) -> Table:
+        tbl = _properties(table_record['tbl'])
+
+        watermarks = []
+        for wmk in map(_properties, table_record['wmk_records']):
+            if wmk.get(self.key_property_name) is not None:
+                watermarks.append(Watermark(watermark_type=wmk[self.key_property_name].split('/')[-2],
+                                            partition_key=wmk.get('partition_key'),
+                                            partition_value=wmk.get('partition_value'),
+                                            create_time=wmk.get('create_time')))
+
+        application = _properties(_first(table_record['application']))
+        src = _properties(_first(table_record['src']))
+
+        prog_descriptions = []
+        for prog_description in map(_properties, table_record['prog_descriptions']):
+            if prog_description.get('description_source') is None:
+                LOGGER.error("A programmatic description with no source was found... skipping.")
+            else:
+                prog_descriptions.append(ProgrammaticDescription(source=prog_description['description_source'],
+                                                                 text=prog_description.get('description')))
+
+        return Table(database=_first(table_record['database']),
+                     cluster=_first(table_record['cluster']),
+                     schema=_first(table_record['schema']),
+                     name=tbl['name'],
+                     tags=[Tag(tag_name=tag[self.key_property_name], tag_type=tag['tag_type'])
+                           for tag in map(_properties, table_record['tag_records'])],
+                     badges=[Badge(badge_name=badge[self.key_property_name], category=badge['category'])
+                             for badge in map(_properties, table_record['badge_records'])],
+                     description=_first(table_record['tbl_dscrpt']),
+                     columns=self._build_columns(table_record['col_records']),
+                     owners=[User(email=owner.get('email'))
+                             for owner in map(_properties, table_record['owner_records'])],
+                     table_readers=[Reader(user=User(email=_properties(reader['user']).get('email')),
+                                           read_count=reader['read_count']) for reader in table_record['readers']],
+                     watermarks=watermarks,
+                     table_writer=Application(application_url=application.get('application_url'),
+                                              description=application.get('description'),
+                                              name=application.get('name'),
+                                              id=application.get('id', '')) if application else None,
+                     last_updated_timestamp=_first(table_record['last_updated_timestamp']),
+                     source=Source(source_type=src.get('source_type'), source=src.get('source')) if src else None,
+                     is_view=tbl.get('is_view'),
+                     programmatic_descriptions=sorted(prog_descriptions, key=lambda x: x.source))
 
     def delete_owner(self, *, table_uri: str, owner: str) -> None:
         pass
@@ -108,9 +400,11 @@ class AbstractGremlinProxy(BaseProxy):
     def add_owner(self, *, table_uri: str, owner: str) -> None:
         pass
 
+    @timer_with_counter
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
-        pass
+        return _first(self._table(table_uri).out('DESCRIPTION').hasLabel('Description').values('description')
+                      .limit(1).toList())
 
     def put_table_description(self, *,
                               table_uri: str,
@@ -139,29 +433,62 @@ class AbstractGremlinProxy(BaseProxy):
                                description: str) -> None:
         pass
 
+    @timer_with_counter
     def get_column_description(self, *,
                                table_uri: str,
                                column_name: str) -> Union[str, None]:
-        pass
+        return _first(self._table(table_uri).out('COLUMN').has('Column', 'name', column_name)
+                      .out('DESCRIPTION').hasLabel('Description').values('description').limit(1).toList())
 
+    @timer_with_counter
     def get_popular_tables(self, *, num_entries: int) -> List[PopularTable]:
-        pass
+        """
+        Popularity score = number of distinct readers * log(total number of reads), as with Neo4j. Tables are scored,
+        ranked and projected on the server.
+        """
+        num_readers = current_app.config['POPULAR_TABLE_MINIMUM_READER_COUNT']
+        ranking = (self.g.V().hasLabel('Table')
+                   .project('tbl', 'readers', 'total_reads')
+                   .by(__.identity())
+                   .by(__.out('READ_BY').hasLabel('User').dedup().count())
+                   .by(__.coalesce(__.outE('READ_BY').values('read_count').sum(), __.constant(0)))
+                   .where(__.select('readers').is_(P.gte(num_readers)))
+                   .order().by(__.math('readers * log(total_reads)'), Order.desc)
+                   .limit(num_entries)
+                   .select('tbl'))
+        projections = dict(_table_path(),
+                           description=__.out('DESCRIPTION').hasLabel('Description').values('description').fold())
+
+        return [PopularTable(database=_first(record['database']),
+                             cluster=_first(record['cluster']),
+                             schema=_first(record['schema']),
+                             name=_first(record['name']),
+                             description=_first(record['description']))
+                for record in _project(ranking, projections).toList()]
 
     def get_latest_updated_ts(self) -> int:
         pass
 
+    @timer_with_counter
     def get_tags(self) -> List:
-        pass
+        tag_records = (self.g.V().has('Tag', 'tag_type', 'default')
+                       .project('tag_name', 'tag_count')
+                       .by(self.key_property_name)
+                       .by(__.in_('TAGGED_BY').dedup().count())
+                       .toList())
+        return [TagDetail(tag_name=record['tag_name'], tag_count=record['tag_count']) for record in tag_records]
 
     def get_badges(self) -> List:
         pass
 
-    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) \
+    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                       after: Optional[str] = None, limit: Optional[int] = None) \
             -> Dict[str, List[DashboardSummary]]:
         pass
 
     def get_table_by_user_relation(self, *, user_email: str,
-                                   relation_type: UserResourceRel) -> Dict[str, Any]:
+                                   relation_type: UserResourceRel,
+                                   after: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
         pass
 
     def get_frequently_used_tables(self, *, user_email: str) -> Dict[str, Any]:
@@ -201,6 +528,9 @@ class AbstractGremlinProxy(BaseProxy):
         return {}
 
 
+_with_retries(AbstractGremlinProxy)
+
+
 class GenericGremlinProxy(AbstractGremlinProxy):
     """
     A generic Gremlin proxy
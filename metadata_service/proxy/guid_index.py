@@ -0,0 +1,64 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Optional, Tuple  # noqa: F401
+
+from metadata_service.proxy import statsd_utilities
+
+
+class GuidIndex:
+    """
+    LRU index of the guids of backend entities (e.g. by type and qualifiedName), with a time to live. Entries are
+    added as a side effect of reads and are dropped when a write using them fails, as the entity may have been deleted
+    or recreated under another guid since.
+    """
+
+    def __init__(self, *,
+                 ttl_sec: float,
+                 max_size: int,
+                 metric_prefix: str = __name__) -> None:
+        self._ttl_sec = ttl_sec
+        self._max_size = max_size
+        self._metric_prefix = metric_prefix
+        self._lock = Lock()
+        # key -> (expiry time, guid), least recently used first
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, Tuple[float, str]]
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        :return: guid of the entity, None if it is not indexed (or not anymore)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        statsd_utilities.incr(prefix=self._metric_prefix, stat='guid_index.hit' if entry else 'guid_index.miss')
+        return entry[1] if entry else None
+
+    def put(self, key: Hashable, guid: Optional[str]) -> None:
+        if not guid or self._ttl_sec <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + self._ttl_sec, guid)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,22 +1,26 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from metadata_service.proxy.aws4authwebsocket.transport import WebsocketClientTransport
+from metadata_service.proxy.aws4authwebsocket.transport import WebsocketClientTransport, WebsocketMultiplexer
 from .gremlin_proxy import AbstractGremlinProxy
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
-from typing import Any, Mapping, Optional
+from gremlin_python.driver.transport import AbstractBaseTransport
+from typing import Any, Callable, Mapping, Optional
 
 
 class JanusGraphGremlinProxy(AbstractGremlinProxy):
     """
     A proxy to a JanusGraph using the Gremlin protocol.
 
+    :param multiplexing_options: when set, requests are pipelined over shared websockets, see WebsocketMultiplexer
+    for the options (num_connections, max_in_flight)
     """
 
     def __init__(self, *, host: str, port: Optional[int] = None, user: Optional[str] = None,
                  password: Optional[str] = None, traversal_source: 'str' = 'g',
                  driver_remote_connection_options: Mapping[str, Any] = {},
-                 websocket_options: Mapping[str, Any] = {}) -> None:
+                 websocket_options: Mapping[str, Any] = {},
+                 multiplexing_options: Optional[Mapping[str, Any]] = None) -> None:
         driver_remote_connection_options = dict(driver_remote_connection_options)
 
         # as others, we repurpose host a url
@@ -35,7 +39,14 @@ class JanusGraphGremlinProxy(AbstractGremlinProxy):
         # we could use the default Transport, but then we'd have to take different options, which feels clumsier.
         def factory() -> WebsocketClientTransport:
             return WebsocketClientTransport(extra_websocket_options=websocket_options or {})
-        driver_remote_connection_options.update(transport_factory=factory)
+        transport_factory: Callable[[], AbstractBaseTransport] = factory
+
+        if multiplexing_options is not None:
+            multiplexer = WebsocketMultiplexer(transport_factory=factory, **multiplexing_options)
+            transport_factory = multiplexer.transport
+            driver_remote_connection_options.setdefault('pool_size', multiplexer.max_requests_in_flight)
+            driver_remote_connection_options.setdefault('max_workers', multiplexer.max_requests_in_flight)
+        driver_remote_connection_options.update(transport_factory=transport_factory)
 
         # use _key
         super().__init__(key_property_name='_key',
@@ -5,8 +5,8 @@ import logging
 import textwrap
 import time
 from random import randint
-from typing import (Any, Dict, List, Optional, Tuple, Union,  # noqa: F401
-                    no_type_check)
+from typing import (Any, Callable, Dict, List, Optional, Set, Tuple,  # noqa: F401
+                    Union, no_type_check)
 
 import neo4j
 from amundsen_common.models.dashboard import DashboardSummary
@@ -18,18 +18,27 @@ from amundsen_common.models.table import (Application, Column, Reader, Source,
 from amundsen_common.models.user import User as UserEntity
 from beaker.cache import CacheManager
 from beaker.util import parse_cache_config_options
-from flask import current_app, has_app_context
-from neo4j import BoltStatementResult, Driver, GraphDatabase  # noqa: F401
+from flask import current_app, g, has_app_context
+from neo4j import BoltStatementResult, Driver, GraphDatabase, Transaction  # noqa: F401
 
 from metadata_service import config
 from metadata_service.entity.dashboard_detail import DashboardDetail as DashboardDetailEntity
 from metadata_service.entity.dashboard_query import DashboardQuery as DashboardQueryEntity
 from metadata_service.entity.description import Description
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.entity.badge import Badge
+from metadata_service.entity.column_field import ColumnField
+from metadata_service.entity.mutation import Mutation, MutationResult, MutationStatus, MutationType
+from metadata_service.entity.pool_stats import PoolStats
 from metadata_service.exception import NotFoundException
+from metadata_service.proxy.background_refresher import BackgroundRefresher
 from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.bounded_executor import BoundedExecutor
+from metadata_service.proxy.pool_telemetry import PoolTelemetry
+from metadata_service.proxy.single_flight import single_flight
+from metadata_service.proxy import statsd_utilities
 from metadata_service.proxy.statsd_utilities import timer_with_counter
 from metadata_service.util import UserResourceRel
 
@@ -40,6 +49,71 @@ _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC = 11 * 60 * 60 + randint(0, 3600)
 
 LOGGER = logging.getLogger(__name__)
 
+# Attributes of the connection pool of the neo4j 1.7 driver the pool telemetry uses: connector opens connections,
+# acquire_direct takes one out of the pool, connections and in_use_connection_count hold the connections by address
+_DRIVER_POOL_INTERNALS = ('connector', 'acquire_direct', 'connections', 'in_use_connection_count')
+
+# Attribute of flask.g holding the bookmark of the last write transaction of the request
+_BOOKMARK_ATTR = '_neo4j_bookmark'
+
+# Table level relations of get_table. Each one is gathered independently through a pattern comprehension so that
+# watermarks, owners, tags and badges never multiply into each other's rows.
+_TABLE_LEVEL_PROJECTION = textwrap.dedent("""\
+[(wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl) | wmk] as wmk_records,
+head([(application:Application)-[:GENERATES]->(tbl) | application]) as application,
+head([(tbl)-[:LAST_UPDATED_AT]->(t:Timestamp) | t.last_updated_timestamp]) as last_updated_timestamp,
+[(tbl)-[:OWNER]->(owner:User) | owner] as owner_records,
+[(tbl)-[:TAGGED_BY]->(tag:Tag {tag_type: $tag_normal_type}) | tag] as tag_records,
+[(tbl)-[:HAS_BADGE]->(badge:Badge) | badge] as badge_records,
+head([(tbl)-[:SOURCE]->(src:Source) | src]) as src,
+[(tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description) | prog_descriptions] as prog_descriptions
+""")
+
+
+# Bodies of the bulk mutation statements, following a MATCH of the resource (n) of each row. They mirror the queries
+# of the single item methods (add_tag, delete_badge, ...).
+_MUTATION_STATEMENTS = {
+    MutationType.AddTag: textwrap.dedent("""\
+    MERGE (t:Tag {key: row.tag})
+    SET t = {tag_type: row.tag_type, key: row.tag}
+    MERGE (t)-[:TAG]->(n)-[:TAGGED_BY]->(t)
+    RETURN row.i AS i
+    """),
+    MutationType.DeleteTag: textwrap.dedent("""\
+    OPTIONAL MATCH (t:Tag {key: row.tag, tag_type: row.tag_type})-[r1:TAG]->(n)-[r2:TAGGED_BY]->(t)
+    DELETE r1, r2
+    RETURN DISTINCT row.i AS i
+    """),
+    MutationType.AddBadge: textwrap.dedent("""\
+    MERGE (b:Badge {key: row.badge_name})
+    SET b = {key: row.badge_name, category: row.category}
+    MERGE (b)-[:BADGE_FOR]->(n)-[:HAS_BADGE]->(b)
+    RETURN row.i AS i
+    """),
+    MutationType.DeleteBadge: textwrap.dedent("""\
+    OPTIONAL MATCH (b:Badge {key: row.badge_name, category: row.category})-[r1:BADGE_FOR]->(n)-[r2:HAS_BADGE]->(b)
+    DELETE r1, r2
+    RETURN DISTINCT row.i AS i
+    """),
+    MutationType.AddOwner: textwrap.dedent("""\
+    MERGE (u:User {key: row.owner})
+    ON CREATE SET u = {email: row.owner, key: row.owner}
+    MERGE (n)-[:OWNER]->(u)
+    RETURN row.i AS i
+    """),
+    MutationType.DeleteOwner: textwrap.dedent("""\
+    OPTIONAL MATCH (n)-[r:OWNER]->(:User {key: row.owner})
+    DELETE r
+    RETURN DISTINCT row.i AS i
+    """),
+    MutationType.PutDescription: textwrap.dedent("""\
+    MERGE (d:Description {key: row.key + '/_description'})
+    SET d = {description: row.description, key: row.key + '/_description'}
+    MERGE (n)-[:DESCRIPTION]->(d)
+    RETURN row.i AS i
+    """),
+}
+
 
 class Neo4jProxy(BaseProxy):
     """
@@ -53,6 +127,7 @@ class Neo4jProxy(BaseProxy):
                  password: str = '',
                  num_conns: int = 50,
                  max_connection_lifetime_sec: int = 100,
+                 connection_timeout_sec: int = 10,
                  encrypted: bool = False,
                  validate_ssl: bool = False) -> None:
         """
@@ -64,38 +139,196 @@ class Neo4jProxy(BaseProxy):
         :param max_connection_lifetime_sec: max life time the connection can have when it comes to reuse. In other
         words, connection life time longer than this value won't be reused and closed on garbage collection. This
         value needs to be smaller than surrounding network environment's timeout.
+        :param connection_timeout_sec: max time to establish a new connection
+
+        Queries that are run concurrently (see NEO4J_GET_TABLE_MODE) share one executor whose size is
+        NEO4J_QUERY_EXECUTOR_POOL_RATIO of num_conns, so they can never hold the whole connection pool.
+
+        With a causal cluster, use a routing scheme for host (bolt+routing:// or neo4j://): reads are then sent to
+        followers and read replicas, writes to the leader.
         """
         endpoint = f'{host}:{port}'
         LOGGER.info('NEO4J endpoint: {}'.format(endpoint))
         trust = neo4j.TRUST_SYSTEM_CA_SIGNED_CERTIFICATES if validate_ssl else neo4j.TRUST_ALL_CERTIFICATES
         self._driver = GraphDatabase.driver(endpoint, max_connection_pool_size=num_conns,
-                                            connection_timeout=10,
+                                            connection_timeout=connection_timeout_sec,
                                             max_connection_lifetime=max_connection_lifetime_sec,
                                             auth=(user, password),
                                             encrypted=encrypted,
                                             trust=trust)  # type: Driver
 
+        self._pool_telemetry = PoolTelemetry(metric_prefix=__name__)
+        self._pool = self._get_driver_pool()
+        if self._pool is not None:
+            self._pool.connector = self._pool_telemetry.counted(self._pool.connector)
+            self._pool.acquire_direct = self._pool_telemetry.timed(self._pool.acquire_direct)
+
+        pool_ratio = current_app.config.get(config.NEO4J_QUERY_EXECUTOR_POOL_RATIO, 0.5) if has_app_context() else 0.5
+        # queries run on the executor see the writes of the request which submitted them too
+        self._query_executor = BoundedExecutor(max_workers=int(num_conns * pool_ratio),
+                                               name='query_executor',
+                                               metric_prefix=__name__,
+                                               g_attrs=(_BOOKMARK_ATTR,))
+
+        self._popular_tables_refresher = None  # type: Optional[BackgroundRefresher]
+        refresh_interval_sec = current_app.config.get(config.NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC) \
+            if has_app_context() else None
+        if refresh_interval_sec:
+            self._popular_tables_refresh_num_entries = \
+                current_app.config[config.NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES]  # type: int
+            self._popular_tables_warm_up_timeout_sec = \
+                current_app.config.get(config.NEO4J_POPULAR_TABLES_WARM_UP_TIMEOUT_SEC, 1.0)  # type: float
+            self._popular_tables_refresher = BackgroundRefresher(
+                name='popular_tables',
+                refresh_fn=lambda: self._query_popular_tables_uris(self._popular_tables_refresh_num_entries),
+                interval_sec=refresh_interval_sec,
+                metric_prefix=__name__)
+            self._popular_tables_refresher.start()
+
     @timer_with_counter
-    def get_table(self, *, table_uri: str) -> Table:
+    @single_flight
+    def get_table(self, *, table_uri: str,
+                  column_offset: int = 0,
+                  column_limit: Optional[int] = None,
+                  column_fields: Optional[Set[ColumnField]] = None) -> Table:
         """
         :param table_uri: Table URI
+        :param column_offset: Number of columns (in sort order) to skip
+        :param column_limit: Max number of columns to return, all of them if None
+        :param column_fields: Optional column fields to load, all of them if None
         :return:  A Table object
         """
+        column_args = dict(column_offset=column_offset, column_limit=column_limit, column_fields=column_fields)
+
+        mode = self._get_table_mode()
+        if mode == config.NEO4J_GET_TABLE_SINGLE_QUERY:
+            return self._exec_single_table_query(table_uri, **column_args)
+        if mode == config.NEO4J_GET_TABLE_CONCURRENT:
+            return self._exec_table_queries_concurrently(table_uri, **column_args)
 
-        cols, last_neo4j_record = self._exec_col_query(table_uri)
+        cols, last_neo4j_record = self._exec_col_query(table_uri, **column_args)
 
         readers = self._exec_usage_query(table_uri)
 
-        wmk_results, table_writer, timestamp_value, owners, tags, source, badges, prog_descs = \
-            self._exec_table_query(table_uri)
+        table_level_fields = self._exec_table_query(table_uri)
+
+        return self._build_table(last_neo4j_record, cols, readers, table_level_fields)
+
+    @timer_with_counter
+    @single_flight
+    def get_table_columns(self, *, table_uri: str,
+                          offset: int = 0,
+                          limit: Optional[int] = None,
+                          fields: Optional[Set[ColumnField]] = None) -> List[Column]:
+        cols, _ = self._exec_col_query(table_uri, column_offset=offset, column_limit=limit, column_fields=fields)
+        return cols
+
+    @timer_with_counter
+    @single_flight
+    def get_tables(self, *, table_uris: List[str],
+                   detail_level: TableDetailLevel = TableDetailLevel.Summary) -> List[Optional[Table]]:
+        """
+        Fetches many tables with a constant number of queries: one for the table level fields, plus one for the
+        columns and one for the readers of all the tables for the full detail level.
+
+        :param table_uris:
+        :param detail_level: Summary leaves columns and readers out
+        :return: The table of each uri, in the order of table_uris, None for the tables which do not exist
+        """
+        tables_query = textwrap.dedent("""\
+        MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)-[:TABLE]->(tbl:Table)
+        WHERE tbl.key IN $tbl_keys
+        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
+        RETURN db, clstr, schema, tbl, tbl_dscrpt,
+        """) + _TABLE_LEVEL_PROJECTION
+        table_records = {record['tbl']['key']: record
+                         for record in self._execute_cypher_query(statement=tables_query,
+                                                                  param_dict={'tbl_keys': table_uris,
+                                                                              'tag_normal_type': 'default'})}
+
+        cols = {}  # type: Dict[str, List[Column]]
+        readers = {}  # type: Dict[str, List[Reader]]
+        if detail_level == TableDetailLevel.Full and table_records:
+            cols = self._exec_tables_col_query(list(table_records))
+            readers = self._exec_tables_usage_query(list(table_records))
+
+        tables = {key: self._build_table(record, cols.get(key, []), readers.get(key, []),
+                                         self._build_table_level_fields(record))
+                  for key, record in table_records.items()}
+        return [tables.get(table_uri) for table_uri in table_uris]
+
+    @timer_with_counter
+    def _exec_tables_col_query(self, table_uris: List[str]) -> Dict[str, List[Column]]:
+        col_stats, col_badges = self._column_field_projections(None)
+        column_level_query = textwrap.dedent("""
+        MATCH (tbl:Table)-[:COLUMN]->(col:Column)
+        WHERE tbl.key IN $tbl_keys
+        OPTIONAL MATCH (col)-[:DESCRIPTION]->(col_dscrpt:Description)
+        RETURN tbl.key as tbl_key, col, col_dscrpt,
+        {col_stats} as col_stats,
+        {col_badges} as col_badges
+        ORDER BY tbl.key, toInteger(col.sort_order);""").format(col_stats=col_stats, col_badges=col_badges)
+
+        cols = {}  # type: Dict[str, List[Column]]
+        for record in self._execute_cypher_query(statement=column_level_query, param_dict={'tbl_keys': table_uris}):
+            cols.setdefault(record['tbl_key'], []).append(self._build_column(record))
+        return cols
+
+    @timer_with_counter
+    def _exec_tables_usage_query(self, table_uris: List[str]) -> Dict[str, List[Reader]]:
+        usage_query = textwrap.dedent("""\
+        MATCH (user:User)-[read:READ]->(tbl:Table)
+        WHERE tbl.key IN $tbl_keys
+        WITH tbl, user, read
+        ORDER BY read.read_count DESC
+        RETURN tbl.key as tbl_key, collect({email: user.email, read_count: read.read_count})[..5] as readers
+        """)
+
+        readers = {}  # type: Dict[str, List[Reader]]
+        for record in self._execute_cypher_query(statement=usage_query, param_dict={'tbl_keys': table_uris}):
+            readers[record['tbl_key']] = [Reader(user=User(email=reader['email']), read_count=reader['read_count'])
+                                          for reader in record['readers']]
+        return readers
+
+    def _exec_table_queries_concurrently(self, table_uri: str, **column_args: Any) -> Table:
+        """
+        Runs column, usage and table level queries in parallel, each on its own pooled connection.
+        Exceptions (e.g. NotFoundException from the column query) are re-raised in the caller's thread.
+        """
+        col_future = self._query_executor.submit(self._exec_col_query, table_uri, **column_args)
+        usage_future = self._query_executor.submit(self._exec_usage_query, table_uri)
+        table_future = self._query_executor.submit(self._exec_table_query, table_uri)
+        try:
+            cols, last_neo4j_record = col_future.result()
+            readers = usage_future.result()
+            table_level_fields = table_future.result()
+        except Exception:
+            usage_future.cancel()
+            table_future.cancel()
+            raise
 
-        table = Table(database=last_neo4j_record['db']['name'],
-                      cluster=last_neo4j_record['clstr']['name'],
-                      schema=last_neo4j_record['schema']['name'],
-                      name=last_neo4j_record['tbl']['name'],
+        return self._build_table(last_neo4j_record, cols, readers, table_level_fields)
+
+    def _get_table_mode(self) -> str:
+        """
+        Strategy used by get_table, see NEO4J_GET_TABLE_MODE in config.
+        Falls back to the multi query strategy outside of an application context.
+        """
+        if not has_app_context():
+            return config.NEO4J_GET_TABLE_MULTI_QUERY
+        return current_app.config.get(config.NEO4J_GET_TABLE_MODE, config.NEO4J_GET_TABLE_MULTI_QUERY)
+
+    def _build_table(self, table_record: Any, cols: List[Column], readers: List[Reader],
+                     table_level_fields: Tuple) -> Table:
+        wmk_results, table_writer, timestamp_value, owners, tags, source, badges, prog_descs = table_level_fields
+
+        table = Table(database=table_record['db']['name'],
+                      cluster=table_record['clstr']['name'],
+                      schema=table_record['schema']['name'],
+                      name=table_record['tbl']['name'],
                       tags=tags,
                       badges=badges,
-                      description=self._safe_get(last_neo4j_record, 'tbl_dscrpt', 'description'),
+                      description=self._safe_get(table_record, 'tbl_dscrpt', 'description'),
                       columns=cols,
                       owners=owners,
                       table_readers=readers,
@@ -103,62 +336,146 @@ class Neo4jProxy(BaseProxy):
                       table_writer=table_writer,
                       last_updated_timestamp=timestamp_value,
                       source=source,
-                      is_view=self._safe_get(last_neo4j_record, 'tbl', 'is_view'),
+                      is_view=self._safe_get(table_record, 'tbl', 'is_view'),
                       programmatic_descriptions=prog_descs
                       )
 
         return table
 
     @timer_with_counter
-    def _exec_col_query(self, table_uri: str) -> Tuple:
+    def _exec_single_table_query(self, table_uri: str,
+                                 column_offset: int = 0,
+                                 column_limit: Optional[int] = None,
+                                 column_fields: Optional[Set[ColumnField]] = None) -> Table:
+        """
+        Fetches everything get_table needs in one round trip. Readers and columns are aggregated first (they need
+        ordering), every other relation is gathered through pattern comprehensions so the table row never fans out.
+        """
+        col_stats, col_badges = self._column_field_projections(column_fields)
+        col_end = '$col_offset + $col_limit' if column_limit is not None else 'size(cols)'
+
+        single_table_query = textwrap.dedent("""\
+        MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
+        -[:TABLE]->(tbl:Table {{key: $tbl_key}})
+        OPTIONAL MATCH (reader:User)-[read:READ]->(tbl)
+        WITH db, clstr, schema, tbl, reader, read
+        ORDER BY read.read_count DESC
+        WITH db, clstr, schema, tbl,
+        collect(reader {{.email, read_count: read.read_count}})[..5] as readers
+        OPTIONAL MATCH (tbl)-[:COLUMN]->(col:Column)
+        WITH db, clstr, schema, tbl, readers, col
+        ORDER BY toInteger(col.sort_order)
+        WITH db, clstr, schema, tbl, readers, collect(col) as cols
+        RETURN db, clstr, schema, tbl, readers, size(cols) as total_columns,
+        head([(tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description) | tbl_dscrpt]) as tbl_dscrpt,
+        [col IN cols[$col_offset..{col_end}] | {{
+            col: col,
+            col_dscrpt: head([(col)-[:DESCRIPTION]->(col_dscrpt:Description) | col_dscrpt]),
+            col_stats: {col_stats},
+            col_badges: {col_badges}
+        }}] as col_records,
+        """).format(col_end=col_end, col_stats=col_stats, col_badges=col_badges) + _TABLE_LEVEL_PROJECTION
+
+        table_record = self._execute_cypher_query(statement=single_table_query,
+                                                  param_dict={'tbl_key': table_uri,
+                                                              'tag_normal_type': 'default',
+                                                              'col_offset': column_offset,
+                                                              'col_limit': column_limit}).single()
+
+        if table_record is None or not table_record['total_columns']:
+            raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
+
+        cols = sorted([self._build_column(col_record) for col_record in table_record['col_records']],
+                      key=lambda item: item.sort_order)
+
+        readers = [Reader(user=User(email=reader['email']), read_count=reader['read_count'])
+                   for reader in table_record['readers']]
+
+        return self._build_table(table_record, cols, readers, self._build_table_level_fields(table_record))
+
+    @staticmethod
+    def _column_field_projections(column_fields: Optional[Set[ColumnField]]) -> Tuple[str, str]:
+        """
+        Cypher expressions gathering stats and badges of col, an empty list for a field which is not selected.
+        """
+        def is_selected(field: ColumnField) -> bool:
+            return column_fields is None or field in column_fields
+
+        col_stats = '[(col)-[:STAT]->(stat:Stat) | stat]' if is_selected(ColumnField.Stats) else '[]'
+        col_badges = '[(col)-[:HAS_BADGE]->(badge:Badge) | badge]' if is_selected(ColumnField.Badges) else '[]'
+        return col_stats, col_badges
+
+    @timer_with_counter
+    def _exec_col_query(self, table_uri: str,
+                        column_offset: int = 0,
+                        column_limit: Optional[int] = None,
+                        column_fields: Optional[Set[ColumnField]] = None) -> Tuple:
         # Return Value: (Columns, Last Processed Record)
 
+        # Paging happens before anything is loaded for a column. Stats and badges are gathered with pattern
+        # comprehensions, one list per column, instead of chained OPTIONAL MATCHes which would expand every column
+        # into stats x badges rows before de-duplication.
+        col_stats, col_badges = self._column_field_projections(column_fields)
         column_level_query = textwrap.dedent("""
         MATCH (db:Database)-[:CLUSTER]->(clstr:Cluster)-[:SCHEMA]->(schema:Schema)
-        -[:TABLE]->(tbl:Table {key: $tbl_key})-[:COLUMN]->(col:Column)
+        -[:TABLE]->(tbl:Table {{key: $tbl_key}})
         OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(tbl_dscrpt:Description)
-        OPTIONAL MATCH (col:Column)-[:DESCRIPTION]->(col_dscrpt:Description)
-        OPTIONAL MATCH (col:Column)-[:STAT]->(stat:Stat)
-        OPTIONAL MATCH (col:Column)-[:HAS_BADGE]->(badge:Badge)
-        RETURN db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt, collect(distinct stat) as col_stats,
-        collect(distinct badge) as col_badges
-        ORDER BY col.sort_order;""")
+        WITH db, clstr, schema, tbl, tbl_dscrpt
+        MATCH (tbl)-[:COLUMN]->(col:Column)
+        WITH db, clstr, schema, tbl, tbl_dscrpt, col
+        ORDER BY toInteger(col.sort_order)
+        SKIP $col_offset {limit}
+        OPTIONAL MATCH (col)-[:DESCRIPTION]->(col_dscrpt:Description)
+        RETURN db, clstr, schema, tbl, tbl_dscrpt, col, col_dscrpt,
+        {col_stats} as col_stats,
+        {col_badges} as col_badges
+        ORDER BY toInteger(col.sort_order);""").format(limit='LIMIT $col_limit' if column_limit is not None else '',
+                                                       col_stats=col_stats,
+                                                       col_badges=col_badges)
 
         tbl_col_neo4j_records = self._execute_cypher_query(
-            statement=column_level_query, param_dict={'tbl_key': table_uri})
+            statement=column_level_query, param_dict={'tbl_key': table_uri,
+                                                      'col_offset': column_offset,
+                                                      'col_limit': column_limit})
         cols = []
         last_neo4j_record = None
         for tbl_col_neo4j_record in tbl_col_neo4j_records:
             # Getting last record from this for loop as Neo4j's result's random access is O(n) operation.
-            col_stats = []
-            for stat in tbl_col_neo4j_record['col_stats']:
-                col_stat = Statistics(
-                    stat_type=stat['stat_name'],
-                    stat_val=stat['stat_val'],
-                    start_epoch=int(float(stat['start_epoch'])),
-                    end_epoch=int(float(stat['end_epoch']))
-                )
-                col_stats.append(col_stat)
-
-            column_badges = []
-            for badge in tbl_col_neo4j_record['col_badges']:
-                column_badges.append(TableBadge(badge_name=badge['key'], category=badge['category']))
-
             last_neo4j_record = tbl_col_neo4j_record
-            col = Column(name=tbl_col_neo4j_record['col']['name'],
-                         description=self._safe_get(tbl_col_neo4j_record, 'col_dscrpt', 'description'),
-                         col_type=tbl_col_neo4j_record['col']['type'],
-                         sort_order=int(tbl_col_neo4j_record['col']['sort_order']),
-                         stats=col_stats,
-                         badges=column_badges)
+            cols.append(self._build_column(tbl_col_neo4j_record))
 
-            cols.append(col)
+        if not cols and column_offset:
+            # Paged past the last column, the table itself may still exist
+            _, last_neo4j_record = self._exec_col_query(table_uri, column_limit=1, column_fields=set())
+            return [], last_neo4j_record
 
         if not cols:
             raise NotFoundException('Table URI( {table_uri} ) does not exist'.format(table_uri=table_uri))
 
         return sorted(cols, key=lambda item: item.sort_order), last_neo4j_record
 
+    def _build_column(self, col_record: Any) -> Column:
+        col_stats = []
+        for stat in col_record['col_stats']:
+            col_stat = Statistics(
+                stat_type=stat['stat_name'],
+                stat_val=stat['stat_val'],
+                start_epoch=int(float(stat['start_epoch'])),
+                end_epoch=int(float(stat['end_epoch']))
+            )
+            col_stats.append(col_stat)
+
+        column_badges = []
+        for badge in col_record['col_badges']:
+            column_badges.append(TableBadge(badge_name=badge['key'], category=badge['category']))
+
+        return Column(name=col_record['col']['name'],
+                      description=self._safe_get(col_record, 'col_dscrpt', 'description'),
+                      col_type=col_record['col']['type'],
+                      sort_order=int(col_record['col']['sort_order']),
+                      stats=col_stats,
+                      badges=column_badges)
+
     @timer_with_counter
     def _exec_usage_query(self, table_uri: str) -> List[Reader]:
         # Return Value: List[Reader]
@@ -190,30 +507,16 @@ class Neo4jProxy(BaseProxy):
 
         table_level_query = textwrap.dedent("""\
         MATCH (tbl:Table {key: $tbl_key})
-        OPTIONAL MATCH (wmk:Watermark)-[:BELONG_TO_TABLE]->(tbl)
-        OPTIONAL MATCH (application:Application)-[:GENERATES]->(tbl)
-        OPTIONAL MATCH (tbl)-[:LAST_UPDATED_AT]->(t:Timestamp)
-        OPTIONAL MATCH (owner:User)<-[:OWNER]-(tbl)
-        OPTIONAL MATCH (tbl)-[:TAGGED_BY]->(tag:Tag{tag_type: $tag_normal_type})
-        OPTIONAL MATCH (tbl)-[:HAS_BADGE]->(badge:Badge)
-        OPTIONAL MATCH (tbl)-[:SOURCE]->(src:Source)
-        OPTIONAL MATCH (tbl)-[:DESCRIPTION]->(prog_descriptions:Programmatic_Description)
-        RETURN collect(distinct wmk) as wmk_records,
-        application,
-        t.last_updated_timestamp as last_updated_timestamp,
-        collect(distinct owner) as owner_records,
-        collect(distinct tag) as tag_records,
-        collect(distinct badge) as badge_records,
-        src,
-        collect(distinct prog_descriptions) as prog_descriptions
-        """)
+        RETURN
+        """) + _TABLE_LEVEL_PROJECTION
 
         table_records = self._execute_cypher_query(statement=table_level_query,
                                                    param_dict={'tbl_key': table_uri,
                                                                'tag_normal_type': 'default'})
 
-        table_records = table_records.single()
+        return self._build_table_level_fields(table_records.single())
 
+    def _build_table_level_fields(self, table_records: Any) -> Tuple:
         wmk_results = []
         table_writer = None
 
@@ -302,12 +605,15 @@ class Neo4jProxy(BaseProxy):
     def _execute_cypher_query(self, *,
                               statement: str,
                               param_dict: Dict[str, Any]) -> BoltStatementResult:
+        """
+        Runs a read-only statement in a read access session, which a routing driver sends to a follower or read replica
+        """
         if LOGGER.isEnabledFor(logging.DEBUG):
             LOGGER.debug('Executing Cypher query: {statement} with params {params}: '.format(statement=statement,
                                                                                              params=param_dict))
         start = time.time()
         try:
-            with self._driver.session() as session:
+            with self._driver.session(access_mode=neo4j.READ_ACCESS, **self._bookmark_parameters()) as session:
                 return session.run(statement, **param_dict)
 
         finally:
@@ -315,6 +621,93 @@ class Neo4jProxy(BaseProxy):
             if LOGGER.isEnabledFor(logging.DEBUG):
                 LOGGER.debug('Cypher query execution elapsed for {} seconds'.format(time.time() - start))
 
+    def _execute_write(self, unit_of_work: Callable[..., Any], **kwargs: Any) -> Any:
+        """
+        Runs unit_of_work(tx, **kwargs) in a managed write transaction: the transaction is committed when unit_of_work
+        returns and rolled back when it raises, and the session is closed, releasing its connection to the pool, in
+        any case. Transient failures (deadlocks, expired connections, leader switches...) are retried by the driver
+        with exponential backoff and jitter for up to NEO4J_WRITE_MAX_RETRY_TIME_SEC seconds, so unit_of_work must be
+        safe to run more than once. Any other exception, e.g. NotFoundException, is raised right away.
+
+        Following metrics are emitted:
+          - write_transaction.pool_wait: time to acquire a connection from the pool and begin the transaction
+          - write_transaction.retry: attempts after the first one
+          - pool.in_use: connections in use when the transaction begins
+
+        Later queries of the same request wait for this transaction to be visible on the server they run on.
+
+        :return: What unit_of_work returned
+        """
+        max_retry_time = current_app.config.get(config.NEO4J_WRITE_MAX_RETRY_TIME_SEC, 30.0) \
+            if has_app_context() else 30.0
+        start = time.time()
+        attempts = []  # type: List[float]
+
+        def _attempt(tx: Transaction, **work_kwargs: Any) -> Any:
+            if attempts:
+                statsd_utilities.incr(prefix=__name__, stat='write_transaction.retry')
+            else:
+                statsd_utilities.timing(prefix=__name__, stat='write_transaction.pool_wait',
+                                        delta_ms=(time.time() - start) * 1000)
+                statsd_utilities.gauge(prefix=__name__, stat='pool.in_use', value=self._pool_in_use_count())
+            attempts.append(time.time())
+            return unit_of_work(tx, **work_kwargs)
+
+        with self._driver.session(max_retry_time=max_retry_time, **self._bookmark_parameters()) as session:
+            result = session.write_transaction(_attempt, **kwargs)
+            if has_app_context():
+                setattr(g, _BOOKMARK_ATTR, session.last_bookmark())
+            return result
+
+    @staticmethod
+    def _bookmark_parameters() -> Dict[str, Any]:
+        """
+        Session parameters making the queries of a session see the writes made earlier in the same request (read your
+        writes), even when they run on a read replica which has not caught up with the leader yet.
+        """
+        bookmark = getattr(g, _BOOKMARK_ATTR, None) if has_app_context() else None
+        return {'bookmarks': [bookmark]} if bookmark else {}
+
+    def _single_flight_scope(self) -> Optional[List[str]]:
+        """
+        A read of a request holding a bookmark must see its writes, so it only joins reads made with the same bookmark
+        (see single_flight)
+        """
+        return self._bookmark_parameters().get('bookmarks')
+
+    def _get_driver_pool(self) -> Any:
+        """
+        The driver has no public API for its connection pool: the pool telemetry relies on the internals of the pool
+        of the neo4j 1.7 driver (see requirements.txt), which other versions may not have.
+        :return: The connection pool of the driver, None (logged) if it does not have the internals relied on
+        """
+        pool = getattr(self._driver, '_pool', None)
+        if pool is None or not all(hasattr(pool, attribute) for attribute in _DRIVER_POOL_INTERNALS):
+            LOGGER.warning('The connection pool of neo4j driver {} does not have {}, pool telemetry is disabled'
+                           .format(getattr(neo4j, '__version__', 'unknown'), ', '.join(_DRIVER_POOL_INTERNALS)))
+            return None
+        return pool
+
+    def _pool_in_use_count(self) -> int:
+        """
+        :return: Number of connections of the driver's pool currently in use, across all the addresses it connects to
+        """
+        if self._pool is None:
+            return 0
+        return sum(self._pool.in_use_connection_count(address) for address in list(self._pool.connections))
+
+    def get_pool_stats(self) -> Optional[PoolStats]:
+        """
+        Reports the driver's pool across all the addresses it connects to. Connections opened and closed are counted
+        as the driver opens and closes them.
+        """
+        if self._pool is None:
+            return None
+        connections = [connection for address in list(self._pool.connections)
+                       for connection in list(self._pool.connections.get(address, ()))]
+        in_use = sum(1 for connection in connections if connection.in_use)
+        return self._pool_telemetry.stats(in_use=in_use, idle=len(connections) - in_use)
+
     @timer_with_counter
     def _get_resource_description(self, *,
                                   resource_type: ResourceType,
@@ -339,6 +732,7 @@ class Neo4jProxy(BaseProxy):
         return Description(description=result['description'] if result else None)
 
     @timer_with_counter
+    @single_flight
     def get_table_description(self, *,
                               table_uri: str) -> Union[str, None]:
         """
@@ -375,11 +769,7 @@ class Neo4jProxy(BaseProxy):
         RETURN n1.key, n2.key
         """.format(node_label=resource_type.name))
 
-        start = time.time()
-
-        try:
-            tx = self._driver.session().begin_transaction()
-
+        def _upsert(tx: Transaction) -> None:
             tx.run(upsert_desc_query, {'description': description,
                                        'desc_key': desc_key})
 
@@ -389,13 +779,13 @@ class Neo4jProxy(BaseProxy):
             if not result.single():
                 raise RuntimeError('Failed to update the resource {uri} description'.format(uri=uri))
 
-            # end neo4j transaction
-            tx.commit()
+        start = time.time()
+
+        try:
+            self._execute_write(_upsert)
 
         except Exception as e:
             LOGGER.exception('Failed to execute update process')
-            if not tx.closed():
-                tx.rollback()
 
             # propagate exception back to api
             raise e
@@ -419,6 +809,7 @@ class Neo4jProxy(BaseProxy):
                                        description=description)
 
     @timer_with_counter
+    @single_flight
     def get_column_description(self, *,
                                table_uri: str,
                                column_name: str) -> Union[str, None]:
@@ -471,11 +862,7 @@ class Neo4jProxy(BaseProxy):
             RETURN n1.key, n2.key
             """)
 
-        start = time.time()
-
-        try:
-            tx = self._driver.session().begin_transaction()
-
+        def _upsert(tx: Transaction) -> None:
             tx.run(upsert_desc_query, {'description': description,
                                        'desc_key': desc_key})
 
@@ -487,16 +874,15 @@ class Neo4jProxy(BaseProxy):
                                    'column {col} description'.format(tbl=table_uri,
                                                                      col=column_uri))
 
-            # end neo4j transaction
-            tx.commit()
+        start = time.time()
+
+        try:
+            self._execute_write(_upsert)
 
         except Exception as e:
 
             LOGGER.exception('Failed to execute update process')
 
-            if not tx.closed():
-                tx.rollback()
-
             # propagate error to api
             raise e
 
@@ -528,8 +914,7 @@ class Neo4jProxy(BaseProxy):
         RETURN n1.key, n2.key
         """)
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _upsert(tx: Transaction) -> None:
             # upsert the node
             tx.run(create_owner_query, {'user_email': owner})
             result = tx.run(upsert_owner_relation_query, {'user_email': owner,
@@ -539,12 +924,9 @@ class Neo4jProxy(BaseProxy):
                 raise RuntimeError('Failed to create relation between '
                                    'owner {owner} and table {tbl}'.format(owner=owner,
                                                                           tbl=table_uri))
-            tx.commit()
-        except Exception as e:
-            if not tx.closed():
-                tx.rollback()
-            # propagate the exception back to api
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_upsert)
 
     @timer_with_counter
     def delete_owner(self, *,
@@ -561,17 +943,12 @@ class Neo4jProxy(BaseProxy):
         MATCH (n1:User{key: $user_email})<-[r1:OWNER]-(n2:Table {key: $tbl_key}) DELETE r1
         """)
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _delete(tx: Transaction) -> None:
             tx.run(delete_query, {'user_email': owner,
                                   'tbl_key': table_uri})
-        except Exception as e:
-            # propagate the exception back to api
-            if not tx.closed():
-                tx.rollback()
-            raise e
-        finally:
-            tx.commit()
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_delete)
 
     @timer_with_counter
     def add_badge(self, *,
@@ -599,8 +976,7 @@ class Neo4jProxy(BaseProxy):
         RETURN n1.key, n2.key
         """.format(resource_type=resource_type.name))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _upsert(tx: Transaction) -> None:
             tbl_result = tx.run(validation_query, {'key': id})
             if not tbl_result.single():
                 raise NotFoundException('id {} does not exist'.format(id))
@@ -619,11 +995,8 @@ class Neo4jProxy(BaseProxy):
                                                                      resource=id,
                                                                      resource_type=resource_type,
                                                                      q=upsert_badge_relation_query))
-            tx.commit()
-        except Exception as e:
-            if not tx.closed():
-                tx.rollback()
-            raise e
+
+        self._execute_write(_upsert)
 
     @timer_with_counter
     def delete_badge(self, id: str,
@@ -641,19 +1014,16 @@ class Neo4jProxy(BaseProxy):
         [r1:BADGE_FOR]->(n:{resource_type} {{key: $key}})-[r2:HAS_BADGE]->(b) DELETE r1,r2
         """.format(resource_type=resource_type.name))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _delete(tx: Transaction) -> None:
             tx.run(delete_query, {'badge_name': badge_name,
                                   'key': id,
                                   'category': category})
-            tx.commit()
-        except Exception as e:
-            # propagate the exception back to api
-            if not tx.closed():
-                tx.rollback()
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_delete)
 
     @timer_with_counter
+    @single_flight
     def get_badges(self) -> List:
         LOGGER.info('Get all badges')
         query = textwrap.dedent("""
@@ -703,8 +1073,7 @@ class Neo4jProxy(BaseProxy):
         RETURN n1.key, n2.key
         """.format(resource_type=resource_type.name))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _upsert(tx: Transaction) -> None:
             tbl_result = tx.run(validation_query, {'key': id})
             if not tbl_result.single():
                 raise NotFoundException('id {} does not exist'.format(id))
@@ -721,12 +1090,9 @@ class Neo4jProxy(BaseProxy):
                                    .format(tag=tag,
                                            resource=id,
                                            resource_type=resource_type.name))
-            tx.commit()
-        except Exception as e:
-            if not tx.closed():
-                tx.rollback()
-            # propagate the exception back to api
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_upsert)
 
     @timer_with_counter
     def delete_tag(self, *,
@@ -753,19 +1119,100 @@ class Neo4jProxy(BaseProxy):
         [r1:TAG]->(n2:{resource_type} {{key: $key}})-[r2:TAGGED_BY]->(n1) DELETE r1,r2
         """.format(resource_type=resource_type.name))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _delete(tx: Transaction) -> None:
             tx.run(delete_query, {'tag': tag,
                                   'key': id,
                                   'tag_type': tag_type})
-            tx.commit()
-        except Exception as e:
-            # propagate the exception back to api
-            if not tx.closed():
-                tx.rollback()
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_delete)
+
+    @timer_with_counter
+    def apply_mutations(self, *, mutations: List[Mutation]) -> List[MutationResult]:
+        """
+        Applies the mutations in chunks of NEO4J_BULK_MUTATION_CHUNK_SIZE, one transaction per chunk. Within a chunk,
+        each run of consecutive mutations of the same type and resource type is applied by one UNWIND statement, so
+        the mutations keep their order. A failing chunk is rolled back and reported as failed, later chunks are still
+        applied. Mutations of resources which do not exist are reported as not found, mutations this proxy does not
+        support as failed, without being sent.
+
+        :param mutations:
+        :return: The result of each mutation, in the order of mutations
+        """
+        chunk_size = current_app.config.get(config.NEO4J_BULK_MUTATION_CHUNK_SIZE, 1000) \
+            if has_app_context() else 1000
+        results = [None] * len(mutations)  # type: List[Any]
+        supported = []  # type: List[Tuple[int, Mutation]]
+        for i, mutation in enumerate(mutations):
+            try:
+                self._mutation_statement(mutation.type, mutation.resource_type)
+            except ValueError as e:
+                results[i] = MutationResult(status=MutationStatus.Failed, message=str(e))
+                continue
+            supported.append((i, mutation))
+
+        for chunk_start in range(0, len(supported), chunk_size):
+            chunk = supported[chunk_start:chunk_start + chunk_size]
+            try:
+                applied = self._apply_mutation_chunk(chunk)
+            except Exception as e:
+                LOGGER.exception('Failed to apply mutations {} to {}'.format(chunk[0][0], chunk[-1][0]))
+                for i, _ in chunk:
+                    results[i] = MutationResult(status=MutationStatus.Failed, message=str(e))
+                continue
+
+            for i, mutation in chunk:
+                results[i] = MutationResult(status=MutationStatus.Success) if i in applied else \
+                    MutationResult(status=MutationStatus.NotFound,
+                                   message='{} {} does not exist'.format(mutation.resource_type.name, mutation.id))
+        return results
+
+    def _apply_mutation_chunk(self, chunk: List[Tuple[int, Mutation]]) -> Set[int]:
+        """
+        Applies a chunk of (index, mutation) in one transaction.
+        :return: Indexes of the mutations whose resource was found
+        """
+        runs = []  # type: List[List[Tuple[int, Mutation]]]
+        for i, mutation in chunk:
+            if runs and (runs[-1][0][1].type, runs[-1][0][1].resource_type) == (mutation.type, mutation.resource_type):
+                runs[-1].append((i, mutation))
+            else:
+                runs.append([(i, mutation)])
+
+        def _apply(tx: Transaction) -> Set[int]:
+            # built per attempt so that a retried transaction does not report rows of the failed attempt
+            applied = set()  # type: Set[int]
+            for run in runs:
+                first = run[0][1]
+                statement = self._mutation_statement(first.type, first.resource_type)
+                rows = [{'i': i, 'key': m.id, 'tag': m.tag, 'tag_type': m.tag_type, 'badge_name': m.badge_name,
+                         'category': m.category, 'owner': m.owner, 'description': m.description}
+                        for i, m in run]
+                applied.update(record['i'] for record in tx.run(statement, {'rows': rows}))
+            return applied
+
+        return self._execute_write(_apply)
+
+    @staticmethod
+    def _mutation_statement(mutation_type: MutationType, resource_type: ResourceType) -> str:
+        """
+        UNWIND statement applying mutations of mutation_type to resources of resource_type, given as $rows. It
+        returns the index (i) of each row whose resource exists.
+        :raises ValueError: if mutations of mutation_type cannot be applied to resources of resource_type
+        """
+        if mutation_type in (MutationType.AddOwner, MutationType.DeleteOwner) and \
+                resource_type != ResourceType.Table:
+            raise ValueError('Owners can only be changed on tables')
+        if mutation_type not in _MUTATION_STATEMENTS:
+            raise ValueError('Unsupported mutation {}'.format(mutation_type))
+
+        return textwrap.dedent("""
+        UNWIND $rows AS row
+        MATCH (n:{label} {{key: row.key}})
+        """).format(label=resource_type.name) + _MUTATION_STATEMENTS[mutation_type]
 
     @timer_with_counter
+    @single_flight
     def get_tags(self) -> List:
         """
         Get all existing tags from neo4j
@@ -789,6 +1236,7 @@ class Neo4jProxy(BaseProxy):
         return results
 
     @timer_with_counter
+    @single_flight
     def get_latest_updated_ts(self) -> Optional[int]:
         """
         API method to fetch last updated / index timestamp for neo4j, es
@@ -812,9 +1260,16 @@ class Neo4jProxy(BaseProxy):
     def _get_popular_tables_uris(self, num_entries: int) -> List[str]:
         """
         Retrieve popular table uris. Will provide tables with top x popularity score.
-        Popularity score = number of distinct readers * log(total number of reads)
         The result of this method will be cached based on the key (num_entries), and the cache will be expired based on
         _GET_POPULAR_TABLE_CACHE_EXPIRY_SEC
+        :return: Iterable of table uri
+        """
+        return self._query_popular_tables_uris(num_entries)
+
+    @timer_with_counter
+    def _query_popular_tables_uris(self, num_entries: int) -> List[str]:
+        """
+        Popularity score = number of distinct readers * log(total number of reads)
 
         For score computation, it uses logarithm on total number of reads so that score won't be affected by small
         number of users reading a lot of times.
@@ -836,16 +1291,24 @@ class Neo4jProxy(BaseProxy):
         return [record['table_key'] for record in records]
 
     @timer_with_counter
+    @single_flight
     def get_popular_tables(self, *, num_entries: int) -> List[PopularTable]:
         """
         Retrieve popular tables. As popular table computation requires full scan of table and user relationship,
-        it will utilize cached method _get_popular_tables_uris.
+        it will utilize the ranking kept up to date by the background refresher when enabled (and large enough),
+        or the cached method _get_popular_tables_uris otherwise, e.g. while the first ranking is still being computed.
 
         :param num_entries:
         :return: Iterable of PopularTable
         """
 
-        table_uris = self._get_popular_tables_uris(num_entries)
+        ranking = None
+        if self._popular_tables_refresher:
+            ranking = self._popular_tables_refresher.get(timeout=self._popular_tables_warm_up_timeout_sec)
+        if ranking is not None and num_entries <= self._popular_tables_refresh_num_entries:
+            table_uris = ranking[:num_entries]
+        else:
+            table_uris = self._get_popular_tables_uris(num_entries)
         if not table_uris:
             return []
 
@@ -872,6 +1335,7 @@ class Neo4jProxy(BaseProxy):
         return popular_tables
 
     @timer_with_counter
+    @single_flight
     def get_user(self, *, id: str) -> Union[UserEntity, None]:
         """
         Retrieve user detail based on user_id(email).
@@ -973,14 +1437,26 @@ class Neo4jProxy(BaseProxy):
             raise NotImplementedError(f'The relation type {relation_type} is not defined!')
         return relation
 
+    @staticmethod
+    def _pagination_clauses(after: Optional[str], limit: Optional[int]) -> Tuple[str, str]:
+        """
+        Keyset pagination of a query over resources ordered by key, taking $after and $limit parameters
+        :return: WHERE clause keeping the resources after $after, LIMIT clause. Each one is empty when not needed.
+        """
+        return ('WHERE resource.key > $after' if after is not None else '',
+                'LIMIT $limit' if limit is not None else '')
+
     @timer_with_counter
-    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) \
+    def get_dashboard_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                       after: Optional[str] = None, limit: Optional[int] = None) \
             -> Dict[str, List[DashboardSummary]]:
         """
         Retrieve all follow the Dashboard per user based on the relation.
 
         :param user_email: the email of the user
         :param relation_type: the relation between the user and the resource
+        :param after: Uri of the last dashboard of the previous page, the dashboards after it in key order are returned
+        :param limit: Maximum number of dashboards to return, all of them if None
         :return:
         """
         rel_clause: str = self._get_user_resource_relationship_clause(relation_type=relation_type,
@@ -993,19 +1469,26 @@ class Neo4jProxy(BaseProxy):
         # https://github.com/amundsen-io/amundsendatabuilder/blob/master/databuilder/models/dashboard/dashboard_execution.py#L18
         # https://github.com/amundsen-io/amundsendatabuilder/blob/master/databuilder/models/dashboard/dashboard_execution.py#L24
 
+        after_clause, limit_clause = self._pagination_clauses(after, limit)
         query = textwrap.dedent(f"""
         MATCH {rel_clause}<-[:DASHBOARD]-(dg:Dashboardgroup)<-[:DASHBOARD_GROUP]-(clstr:Cluster)
+        {after_clause}
+        WITH clstr, dg, resource ORDER BY resource.key {limit_clause}
         OPTIONAL MATCH (resource)-[:DESCRIPTION]->(dscrpt:Description)
         OPTIONAL MATCH (resource)-[:EXECUTED]->(last_exec:Execution)
         WHERE split(last_exec.key, '/')[5] = '_last_successful_execution'
         RETURN clstr.name as cluster_name, dg.name as dg_name, dg.dashboard_group_url as dg_url,
         resource.key as uri, resource.name as name, resource.dashboard_url as url,
         split(resource.key, '_')[0] as product,
-        dscrpt.description as description, last_exec.timestamp as last_successful_run_timestamp""")
+        dscrpt.description as description, last_exec.timestamp as last_successful_run_timestamp
+        ORDER BY uri""")
 
-        records = self._execute_cypher_query(statement=query, param_dict={'user_key': user_email})
+        records = self._execute_cypher_query(statement=query, param_dict={'user_key': user_email,
+                                                                          'after': after,
+                                                                          'limit': limit})
 
-        if not records:
+        # Past the first page, no dashboard only means the previous page was the last one
+        if not records and after is None:
             raise NotFoundException('User {user_id} does not {relation} on {resource_type} resources'.format(
                 user_id=user_email,
                 relation=relation_type,
@@ -1028,13 +1511,16 @@ class Neo4jProxy(BaseProxy):
         return {ResourceType.Dashboard.name.lower(): results}
 
     @timer_with_counter
-    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel) \
+    def get_table_by_user_relation(self, *, user_email: str, relation_type: UserResourceRel,
+                                   after: Optional[str] = None, limit: Optional[int] = None) \
             -> Dict[str, List[PopularTable]]:
         """
         Retrive all follow the Table per user based on the relation.
 
         :param user_email: the email of the user
         :param relation_type: the relation between the user and the resource
+        :param after: Key of the last table of the previous page, the tables after it in key order are returned
+        :param limit: Maximum number of tables to return, all of them if None
         :return:
         """
         rel_clause: str = self._get_user_resource_relationship_clause(relation_type=relation_type,
@@ -1042,15 +1528,21 @@ class Neo4jProxy(BaseProxy):
                                                                       resource_type=ResourceType.Table,
                                                                       user_key=user_email)
 
+        after_clause, limit_clause = self._pagination_clauses(after, limit)
         query = textwrap.dedent(f"""
             MATCH {rel_clause}<-[:TABLE]-(schema:Schema)<-[:SCHEMA]-(clstr:Cluster)<-[:CLUSTER]-(db:Database)
-            WITH db, clstr, schema, resource
+            {after_clause}
+            WITH db, clstr, schema, resource ORDER BY resource.key {limit_clause}
             OPTIONAL MATCH (resource)-[:DESCRIPTION]->(tbl_dscrpt:Description)
-            RETURN db, clstr, schema, resource, tbl_dscrpt""")
+            RETURN db, clstr, schema, resource, tbl_dscrpt
+            ORDER BY resource.key""")
 
-        table_records = self._execute_cypher_query(statement=query, param_dict={'user_key': user_email})
+        table_records = self._execute_cypher_query(statement=query, param_dict={'user_key': user_email,
+                                                                                'after': after,
+                                                                                'limit': limit})
 
-        if not table_records:
+        # Past the first page, no table only means the previous page was the last one
+        if not table_records and after is None:
             raise NotFoundException('User {user_id} does not {relation} any resources'.format(user_id=user_email,
                                                                                               relation=relation_type))
         results = []
@@ -1128,8 +1620,7 @@ class Neo4jProxy(BaseProxy):
         """.format(resource_type=resource_type.name,
                    rel_clause=rel_clause))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _upsert(tx: Transaction) -> None:
             # upsert the node
             tx.run(upsert_user_query, {'user_email': user_id})
             result = tx.run(upsert_user_relation_query, {'user_key': user_id, 'resource_key': id})
@@ -1138,12 +1629,9 @@ class Neo4jProxy(BaseProxy):
                 raise RuntimeError('Failed to create relation between '
                                    'user {user} and resource {id}'.format(user=user_id,
                                                                           id=id))
-            tx.commit()
-        except Exception as e:
-            if not tx.closed():
-                tx.rollback()
-            # propagate the exception back to api
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_upsert)
 
     @timer_with_counter
     def delete_resource_relation_by_user(self, *,
@@ -1170,17 +1658,14 @@ class Neo4jProxy(BaseProxy):
         DELETE rel
         """.format(rel_clause=rel_clause))
 
-        try:
-            tx = self._driver.session().begin_transaction()
+        def _delete(tx: Transaction) -> None:
             tx.run(delete_query, {'user_key': user_id, 'resource_key': id})
-            tx.commit()
-        except Exception as e:
-            # propagate the exception back to api
-            if not tx.closed():
-                tx.rollback()
-            raise e
+
+        # the exception, if any, is propagated back to api
+        self._execute_write(_delete)
 
     @timer_with_counter
+    @single_flight
     def get_dashboard(self,
                       id: str,
                       ) -> DashboardDetailEntity:
@@ -1282,6 +1767,7 @@ class Neo4jProxy(BaseProxy):
                                      )
 
     @timer_with_counter
+    @single_flight
     def get_dashboard_description(self, *,
                                   id: str) -> Description:
         """
@@ -2,12 +2,13 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from metadata_service.proxy.aws4authwebsocket.transport import (Aws4AuthWebsocketTransport,
-                                                                WebsocketClientTransport)
+                                                                WebsocketClientTransport, WebsocketMultiplexer)
+from gremlin_python.driver.transport import AbstractBaseTransport
 from gremlin_python.driver.driver_remote_connection import DriverRemoteConnection
 from .gremlin_proxy import AbstractGremlinProxy, _parse_gremlin_server_error
 import gremlin_python.driver.protocol
 from overrides import overrides
-from typing import Any, Mapping, Optional, Union
+from typing import Any, Callable, Mapping, Optional, Union
 
 
 def _is_neptune_concurrent_modification_exception(exception: Exception) -> bool:
@@ -22,12 +23,16 @@ class NeptuneGremlinProxy(AbstractGremlinProxy):
 
     See also https://docs.aws.amazon.com/neptune/latest/userguide/access-graph-gremlin-differences.html
     See also https://docs.aws.amazon.com/neptune/latest/userguide/access-graph-gremlin-sessions.html
+
+    :param multiplexing_options: when set, requests are pipelined over shared websockets, see WebsocketMultiplexer
+    for the options (num_connections, max_in_flight)
     """
 
     def __init__(self, *, host: str, port: Optional[int] = None, user: str = None,
                  password: Optional[Union[str, Mapping[str, str]]] = None,
                  driver_remote_connection_options: Mapping[str, Any] = {},
-                 aws4auth_options: Mapping[str, Any] = {}, websocket_options: Mapping[str, Any] = {}) -> None:
+                 aws4auth_options: Mapping[str, Any] = {}, websocket_options: Mapping[str, Any] = {},
+                 multiplexing_options: Optional[Mapping[str, Any]] = None) -> None:
         driver_remote_connection_options = dict(driver_remote_connection_options)
         # as others, we repurpose host a url
         driver_remote_connection_options.update(url=host)
@@ -55,7 +60,7 @@ class NeptuneGremlinProxy(AbstractGremlinProxy):
                                                   service_region=service_region,
                                                   extra_aws4auth_options=aws4auth_options or {},
                                                   extra_websocket_options=websocket_options or {})
-            driver_remote_connection_options.update(transport_factory=factory)
+            transport_factory: Callable[[], AbstractBaseTransport] = factory
         elif password is not None:
             raise NotImplementedError(f'to use authentication, pass a Mapping with aws_access_key_id, '
                                       f'aws_secret_access_key, service_region!')
@@ -66,7 +71,14 @@ class NeptuneGremlinProxy(AbstractGremlinProxy):
             # we could use the default Transport, but then we'd have to take different options, which feels clumsier.
             def factory() -> WebsocketClientTransport:
                 return WebsocketClientTransport(extra_websocket_options=websocket_options or {})
-            driver_remote_connection_options.update(transport_factory=factory)
+            transport_factory = factory
+
+        if multiplexing_options is not None:
+            multiplexer = WebsocketMultiplexer(transport_factory=factory, **multiplexing_options)
+            transport_factory = multiplexer.transport
+            driver_remote_connection_options.setdefault('pool_size', multiplexer.max_requests_in_flight)
+            driver_remote_connection_options.setdefault('max_workers', multiplexer.max_requests_in_flight)
+        driver_remote_connection_options.update(transport_factory=transport_factory)
 
         super().__init__(key_property_name='key',
                          remote_connection=DriverRemoteConnection(**driver_remote_connection_options))
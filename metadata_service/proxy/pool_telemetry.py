@@ -0,0 +1,121 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from functools import wraps
+from threading import Lock
+from typing import Any, Callable, Optional  # noqa: F401
+
+from metadata_service.entity.pool_stats import PoolStats
+from metadata_service.proxy import statsd_utilities
+
+
+class PoolTelemetry:
+    """
+    Keeps the counters of a proxy's connection pool which the backend driver does not keep itself: time spent waiting
+    to acquire a connection and connections opened / closed over time (churn). Proxies combine them with the in use and
+    idle counts read from their driver through stats().
+
+    Following metrics are emitted under metric_prefix:
+      - <name>.acquisition_wait: time a caller waited for a connection
+      - <name>.in_use / <name>.idle: connections in use and idle, whenever stats() is called
+      - <name>.opened / <name>.closed: connections opened and closed since the previous stats() call
+    """
+
+    def __init__(self, *,
+                 name: str = 'pool',
+                 metric_prefix: str = __name__) -> None:
+        self._name = name
+        self._metric_prefix = metric_prefix
+        self._lock = Lock()
+        self._acquisitions = 0
+        self._acquisition_wait_ms = 0.0
+        self._opened = 0
+        self._closed = 0
+        self._reported_opened = 0
+        self._reported_closed = 0
+
+    def timed(self, acquire: Callable) -> Callable:
+        """
+        Wraps the function a driver uses to take a connection out of its pool, recording how long each call took
+        """
+        @wraps(acquire)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.time()
+            try:
+                return acquire(*args, **kwargs)
+            finally:
+                self.record_acquisition(wait_sec=time.time() - start)
+
+        return wrapper
+
+    def record_acquisition(self, *, wait_sec: float) -> None:
+        with self._lock:
+            self._acquisitions += 1
+            self._acquisition_wait_ms += wait_sec * 1000
+        statsd_utilities.timing(prefix=self._metric_prefix, stat='{}.acquisition_wait'.format(self._name),
+                                delta_ms=wait_sec * 1000)
+
+    def record_churn(self, *, opened: int = 0, closed: int = 0) -> None:
+        with self._lock:
+            self._opened += opened
+            self._closed += closed
+
+    def counted(self, connect: Callable) -> Callable:
+        """
+        Wraps the function a driver uses to open a new connection, counting the connections it opens and, by wrapping
+        their close method, the ones closed afterwards (each connection at most once)
+        """
+        @wraps(connect)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            connection = connect(*args, **kwargs)
+            self.record_churn(opened=1)
+            close = connection.close
+            closed = False
+
+            @wraps(close)
+            def counted_close(*close_args: Any, **close_kwargs: Any) -> Any:
+                nonlocal closed
+                try:
+                    return close(*close_args, **close_kwargs)
+                finally:
+                    with self._lock:
+                        newly_closed, closed = not closed, True
+                    if newly_closed:
+                        self.record_churn(closed=1)
+
+            connection.close = counted_close
+            return connection
+
+        return wrapper
+
+    def stats(self, *,
+              in_use: int,
+              idle: int,
+              opened: Optional[int] = None,
+              closed: Optional[int] = None) -> PoolStats:
+        """
+        :param in_use: Connections currently in use, as reported by the driver
+        :param idle: Connections currently idle in the pool, as reported by the driver
+        :param opened: Connections opened so far, for drivers counting them themselves. Recorded churn is used if None.
+        :param closed: Connections closed so far, same as opened
+        """
+        with self._lock:
+            opened = self._opened if opened is None else opened
+            closed = self._closed if closed is None else closed
+            opened_delta, closed_delta = opened - self._reported_opened, closed - self._reported_closed
+            self._reported_opened, self._reported_closed = opened, closed
+            result = PoolStats(in_use=in_use,
+                               idle=idle,
+                               acquisitions=self._acquisitions,
+                               acquisition_wait_ms=self._acquisition_wait_ms,
+                               opened=opened,
+                               closed=closed)
+
+        statsd_utilities.gauge(prefix=self._metric_prefix, stat='{}.in_use'.format(self._name), value=in_use)
+        statsd_utilities.gauge(prefix=self._metric_prefix, stat='{}.idle'.format(self._name), value=idle)
+        if opened_delta > 0:
+            statsd_utilities.incr(prefix=self._metric_prefix, stat='{}.opened'.format(self._name), count=opened_delta)
+        if closed_delta > 0:
+            statsd_utilities.incr(prefix=self._metric_prefix, stat='{}.closed'.format(self._name), count=closed_delta)
+        return result
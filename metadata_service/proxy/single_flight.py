@@ -0,0 +1,99 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import logging
+import time
+from functools import wraps
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Optional  # noqa: F401
+
+from flask import current_app, has_app_context
+
+from metadata_service import config
+from metadata_service.proxy import statsd_utilities
+from metadata_service.util import normalize_arg
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result = None  # type: Any
+        self.error = None  # type: Optional[BaseException]
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing the same key: the first caller (leader) runs the function while the callers
+    arriving before it returns wait for it and get its result, or its exception, instead of running it again.
+    Calls arriving after the leader returned start a new flight, nothing is cached.
+
+    Following metrics are emitted under metric_prefix:
+      - <name>.miss: calls that ran the function
+      - <name>.hit: calls that joined a call in flight, i.e. backend calls saved
+      - <name>.wait: time spent waiting for the call in flight
+    """
+
+    def __init__(self, *, name: str, metric_prefix: str = __name__) -> None:
+        self._name = name
+        self._metric_prefix = metric_prefix
+        self._calls = {}  # type: Dict[str, _Call]
+        self._lock = Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            in_flight = self._calls.get(key)
+            call = in_flight or self._calls.setdefault(key, _Call())
+
+        if in_flight is not None:
+            statsd_utilities.incr(prefix=self._metric_prefix, stat='{}.hit'.format(self._name))
+            start = time.time()
+            call.done.wait()
+            statsd_utilities.timing(prefix=self._metric_prefix, stat='{}.wait'.format(self._name),
+                                    delta_ms=(time.time() - start) * 1000)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        statsd_utilities.incr(prefix=self._metric_prefix, stat='{}.miss'.format(self._name))
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def single_flight(f: Callable) -> Any:
+    """
+    A method decorator that coalesces concurrent calls of the method on the same instance with equal arguments
+    into one call (see SingleFlight). Meant for read methods of proxies: all callers get the very same result object,
+    which must therefore not be modified. Disabled when config.PROXY_SINGLE_FLIGHT is False.
+
+    A proxy whose reads depend on more than their arguments (e.g. the causal bookmark of Neo4jProxy) returns it from
+    a _single_flight_scope method: only calls in the same scope are coalesced.
+
+    e.g: decorating function neo4j_proxy.get_table will emit:
+      - metadata_service.proxy.neo4j_proxy.get_table.single_flight.hit
+      - metadata_service.proxy.neo4j_proxy.get_table.single_flight.miss
+      - metadata_service.proxy.neo4j_proxy.get_table.single_flight.wait
+    """
+    flight = SingleFlight(name='{}.single_flight'.format(f.__name__), metric_prefix=f.__module__)
+
+    @wraps(f)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if has_app_context() and not current_app.config.get(config.PROXY_SINGLE_FLIGHT, True):
+            return f(self, *args, **kwargs)
+
+        scope = self._single_flight_scope() if hasattr(self, '_single_flight_scope') else None
+        key = '{}|{}|{}|{}'.format(id(self), scope,
+                                   [normalize_arg(arg) for arg in args],
+                                   sorted((name, normalize_arg(value)) for name, value in kwargs.items()))
+        return flight.do(key, lambda: f(self, *args, **kwargs))
+
+    return wrapper
@@ -51,6 +51,33 @@ def timer_with_counter(f: Callable) -> Any:
     return wrapper
 
 
+def gauge(*, prefix: str, stat: str, value: float) -> None:
+    """
+    Sets statsd gauge <prefix>.<stat> to value. No-op when statsd is off.
+    """
+    statsd_client = _get_statsd_client(prefix=prefix)
+    if statsd_client:
+        statsd_client.gauge(stat, value)
+
+
+def incr(*, prefix: str, stat: str, count: int = 1) -> None:
+    """
+    Increments statsd counter <prefix>.<stat> by count. No-op when statsd is off.
+    """
+    statsd_client = _get_statsd_client(prefix=prefix)
+    if statsd_client:
+        statsd_client.incr(stat, count)
+
+
+def timing(*, prefix: str, stat: str, delta_ms: float) -> None:
+    """
+    Records delta_ms milliseconds on statsd timer <prefix>.<stat>. No-op when statsd is off.
+    """
+    statsd_client = _get_statsd_client(prefix=prefix)
+    if statsd_client:
+        statsd_client.timing(stat, delta_ms)
+
+
 def _get_statsd_client(*, prefix: str) -> StatsClient:
     """
     Object pool method that reuse already created StatsClient based on prefix
@@ -0,0 +1,120 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple  # noqa: F401
+
+from flask import current_app
+
+from metadata_service import config
+from metadata_service.proxy import statsd_utilities
+
+# Key of the cache in the extensions of the Flask app
+_EXTENSION_KEY = 'user_detail_cache'
+
+
+class UserDetailCache:
+    """
+    LRU cache of user details with a time to live. Unknown users (for which the lookup returned nothing) are
+    cached too, for negative_ttl_sec. Lookup errors are not cached.
+    """
+
+    def __init__(self, *,
+                 ttl_sec: float,
+                 negative_ttl_sec: float,
+                 max_size: int) -> None:
+        self._ttl_sec = ttl_sec
+        self._negative_ttl_sec = negative_ttl_sec
+        self._max_size = max_size
+        self._lock = Lock()
+        # user id -> (expiry time, details or None for unknown users), least recently used first
+        self._entries = OrderedDict()  # type: OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]
+
+    def get_many(self, user_ids: Iterable[str],
+                 lookup: Callable[[List[str]], Dict[str, Optional[Dict[str, Any]]]]) -> Dict[str, Optional[Dict]]:
+        """
+        :param user_ids:
+        :param lookup: Resolves the users which are not cached, returns the details of each of them (None or missing
+        for unknown users)
+        :return: Details of each user, None for unknown users
+        """
+        user_ids = list(OrderedDict.fromkeys(user_ids))
+        results = dict()  # type: Dict[str, Optional[Dict[str, Any]]]
+        now = time.time()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(user_id)
+                    results[user_id] = entry[1]
+
+        missing = [user_id for user_id in user_ids if user_id not in results]
+        statsd_utilities.incr(prefix=__name__, stat='user_detail_cache.hit', count=len(results))
+        if not missing:
+            return results
+
+        statsd_utilities.incr(prefix=__name__, stat='user_detail_cache.miss', count=len(missing))
+        found = lookup(missing)
+        now = time.time()
+        with self._lock:
+            for user_id in missing:
+                details = found.get(user_id) or None
+                results[user_id] = details
+                ttl_sec = self._ttl_sec if details else self._negative_ttl_sec
+                if ttl_sec > 0:
+                    self._entries[user_id] = (now + ttl_sec, details)
+                    self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def has_user_detail_method() -> bool:
+    return bool(current_app.config.get(config.USER_DETAIL_METHOD)
+                or current_app.config.get(config.USER_DETAIL_BATCH_METHOD))
+
+
+def get_user_details(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    :return: Details of the user from USER_DETAIL_METHOD (or USER_DETAIL_BATCH_METHOD), None if it does not know
+    the user or if neither is configured
+    """
+    return get_users_details([user_id]).get(user_id)
+
+
+def get_users_details(user_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Resolves the details of many users at once: cached users are not looked up again, the other ones are resolved
+    with a single USER_DETAIL_BATCH_METHOD call when it is configured, one USER_DETAIL_METHOD call per user otherwise.
+    Results are cached for USER_DETAIL_CACHE_TTL_SEC, unknown users for USER_DETAIL_CACHE_NEGATIVE_TTL_SEC.
+
+    :return: Details of each user, None for unknown users. Empty if no user detail method is configured.
+    """
+    if not has_user_detail_method():
+        return {}
+    return _get_cache().get_many(user_ids, _lookup)
+
+
+def _lookup(user_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    batch_method = current_app.config.get(config.USER_DETAIL_BATCH_METHOD)
+    if batch_method:
+        return batch_method(user_ids)
+
+    detail_method = current_app.config[config.USER_DETAIL_METHOD]
+    return {user_id: detail_method(user_id) for user_id in user_ids}
+
+
+def _get_cache() -> UserDetailCache:
+    cache = current_app.extensions.get(_EXTENSION_KEY)
+    if cache is None:
+        cache = current_app.extensions.setdefault(_EXTENSION_KEY, UserDetailCache(
+            ttl_sec=current_app.config.get(config.USER_DETAIL_CACHE_TTL_SEC, 0),
+            negative_ttl_sec=current_app.config.get(config.USER_DETAIL_CACHE_NEGATIVE_TTL_SEC, 0),
+            max_size=current_app.config.get(config.USER_DETAIL_CACHE_MAX_SIZE, 10000)))
+    return cache
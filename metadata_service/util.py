@@ -2,6 +2,17 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from collections import namedtuple
+from typing import Any
 
 
 UserResourceRel = namedtuple('UserResourceRel', 'follow, own, read')
+
+
+def normalize_arg(value: Any) -> Any:
+    """
+    Makes equal arguments of proxy methods give equal keys when building cache keys from their repr: sets have no
+    stable repr, they are sorted
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return value
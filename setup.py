@@ -19,7 +19,7 @@ setup(
     url='https://www.github.com/amundsen-io/amundsenmetadatalibrary',
     maintainer='Amundsen TSC',
     maintainer_email='amundsen-tsc@lists.lfai.foundation',
-    packages=find_packages(exclude=['tests*']),
+    packages=find_packages(exclude=['tests*', 'benchmarks*']),
     include_package_data=True,
     zip_safe=False,
     dependency_links=[],
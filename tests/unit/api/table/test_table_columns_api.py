@@ -0,0 +1,56 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+from unittest.mock import call
+
+from amundsen_common.models.table import Column
+
+from metadata_service.entity.column_field import ColumnField
+from metadata_service.exception import NotFoundException
+from tests.unit.api.table.table_test_case import TableTestCase
+
+TABLE_URI = 'wizards'
+
+
+def _columns(start: int, end: int) -> list:
+    return [Column(name=f'col_{i}', description=None, col_type='string', sort_order=i, stats=[])
+            for i in range(start, end)]
+
+
+class TestTableColumnsAPI(TableTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.app.config['TABLE_COLUMNS_PAGE_SIZE'] = 2
+
+    def test_should_stream_columns_page_by_page(self) -> None:
+        self.mock_proxy.get_table_columns.side_effect = [_columns(0, 2), _columns(2, 4), _columns(4, 5)]
+
+        response = self.app.test_client().get(f'/table/{TABLE_URI}/columns?include=stats')
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([column['name'] for column in response.json['columns']],
+                         ['col_0', 'col_1', 'col_2', 'col_3', 'col_4'])
+        self.assertEqual(self.mock_proxy.get_table_columns.call_args_list, [
+            call(table_uri=TABLE_URI, offset=0, limit=2, fields={ColumnField.Stats}),
+            call(table_uri=TABLE_URI, offset=2, limit=2, fields={ColumnField.Stats}),
+            call(table_uri=TABLE_URI, offset=4, limit=2, fields={ColumnField.Stats}),
+        ])
+
+    def test_should_stop_at_limit(self) -> None:
+        self.mock_proxy.get_table_columns.side_effect = [_columns(1, 3), _columns(3, 4)]
+
+        response = self.app.test_client().get(f'/table/{TABLE_URI}/columns?offset=1&limit=3')
+
+        self.assertEqual([column['name'] for column in response.json['columns']], ['col_1', 'col_2', 'col_3'])
+        self.assertEqual(self.mock_proxy.get_table_columns.call_args_list, [
+            call(table_uri=TABLE_URI, offset=1, limit=2, fields=None),
+            call(table_uri=TABLE_URI, offset=3, limit=1, fields=None),
+        ])
+
+    def test_should_fail_when_table_not_found(self) -> None:
+        self.mock_proxy.get_table_columns.side_effect = NotFoundException(message='table not found')
+
+        response = self.app.test_client().get(f'/table/{TABLE_URI}/columns')
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
@@ -4,6 +4,7 @@
 from http import HTTPStatus
 import pytest
 
+from metadata_service.entity.column_field import ColumnField
 from metadata_service.exception import NotFoundException
 from tests.unit.api.table.table_test_case import TableTestCase
 
@@ -80,3 +81,18 @@ class TestTableDetailAPI(TableTestCase):
         response = self.app.test_client().get(f'/table/{TABLE_URI}')
 
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_should_pass_column_args(self) -> None:
+        self.mock_proxy.get_table.side_effect = NotFoundException(message='table not found')
+
+        self.app.test_client().get(f'/table/{TABLE_URI}?offset=10&limit=5&include=stats')
+
+        self.mock_proxy.get_table.assert_called_with(table_uri=TABLE_URI, column_offset=10, column_limit=5,
+                                                     column_fields={ColumnField.Stats})
+
+    def test_should_reject_invalid_column_args(self) -> None:
+        for query in ('offset=-1', 'limit=0', 'include=stats,foo'):
+            response = self.app.test_client().get(f'/table/{TABLE_URI}?{query}')
+
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.get_table.assert_not_called()
@@ -0,0 +1,57 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from http import HTTPStatus
+from typing import Any
+
+from amundsen_common.models.table import Table
+
+from metadata_service.entity.table_detail_level import TableDetailLevel
+from tests.unit.api.table.table_test_case import TableTestCase
+
+TABLE = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table', columns=[],
+              description='foo description')
+
+
+class TestTablesAPI(TableTestCase):
+
+    def _post(self, body: Any) -> Any:
+        return self.app.test_client().post('/tables', data=json.dumps(body))
+
+    def test_should_get_tables_in_request_order(self) -> None:
+        self.mock_proxy.get_tables.return_value = [None, TABLE]
+
+        response = self._post({'table_uris': ['missing', 'hive://gold.foo_schema/foo_table']})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.mock_proxy.get_tables.assert_called_once_with(table_uris=['missing', 'hive://gold.foo_schema/foo_table'],
+                                                           detail_level=TableDetailLevel.Summary)
+        tables = response.json['tables']
+        self.assertEqual([(table['table_uri'], table['found']) for table in tables],
+                         [('missing', False), ('hive://gold.foo_schema/foo_table', True)])
+        self.assertIsNone(tables[0]['table'])
+        self.assertEqual(tables[1]['table']['description'], 'foo description')
+
+    def test_should_pass_detail_level(self) -> None:
+        self.mock_proxy.get_tables.return_value = [TABLE]
+
+        response = self._post({'table_uris': ['hive://gold.foo_schema/foo_table'], 'detail': 'full'})
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.mock_proxy.get_tables.call_args[1]['detail_level'], TableDetailLevel.Full)
+
+    def test_should_reject_invalid_body(self) -> None:
+        for body in [{'table_uris': 'foo'}, {'table_uris': [1]}, {'table_uris': ['foo'], 'detail': 'some'}, []]:
+            response = self._post(body)
+
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.get_tables.assert_not_called()
+
+    def test_should_reject_too_many_tables(self) -> None:
+        self.app.config['TABLES_BATCH_MAX_ITEMS'] = 1
+
+        response = self._post({'table_uris': ['foo', 'bar']})
+
+        self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        self.mock_proxy.get_tables.assert_not_called()
@@ -0,0 +1,86 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from http import HTTPStatus
+from typing import Any, List  # noqa: F401
+from unittest.mock import Mock, patch
+
+from metadata_service.entity.badge import Badge
+from metadata_service.entity.mutation import Mutation, MutationResult, MutationStatus, MutationType
+from metadata_service.entity.resource_type import ResourceType
+from tests.unit.test_basics import BasicTestCase
+
+
+class TestBulkAPI(BasicTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.mock_client = patch('metadata_service.api.bulk.get_proxy_client')
+        self.mock_proxy = self.mock_client.start().return_value = Mock()
+        self.mock_proxy.apply_mutations.side_effect = \
+            lambda mutations: [MutationResult(status=MutationStatus.Success)] * len(mutations)
+        self.app.config['WHITELIST_BADGES'] = [Badge(badge_name='beta', category='table_status')]
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.mock_client.stop()
+
+    def _post(self, mutations: Any) -> Any:
+        return self.app.test_client().post('/bulk', data=json.dumps({'mutations': mutations}))
+
+    def test_applies_mutations(self) -> None:
+        response = self._post([
+            {'type': 'add_tag', 'id': 'table1', 'tag': 'tag1'},
+            {'type': 'add_badge', 'id': 'dash1', 'resource_type': 'dashboard', 'badge_name': 'beta',
+             'category': 'table_status'},
+            {'type': 'add_owner', 'id': 'table1', 'owner': 'owner@example.com'},
+            {'type': 'put_description', 'id': 'table2', 'description': 'desc'},
+        ])
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([result['status'] for result in response.json['results']], [HTTPStatus.OK] * 4)
+        self.mock_proxy.apply_mutations.assert_called_once_with(mutations=[
+            Mutation(type=MutationType.AddTag, id='table1', tag='tag1'),
+            Mutation(type=MutationType.AddBadge, id='dash1', resource_type=ResourceType.Dashboard,
+                     badge_name='beta', category='table_status'),
+            Mutation(type=MutationType.AddOwner, id='table1', owner='owner@example.com'),
+            Mutation(type=MutationType.PutDescription, id='table2', description='desc'),
+        ])
+
+    def test_reports_result_per_item_in_order(self) -> None:
+        self.mock_proxy.apply_mutations.side_effect = lambda mutations: [
+            MutationResult(status=MutationStatus.NotFound, message='Table table2 does not exist'),
+            MutationResult(status=MutationStatus.Success),
+        ]
+
+        response = self._post([
+            {'type': 'add_tag', 'id': 'table1', 'tag': 'beta'},
+            {'type': 'add_tag', 'id': 'table2', 'tag': 'tag1'},
+            {'type': 'unknown', 'id': 'table1'},
+            {'type': 'add_badge', 'id': 'table1', 'badge_name': 'alpha', 'category': 'table_status'},
+            {'type': 'add_owner', 'id': 'table1'},
+            {'type': 'delete_tag', 'id': 'table1', 'tag': 'tag1'},
+        ])
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        results = response.json['results']
+        self.assertEqual([result['status'] for result in results],
+                         [HTTPStatus.CONFLICT, HTTPStatus.NOT_FOUND, HTTPStatus.BAD_REQUEST, HTTPStatus.NOT_FOUND,
+                          HTTPStatus.BAD_REQUEST, HTTPStatus.OK])
+        self.assertEqual(results[1]['message'], 'Table table2 does not exist')
+        self.assertEqual(results[4]['message'], 'Missing owner for add_owner')
+        self.assertEqual(len(self.mock_proxy.apply_mutations.call_args[1]['mutations']), 2)
+
+    def test_rejects_invalid_body(self) -> None:
+        response = self.app.test_client().post('/bulk', data='[]')
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.mock_proxy.apply_mutations.assert_not_called()
+
+    def test_rejects_too_many_mutations(self) -> None:
+        self.app.config['BULK_MUTATION_MAX_ITEMS'] = 1
+
+        response = self._post([{'type': 'add_tag', 'id': 'table1', 'tag': 'tag1'}] * 2)
+
+        self.assertEqual(response.status_code, HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        self.mock_proxy.apply_mutations.assert_not_called()
@@ -4,8 +4,12 @@
 import unittest
 
 from http import HTTPStatus
+from typing import Any, Dict, Optional
 from unittest import mock
 from unittest.mock import MagicMock
+
+from amundsen_common.models.popular_table import PopularTable
+
 from metadata_service import create_app
 
 from metadata_service.api.user import (UserDetailAPI, UserFollowAPI, UserFollowsAPI,
@@ -43,6 +47,7 @@ class UserFollowsAPITest(unittest.TestCase):
 
     @mock.patch('metadata_service.api.user.get_proxy_client')
     def setUp(self, mock_get_proxy_client: MagicMock) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
         self.mock_client = mock.Mock()
         mock_get_proxy_client.return_value = self.mock_client
         self.api = UserFollowsAPI()
@@ -51,9 +56,65 @@ class UserFollowsAPITest(unittest.TestCase):
         self.mock_client.get_table_by_user_relation.return_value = {'table': []}
         self.mock_client.get_dashboard_by_user_relation.return_value = {'dashboard': []}
 
-        response = self.api.get(user_id='username')
-        self.assertEqual(list(response)[1], HTTPStatus.OK)
-        self.mock_client.get_table_by_user_relation.assert_called_once()
+        with self.app.test_request_context('/user/username/follow/'):
+            response, status = self.api.get(user_id='username')
+        self.assertEqual(status, HTTPStatus.OK)
+        # without limit nor cursor, every followed resource is returned
+        self.assertIsNone(response['next_cursor'])
+        self.mock_client.get_table_by_user_relation.assert_called_once_with(user_email='username',
+                                                                            relation_type=UserResourceRel.follow,
+                                                                            after=None, limit=None)
+
+    def test_get_limit_capped(self) -> None:
+        self.app.config['USER_FOLLOWS_MAX_PAGE_SIZE'] = 5
+        tables = [PopularTable(database='hive', cluster='gold', schema='core', name='table_{}'.format(index))
+                  for index in range(6)]
+        self.mock_client.get_table_by_user_relation.return_value = {'table': tables}
+        self.mock_client.get_dashboard_by_user_relation.return_value = {'dashboard': []}
+
+        with self.app.test_request_context('/user/username/follow/?limit=50'):
+            page, status = self.api.get(user_id='username')
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual(len(page['table']), 5)
+        self.assertIsNotNone(page['next_cursor'])
+        self.assertEqual(self.mock_client.get_table_by_user_relation.call_args[1]['limit'], 6)
+
+    def test_get_pages(self) -> None:
+        tables = [PopularTable(database='hive', cluster='gold', schema='core', name='table_{}'.format(index))
+                  for index in range(3)]
+        keys = ['hive://gold.core/table_{}'.format(index) for index in range(3)]
+
+        def get_table_by_user_relation(after: Optional[str], limit: int, **kwargs: Any) -> Dict[str, Any]:
+            return {'table': [table for key, table in zip(keys, tables) if after is None or key > after][:limit]}
+
+        self.mock_client.get_table_by_user_relation.side_effect = get_table_by_user_relation
+        self.mock_client.get_dashboard_by_user_relation.return_value = {'dashboard': []}
+
+        with self.app.test_request_context('/user/username/follow/?limit=2'):
+            first_page, status = self.api.get(user_id='username')
+        self.assertEqual(status, HTTPStatus.OK)
+        self.assertEqual([table['name'] for table in first_page['table']], ['table_0', 'table_1'])
+        self.assertIsNotNone(first_page['next_cursor'])
+
+        # the first table is unfollowed between the two pages
+        keys.pop(0)
+        tables.pop(0)
+        with self.app.test_request_context('/user/username/follow/?limit=2&cursor={}'
+                                           .format(first_page['next_cursor'])):
+            second_page, status = self.api.get(user_id='username')
+        self.assertEqual([table['name'] for table in second_page['table']], ['table_2'])
+        self.assertIsNone(second_page['next_cursor'])
+        self.assertEqual(self.mock_client.get_table_by_user_relation.call_args[1]['after'], 'hive://gold.core/table_1')
+        # dashboards were exhausted on the first page
+        self.mock_client.get_dashboard_by_user_relation.assert_called_once_with(user_email='username',
+                                                                                relation_type=UserResourceRel.follow,
+                                                                                after=None, limit=3)
+
+    def test_get_invalid_cursor(self) -> None:
+        with self.app.test_request_context('/user/username/follow/?cursor=not_a_cursor'):
+            response = self.api.get(user_id='username')
+        self.assertEqual(list(response)[1], HTTPStatus.BAD_REQUEST)
+        self.mock_client.get_table_by_user_relation.assert_not_called()
 
 
 class UserFollowAPITest(unittest.TestCase):
@@ -1,8 +1,15 @@
 # Copyright Contributors to the Amundsen project.
 # SPDX-License-Identifier: Apache-2.0
 
-from metadata_service.proxy.aws4authwebsocket.transport import Aws4AuthWebsocketTransport
+from metadata_service.proxy.aws4authwebsocket.transport import (Aws4AuthWebsocketTransport,
+                                                                WebsocketClientTransport, WebsocketMultiplexer)
+import json
+import queue
+import socket
+import threading
 import unittest
+from typing import Any, List, Mapping, Optional, Union
+from websocket import create_connection
 
 
 class TestAws4AuthWebsocketTransport(unittest.TestCase):
@@ -13,38 +20,61 @@ class TestAws4AuthWebsocketTransport(unittest.TestCase):
         self.aws_secret_access_key = 'test_secret_key'
         self.service_region = 'test_region'
 
-    def test_get_raw_request(self) -> None:
-        """
-        tests our Mocket usage and the exception handling
-        """
-        raw_request = Aws4AuthWebsocketTransport._get_raw_request_for(self.url)
-        prepared_request = Aws4AuthWebsocketTransport._parse_raw_request(raw_request)
+    def test_get_handshake_request(self) -> None:
+        request = Aws4AuthWebsocketTransport._get_handshake_request(self.url)
         self.assertEqual(
-            set(prepared_request.headers.keys()),
+            set(request.headers.keys()),
             set(['Host', 'Origin', 'Connection', 'Upgrade', 'Sec-WebSocket-Key', 'Sec-WebSocket-Version']))
+        self.assertEqual(request.method, 'GET')
+        self.assertEqual(request.path_url, '/gremlin')
+        self.assertEqual(request.headers['Host'], 'xxxxxnotreallyawsxxxxxxxx.com:8182')
+        self.assertEqual(request.headers['Origin'], 'http://xxxxxnotreallyawsxxxxxxxx.com:8182')
 
-    def test_get_raw_request_uses_headers(self) -> None:
-        raw_request = Aws4AuthWebsocketTransport._get_raw_request_for(
-            self.url, header={'Foo': 'Bar', 'Sec-WebSocket-Key': 'xxxxxxxxxxxxxx'})
-        prepared_request = Aws4AuthWebsocketTransport._parse_raw_request(raw_request)
+    def test_get_handshake_request_uses_headers(self) -> None:
+        request = Aws4AuthWebsocketTransport._get_handshake_request(
+            self.url, header={'Foo': 'Bar', 'Sec-WebSocket-Key': 'xxxxxxxxxxxxxx'}, timeout=5)
         self.assertEqual(
-            set(prepared_request.headers.keys()),
+            set(request.headers.keys()),
             set(['Host', 'Origin', 'Connection', 'Upgrade', 'Sec-WebSocket-Key', 'Sec-WebSocket-Version', 'Foo']))
-        self.assertEqual(prepared_request.headers['Foo'], 'Bar')
-        self.assertEqual(prepared_request.headers['Sec-WebSocket-Key'], 'xxxxxxxxxxxxxx')
+        self.assertEqual(request.headers['Foo'], 'Bar')
+        self.assertEqual(request.headers['Sec-WebSocket-Key'], 'xxxxxxxxxxxxxx')
 
-    def test_get_raw_request_yields_exception(self) -> None:
+    def test_get_handshake_request_as_sent(self) -> None:
         """
-        tests the exception handling
+        tests the request is the one websocket-client sends
         """
+        server = socket.socket()
+        server.bind(('127.0.0.1', 0))
+        server.listen(1)
+        sent: List[bytes] = []
+
+        def accept() -> None:
+            connection, _ = server.accept()
+            with connection:
+                data = b''
+                while not data.endswith(b'\r\n\r\n'):
+                    data += connection.recv(4096)
+                sent.append(data)
+
+        acceptor = threading.Thread(target=accept, daemon=True)
+        acceptor.start()
+        url = 'ws://127.0.0.1:{}/gremlin?x=y'.format(server.getsockname()[1])
+        header = {'Foo': 'Bar', 'Sec-WebSocket-Key': 'dGhlIHNhbXBsZSBub25jZQ=='}
         try:
-            Aws4AuthWebsocketTransport._get_raw_request_for(self.url, class_=None)
-            self.assertEqual("did not raise an exception!", "")
-        except Exception as e:
-            # the particular exception we're causing is a that we passed None to a thing expecting a
-            # constructor/factory/callable
-            self.assertIsInstance(e, TypeError)
-            self.assertEqual(e.args[0].endswith('object is not callable'), True)
+            with self.assertRaises(Exception):
+                create_connection(url, header=header, timeout=5)
+            acceptor.join(5)
+        finally:
+            server.close()
+
+        request_line, *lines = sent[0].decode('utf-8').strip().split('\r\n')
+        request = Aws4AuthWebsocketTransport._get_handshake_request(url, header=header, timeout=5)
+        self.assertEqual(request_line, 'GET {} HTTP/1.1'.format(request.path_url))
+        self.assertEqual(dict([line.split(': ', 1) for line in lines]), dict(request.headers))
+
+    def test_get_handshake_request_invalid_url(self) -> None:
+        with self.assertRaises(ValueError):
+            Aws4AuthWebsocketTransport._get_handshake_request('http://xxxxxnotreallyawsxxxxxxxx.com:8182/gremlin')
 
     def test_make_extra_headers(self) -> None:
         transport = Aws4AuthWebsocketTransport(
@@ -68,3 +98,126 @@ class TestAws4AuthWebsocketTransport(unittest.TestCase):
             set(['Authorization', 'Sec-WebSocket-Version', 'Sec-WebSocket-Key', 'x-amz-content-sha256']))
         self.assertEqual(extra_headers['Sec-WebSocket-Key'], 'test_websocket_key')
         self.assertEqual(extra_headers['Authorization'], 'AWS4-HMAC-SHA256 Credential=test_key/20191113/test_region/neptune-db/aws4_request, SignedHeaders=foo;host;origin;sec-websocket-key;sec-websocket-version;upgrade;x-amz-content-sha256;x-amz-date, Signature=d27dbb7ddf77b0d73eee9df28c635640b7eb320aa8c70c35d17bb39f531044ba')  # noqa: E501
+
+
+def _request(request_id: str) -> bytes:
+    return b'\x10application/json' + json.dumps({
+        'requestId': {'@type': 'g:UUID', '@value': request_id}, 'op': 'bytecode', 'processor': 'traversal',
+        'args': {}}).encode('utf-8')
+
+
+def _response(request_id: str, code: int = 200) -> bytes:
+    return json.dumps({
+        'requestId': request_id, 'status': {'message': '', 'code': code, 'attributes': {}},
+        'result': {'data': [], 'meta': {}}}).encode('utf-8')
+
+
+class _ServerStandIn(WebsocketClientTransport):
+    """
+    a websocket whose requests are collected, and whose responses are whatever the test puts
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests: queue.Queue = queue.Queue()
+        self.responses: queue.Queue = queue.Queue()
+
+    def connect(self, url: str, headers: Optional[Mapping[str, Any]] = None) -> None:
+        self.url = url
+
+    def write(self, message: Union[str, bytes]) -> None:
+        self.requests.put(message)
+
+    def read(self) -> Union[str, bytes]:
+        response = self.responses.get()
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self) -> None:
+        self.responses.put(RuntimeError('connection is closed!'))
+
+
+class TestWebsocketMultiplexer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.websockets: List[_ServerStandIn] = []
+
+    def _websocket(self) -> _ServerStandIn:
+        websocket = _ServerStandIn()
+        self.websockets.append(websocket)
+        return websocket
+
+    def _connected(self, multiplexer: WebsocketMultiplexer) -> Any:
+        transport = multiplexer.transport()
+        transport.connect('ws://localhost:8182/gremlin')
+        return transport
+
+    def test_responses_out_of_order(self) -> None:
+        multiplexer = WebsocketMultiplexer(transport_factory=self._websocket)
+        transport_1, transport_2 = self._connected(multiplexer), self._connected(multiplexer)
+        transport_1.write(_request('a'))
+        transport_2.write(_request('b'))
+        self.assertEqual(len(self.websockets), 1)
+        websocket = self.websockets[0]
+        self.assertEqual([websocket.requests.get(timeout=1), websocket.requests.get(timeout=1)],
+                         [_request('a'), _request('b')])
+
+        websocket.responses.put(_response('b'))
+        websocket.responses.put(_response('a', 206))
+        websocket.responses.put(_response('a'))
+        self.assertEqual(transport_2.read(), _response('b'))
+        self.assertEqual(transport_1.read(), _response('a', 206))
+        self.assertEqual(transport_1.read(), _response('a'))
+
+    def test_max_in_flight(self) -> None:
+        multiplexer = WebsocketMultiplexer(max_in_flight=1, transport_factory=self._websocket)
+        transport_1, transport_2 = self._connected(multiplexer), self._connected(multiplexer)
+        transport_1.write(_request('a'))
+        writer = threading.Thread(target=transport_2.write, args=(_request('b'),), daemon=True)
+        writer.start()
+        writer.join(0.1)
+        self.assertTrue(writer.is_alive())
+        websocket = self.websockets[0]
+        self.assertEqual(websocket.requests.qsize(), 1)
+
+        websocket.responses.put(_response('a'))
+        self.assertEqual(transport_1.read(), _response('a'))
+        writer.join(1)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(websocket.requests.qsize(), 2)
+
+    def test_num_connections(self) -> None:
+        multiplexer = WebsocketMultiplexer(num_connections=2, transport_factory=self._websocket)
+        self.assertEqual(multiplexer.max_requests_in_flight, 32)
+        for request_id in ('a', 'b', 'c', 'd'):
+            self._connected(multiplexer).write(_request(request_id))
+        self.assertEqual(len(self.websockets), 2)
+        self.assertEqual([websocket.requests.qsize() for websocket in self.websockets], [2, 2])
+
+    def test_failure_reconnects(self) -> None:
+        multiplexer = WebsocketMultiplexer(transport_factory=self._websocket)
+        transport_1, transport_2 = self._connected(multiplexer), self._connected(multiplexer)
+        transport_1.write(_request('a'))
+        transport_2.write(_request('b'))
+        self.websockets[0].responses.put(ConnectionResetError('reset by peer'))
+        with self.assertRaises(ConnectionResetError):
+            transport_1.read()
+        with self.assertRaises(ConnectionResetError):
+            transport_2.read()
+
+        transport_1.write(_request('c'))
+        self.assertEqual(len(self.websockets), 2)
+        self.websockets[1].responses.put(_response('c'))
+        self.assertEqual(transport_1.read(), _response('c'))
+
+    def test_close(self) -> None:
+        multiplexer = WebsocketMultiplexer(transport_factory=self._websocket)
+        transport = self._connected(multiplexer)
+        transport.write(_request('a'))
+        transport.close()
+        self.assertTrue(transport.closed())
+        with self.assertRaises(RuntimeError):
+            transport.write(_request('b'))
+
+    def test_invalid(self) -> None:
+        with self.assertRaises(ValueError):
+            WebsocketMultiplexer(num_connections=0)
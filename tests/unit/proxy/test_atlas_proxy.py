@@ -2,21 +2,29 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import copy
+import socket
+import time
 import unittest
+from threading import Event
 from typing import Any, Dict, Optional, cast, List
 
+import requests
 from amundsen_common.models.popular_table import PopularTable
 from amundsen_common.models.table import Column, Statistics, Table, Tag, User, Reader,\
     ProgrammaticDescription, ResourceReport
-from atlasclient.exceptions import BadRequest
+from atlasclient.client import HttpClient
+from atlasclient.exceptions import BadRequest, Conflict, NotFound
+from flask import g
 from unittest.mock import MagicMock, patch
 from tests.unit.proxy.fixtures.atlas_test_data import Data, DottedDict
 
 from metadata_service import create_app
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
+from metadata_service.proxy.atlas_proxy import _ENTITY_MEMO_ATTR, AtlasProxy
 from metadata_service.util import UserResourceRel
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
 
 
 class TestAtlasProxy(unittest.TestCase, Data):
@@ -27,12 +35,16 @@ class TestAtlasProxy(unittest.TestCase, Data):
         self.app_context.push()
 
         with patch('metadata_service.proxy.atlas_proxy.Atlas'):
-            # Importing here to make app context work before
-            # importing `current_app` indirectly using the AtlasProxy
-            from metadata_service.proxy.atlas_proxy import AtlasProxy
             self.proxy = AtlasProxy(host='DOES_NOT_MATTER', port=0000)
             self.proxy._driver = MagicMock()
 
+    def test_config_read_on_init(self) -> None:
+        self.app.config['ATLAS_TABLE_ENTITY'] = 'custom_table'
+        with patch('metadata_service.proxy.atlas_proxy.Atlas'):
+            proxy = AtlasProxy(host='DOES_NOT_MATTER', port=0000)
+        self.assertEqual(proxy.TABLE_ENTITY, 'custom_table')
+        self.assertEqual(self.proxy.TABLE_ENTITY, 'Table')
+
     def to_class(self, entity: Dict) -> Any:
         class ObjectView(object):
             def __init__(self, dictionary: Dict):
@@ -53,6 +65,11 @@ class TestAtlasProxy(unittest.TestCase, Data):
         self.proxy._get_table_entity = MagicMock(return_value=mocked_entity)  # type: ignore
         return mocked_entity
 
+    def _mock_get_table_header(self, entity: Optional[Any] = None) -> Any:
+        header = entity or self.entity1
+        self.proxy._get_table_header = MagicMock(return_value=header)  # type: ignore
+        return header
+
     def _mock_get_bookmark_entity(self, entity: Optional[Any] = None) -> Any:
         entity = entity or self.entity1
         mocked_entity = MagicMock()
@@ -93,6 +110,38 @@ class TestAtlasProxy(unittest.TestCase, Data):
 
         self.assertEqual(ent.__repr__(), unique_attr_response.__repr__())
 
+    def test_get_table_entity_memoized_per_request(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+        self._mock_get_table_header()
+
+        with self.app.app_context(), self.app.test_request_context():
+            ent = self.proxy._get_table_entity(table_uri=self.table_uri)
+            self.assertIs(self.proxy._get_table_entity(table_uri=self.table_uri), ent)
+
+            # changing the tags of the table drops it from the memo
+            self.proxy.add_tag(id=self.table_uri, tag='hive', tag_type='default')
+            self.assertIsNot(self.proxy._get_table_entity(table_uri=self.table_uri), ent)
+
+        with self.app.app_context(), self.app.test_request_context():
+            self.proxy._get_table_entity(table_uri=self.table_uri)
+
+        self.assertEqual(self.proxy._driver.entity_unique_attribute.call_count, 3)
+
+    def test_get_table_entity_memo_handed_over(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(side_effect=lambda *args, **kwargs: MagicMock())
+
+        with self.app.app_context(), self.app.test_request_context():
+            ent = self.proxy._get_table_entity(table_uri=self.table_uri)
+            memo = g.get(_ENTITY_MEMO_ATTR)
+
+        # e.g. a task run on an executor on behalf of the request
+        with self.app.app_context():
+            setattr(g, _ENTITY_MEMO_ATTR, memo)
+            self.assertIs(self.proxy._get_table_entity(table_uri=self.table_uri), ent)
+
+        with self.app.app_context():
+            self.assertIsNot(self.proxy._get_table_entity(table_uri=self.table_uri), ent)
+
     def _create_mocked_report_entities_collection(self) -> None:
         mocked_report_entities_collection = MagicMock()
         mocked_report_entities_collection.entities = []
@@ -166,11 +215,196 @@ class TestAtlasProxy(unittest.TestCase, Data):
         with patch.object(self.proxy, 'STATISTICS_FORMAT_SPEC', statistics_format_spec):
             self._get_table(custom_stats_format=True)
 
+    def test_get_table_columns_paged(self) -> None:
+        columns = []
+        referred_entities = {}
+        for position in (3, 1, 2):
+            column = copy.deepcopy(self.test_column)  # type: Dict[str, Any]
+            column['guid'] = 'COLUMN_GUID_{}'.format(position)
+            column['attributes']['name'] = 'column {}'.format(position)
+            column['attributes']['position'] = position
+            columns.append(column)
+            referred_entities[column['guid']] = column
+        mocked_entity = MagicMock()
+        mocked_entity.entity = {'relationshipAttributes': {'columns': columns}}
+        mocked_entity.referredEntities = referred_entities
+        self.proxy._get_table_entity = MagicMock(return_value=mocked_entity)  # type: ignore
+
+        response = self.proxy.get_table_columns(table_uri=self.table_uri, offset=1, limit=1)
+        self.assertEqual([(column.name, len(column.stats)) for column in response], [('column 2', 2)])
+
+        response = self.proxy.get_table_columns(table_uri=self.table_uri, offset=1, fields=set())
+        self.assertEqual([(column.name, len(column.stats)) for column in response],
+                         [('column 2', 0), ('column 3', 0)])
+
+    def _mock_bulk_tables(self) -> None:
+        table_qn = '{}.{}@{}'.format(self.db, self.name, self.cluster)
+        search_results = MagicMock()
+        search_results.entities = [DottedDict(guid=self.entity1['guid'], attributes={'qualifiedName': table_qn})]
+        self.proxy._driver.search_basic.create = MagicMock(return_value=search_results)
+
+        bulk_entity = DottedDict(copy.deepcopy(self.entity1))
+        bulk_entity['classificationNames'] = ['PII_DATA']
+        del bulk_entity['classifications']
+        collection = MagicMock()
+        collection.entities = [bulk_entity]
+        collection.referredEntities = {self.test_column['guid']: self.test_column}
+        self.proxy._driver.entity_bulk = MagicMock(return_value=[collection])
+        self.proxy._get_owners = MagicMock(return_value=[User(email='dummy@email.com')])  # type: ignore
+
+    def test_get_tables_summary(self) -> None:
+        self._mock_bulk_tables()
+        missing_uri = f'{self.entity_type}://{self.cluster}.{self.db}/MISSING'
+        self.proxy._get_readers = MagicMock()  # type: ignore
+
+        tables = self.proxy.get_tables(table_uris=[missing_uri, self.table_uri, 'not a uri'])
+
+        self.assertIsNone(tables[0])
+        self.assertIsNone(tables[2])
+        table = cast(Table, tables[1])
+        self.assertEqual(table.name, 'Table1')
+        self.assertEqual(table.description, 'Dummy Description')
+        self.assertEqual(table.tags, [Tag(tag_name='PII_DATA', tag_type='default')])
+        self.assertEqual(table.owners, [User(email='dummy@email.com')])
+        self.assertEqual(table.columns, [])
+        self.proxy._get_readers.assert_not_called()
+        self.proxy._driver.entity_bulk.assert_called_once_with(guid=['1'], minExtInfo=True)
+        search_params = self.proxy._driver.search_basic.create.call_args[1]['data']
+        self.assertEqual(search_params['typeName'], self.entity_type)
+        self.assertEqual(len(search_params['entityFilters']['criterion']), 2)
+
+    def test_get_tables_full(self) -> None:
+        self._mock_bulk_tables()
+        self.proxy._get_readers = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_reports = MagicMock(return_value=[])  # type: ignore
+
+        tables = self.proxy.get_tables(table_uris=[self.table_uri], detail_level=TableDetailLevel.Full)
+
+        self.assertEqual(len(cast(Table, tables[0]).columns), self.active_columns)
+        self.proxy._get_readers.assert_called_once()
+        self.proxy._driver.entity_bulk.assert_called_once_with(guid=['1'], minExtInfo=False)
+
+    def test_get_tables_chunked(self) -> None:
+        self.app.config['ATLAS_ENTITY_BULK_CHUNK_SIZE'] = 1
+        other_uri = f'{self.entity_type}://{self.cluster}.{self.db}/other'
+        qns = {'1': f'{self.db}.{self.name}@{self.cluster}', '2': f'{self.db}.other@{self.cluster}'}
+
+        def search(data: Dict) -> Any:
+            table_qn = data['entityFilters']['criterion'][0]['attributeValue']
+            return MagicMock(entities=[DottedDict(guid=guid, attributes={'qualifiedName': qn})
+                                       for guid, qn in qns.items() if qn == table_qn])
+
+        def entity_bulk(guid: List[str], **kwargs: Any) -> List[Any]:
+            bulk_entity = DottedDict(copy.deepcopy(self.entity1))
+            bulk_entity['guid'] = guid[0]
+            bulk_entity['classificationNames'] = []
+            # each table only comes with the columns of its own collection
+            return [MagicMock(entities=[bulk_entity],
+                              referredEntities={self.test_column['guid']: self.test_column})]
+
+        self.proxy._driver.search_basic.create = MagicMock(side_effect=search)
+        self.proxy._driver.entity_bulk = MagicMock(side_effect=entity_bulk)
+        self.proxy._get_owners = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_readers = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_reports = MagicMock(return_value=[])  # type: ignore
+
+        tables = self.proxy.get_tables(table_uris=[self.table_uri, other_uri], detail_level=TableDetailLevel.Full)
+
+        self.assertEqual([len(cast(Table, table).columns) for table in tables], [self.active_columns] * 2)
+        self.assertEqual(self.proxy._driver.search_basic.create.call_count, 2)
+        self.assertCountEqual([call[1]['guid'] for call in self.proxy._driver.entity_bulk.call_args_list],
+                              [['1'], ['2']])
+
     def test_get_table_not_found(self) -> None:
         with self.assertRaises(NotFoundException):
             self.proxy._driver.entity_unique_attribute = MagicMock(side_effect=Exception('Boom!'))
             self.proxy.get_table(table_uri=self.table_uri)
 
+    def test_get_table_lookup_timeout(self) -> None:
+        self.app.config['ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC'] = 0.1
+        release = Event()
+        self._mock_get_table_entity()
+        self.proxy._get_owners = MagicMock(return_value=[User(email='owner@example.com')])  # type: ignore
+        self.proxy._get_reports = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_readers = MagicMock(side_effect=lambda *args: release.wait(5))  # type: ignore
+
+        try:
+            response = self.proxy.get_table(table_uri=self.table_uri)
+        finally:
+            release.set()
+
+        self.assertEqual(response.table_readers, [])
+        self.assertEqual(response.owners, [User(email='owner@example.com')])
+
+    def test_get_table_slow_lookup_frees_executor(self) -> None:
+        self.app.config['ATLAS_GET_TABLE_LOOKUP_TIMEOUT_SEC'] = 0.2
+        with patch('metadata_service.proxy.atlas_proxy.Atlas'):
+            self.proxy = AtlasProxy(host='DOES_NOT_MATTER', port=0000, pool_maxsize=1)
+        self.proxy._driver = MagicMock()
+        self._mock_get_table_entity()
+        # accepts connections (in its backlog) but never answers them
+        atlas = socket.socket()
+        atlas.bind(('127.0.0.1', 0))
+        atlas.listen(8)
+        session = requests.Session()
+        session.mount('http://', self.proxy._http_adapter)
+        url = 'http://127.0.0.1:{}/api/atlas/v2/entity/bulk'.format(atlas.getsockname()[1])
+        self.proxy._get_owners = MagicMock(return_value=[User(email='owner@example.com')])  # type: ignore
+        self.proxy._get_reports = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_readers = MagicMock(side_effect=lambda *args: session.get(url, timeout=30))  # type: ignore
+
+        try:
+            slow = self.proxy.get_table(table_uri=self.table_uri)
+            self.proxy._get_readers = MagicMock(return_value=[])  # type: ignore
+            start = time.time()
+            response = self.proxy.get_table(table_uri=self.table_uri)
+        finally:
+            atlas.close()
+
+        self.assertEqual(slow.table_readers, [])
+        # the readers lookup timing out did not keep the only thread of the executor
+        self.assertEqual(response.owners, [User(email='owner@example.com')])
+        self.assertLess(time.time() - start, 0.2)
+
+    def test_get_entities_by_guids(self) -> None:
+        self.app.config['ATLAS_ENTITY_BULK_CHUNK_SIZE'] = 2
+
+        def entity_bulk(guid: List[str], **kwargs: Any) -> List[Any]:
+            if 'c' in guid:
+                raise Exception('Atlas unavailable')
+            return [MagicMock(entities=list(guid))]
+
+        self.proxy._driver.entity_bulk = MagicMock(side_effect=entity_bulk)
+
+        entities = list(self.proxy._get_entities_by_guids(['a', 'b', 'c', 'd', 'e'], ignoreRelationships=True))
+
+        # the chunk which failed is left out
+        self.assertEqual(entities, ['a', 'b', 'e'])
+        self.assertCountEqual([call[1] for call in self.proxy._driver.entity_bulk.call_args_list],
+                              [{'guid': ['a', 'b'], 'ignoreRelationships': True},
+                               {'guid': ['c', 'd'], 'ignoreRelationships': True},
+                               {'guid': ['e'], 'ignoreRelationships': True}])
+
+    def test_get_entities_by_guids_all_chunks_fail(self) -> None:
+        self.app.config['ATLAS_ENTITY_BULK_CHUNK_SIZE'] = 2
+        self.proxy._driver.entity_bulk = MagicMock(side_effect=Exception('Atlas unavailable'))
+
+        with self.assertRaises(Exception):
+            list(self.proxy._get_entities_by_guids(['a', 'b', 'c']))
+
+    def test_get_table_lookups_share_request_memo(self) -> None:
+        self._mock_get_table_entity()
+        memos = []  # type: List[Any]
+        self.proxy._get_owners = MagicMock(  # type: ignore
+            side_effect=lambda *args, **kwargs: memos.append(self.proxy._get_entity_memo()) or [])
+        self.proxy._get_reports = MagicMock(return_value=[])  # type: ignore
+        self.proxy._get_readers = MagicMock(return_value=[])  # type: ignore
+
+        with self.app.app_context(), self.app.test_request_context():
+            self.proxy.get_table(table_uri=self.table_uri)
+
+            self.assertIs(memos[0], g.get(_ENTITY_MEMO_ATTR))
+
     def test_get_table_missing_info(self) -> None:
         with self.assertRaises(BadRequest):
             local_entity = copy.deepcopy(self.entity1)
@@ -207,15 +441,46 @@ class TestAtlasProxy(unittest.TestCase, Data):
             self.assertEqual(expected.__repr__(), response.__repr__())
 
     def test_get_table_description(self) -> None:
-        self._mock_get_table_entity()
+        self._mock_get_table_header()
         response = self.proxy.get_table_description(table_uri=self.table_uri)
         attributes = cast(dict, self.entity1['attributes'])
         self.assertEqual(response, attributes['description'])
+        self.proxy._get_table_header.assert_called_with(table_uri=self.table_uri)  # type: ignore
 
     def test_put_table_description(self) -> None:
-        self._mock_get_table_entity()
+        self._mock_get_table_header()
         self.proxy.put_table_description(table_uri=self.table_uri,
                                          description="DOESNT_MATTER")
+        self.proxy._driver.client.put.assert_called_with(
+            '{}/api/atlas/v2/entity/guid/{}'.format(self.proxy._driver.base_url, self.entity1['guid']),
+            params={'name': 'description'}, data='DOESNT_MATTER')
+
+    def test_put_table_description_sent_once_encoded(self) -> None:
+        self._mock_get_table_header()
+        client = HttpClient(host='http://DOES_NOT_MATTER', username='admin', password='', identifier='test')
+        client.session = MagicMock()
+        client.session.put.return_value = MagicMock(status_code=204, content=b'', text='', headers={})
+        self.proxy._driver.client = client
+        self.proxy.put_table_description(table_uri=self.table_uri, description='hello')
+        self.assertEqual(client.session.put.call_args[1]['data'], '"hello"')
+
+    def test_get_table_header(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=self.entity1))
+
+        response = self.proxy._get_table_header(table_uri=self.table_uri)
+
+        self.assertEqual(response, self.entity1)
+        # read from the entity store rather than the search index, which lags behind writes
+        self.proxy._driver.entity_unique_attribute.assert_called_once_with(
+            self.entity_type, qualifiedName=f'{self.db}.{self.name}@{self.cluster}',
+            minExtInfo=True, ignoreRelationships=True)
+        self.proxy._driver.search_basic.create.assert_not_called()
+
+    def test_get_table_header_not_found(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=None))
+
+        with self.assertRaises(NotFoundException):
+            self.proxy._get_table_header(table_uri=self.table_uri)
 
     def test_get_tags(self) -> None:
         tag_response = {
@@ -237,7 +502,7 @@ class TestAtlasProxy(unittest.TestCase, Data):
 
     def test_add_tag(self) -> None:
         tag = "TAG"
-        self._mock_get_table_entity()
+        self._mock_get_table_header()
 
         with patch.object(self.proxy._driver.entity_bulk_classification, 'create') as mock_execute:
             self.proxy.add_tag(id=self.table_uri, tag=tag, tag_type='default')
@@ -247,7 +512,7 @@ class TestAtlasProxy(unittest.TestCase, Data):
 
     def test_delete_tag(self) -> None:
         tag = "TAG"
-        self._mock_get_table_entity()
+        self._mock_get_table_header()
         mocked_entity = MagicMock()
         self.proxy._driver.entity_guid = MagicMock(return_value=mocked_entity)
 
@@ -258,7 +523,7 @@ class TestAtlasProxy(unittest.TestCase, Data):
     def test_add_owner(self) -> None:
         owner = "OWNER"
         user_guid = 123
-        self._mock_get_table_entity()
+        self._mock_get_table_header()
         self.proxy._driver.entity_post = MagicMock()
         self.proxy._driver.entity_post.create = MagicMock(return_value={"guidAssignments": {user_guid: user_guid}})
 
@@ -270,6 +535,40 @@ class TestAtlasProxy(unittest.TestCase, Data):
                       'end2': {'guid': user_guid, 'typeName': 'User'}}
             )
 
+    def test_delete_owner(self) -> None:
+        table_header = copy.deepcopy(self.entity1)
+        table_header['relationshipAttributes']['ownedBy'][0]['relationshipGuid'] = 'relationship_guid'
+        self._mock_get_table_header(table_header)
+        self.proxy._guid_index.put(('entity', 'User', 'active_owned_by'), '000')
+        self.proxy._driver.relationship_guid = MagicMock()
+
+        self.proxy.delete_owner(table_uri=self.table_uri, owner='active_owned_by')
+
+        self.proxy._get_table_header.assert_called_once_with(  # type: ignore
+            table_uri=self.table_uri, ignore_relationships=False)
+        self.proxy._driver.relationship_guid.assert_called_once_with('relationship_guid')
+        self.proxy._driver.relationship_guid.return_value.delete.assert_called_once_with()
+
+    def test_delete_owner_stale_guid(self) -> None:
+        self._mock_get_table_header()
+        self.proxy._guid_index.put(('entity', 'User', 'active_owned_by'), 'stale_guid')
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity={'guid': '000'}))
+        self.proxy._driver.relationship_guid = MagicMock()
+
+        self.proxy.delete_owner(table_uri=self.table_uri, owner='active_owned_by')
+
+        self.proxy._driver.relationship_guid.return_value.delete.assert_called_once_with()
+        self.assertEqual(self.proxy._guid_index.get(('entity', 'User', 'active_owned_by')), '000')
+
+    def test_delete_owner_not_owner(self) -> None:
+        self._mock_get_table_header()
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity={'guid': '111'}))
+        self.proxy._driver.relationship_guid = MagicMock()
+
+        with self.assertRaises(BadRequest):
+            self.proxy.delete_owner(table_uri=self.table_uri, owner='deleted_owned_by')
+        self.proxy._driver.relationship_guid.assert_not_called()
+
     def test_get_column(self) -> None:
         self._mock_get_table_entity()
         response = self.proxy._get_column(
@@ -297,12 +596,108 @@ class TestAtlasProxy(unittest.TestCase, Data):
             column_name=attributes['name'])
         self.assertEqual(response, attributes.get('description'))
 
+    def test_get_column_description_indexed(self) -> None:
+        self._mock_get_table_entity()
+        attributes = cast(dict, self.test_column['attributes'])
+        table_qn = self.proxy._table_guid_key(self.table_uri)[2]
+        self.proxy._guid_index.put(('column', table_qn, attributes['name']), self.test_column['guid'])
+        self.proxy._driver.entity_bulk = MagicMock(return_value=[
+            MagicMock(entities=[DottedDict(guid=self.test_column['guid'], status='ACTIVE',
+                                           attributes={'description': 'Indexed Description'})])])
+
+        response = self.proxy.get_column_description(table_uri=self.table_uri, column_name=attributes['name'])
+
+        self.assertEqual(response, 'Indexed Description')
+        self.proxy._driver.entity_bulk.assert_called_once_with(guid=[self.test_column['guid']], minExtInfo=True,
+                                                               ignoreRelationships=True)
+        self.proxy._get_table_entity.assert_not_called()
+
+    def test_get_column_description_stale_guid(self) -> None:
+        self._mock_get_table_entity()
+        attributes = cast(dict, self.test_column['attributes'])
+        table_qn = self.proxy._table_guid_key(self.table_uri)[2]
+        self.proxy._guid_index.put(('column', table_qn, attributes['name']), 'stale_guid')
+        self.proxy._driver.entity_bulk = MagicMock(return_value=[MagicMock(entities=[])])
+
+        response = self.proxy.get_column_description(table_uri=self.table_uri, column_name=attributes['name'])
+
+        self.assertEqual(response, attributes.get('description'))
+        self.proxy._get_table_entity.assert_called_once()
+
     def test_put_column_description(self) -> None:
         self._mock_get_table_entity()
         attributes = cast(dict, self.test_column['attributes'])
         self.proxy.put_column_description(table_uri=self.table_uri,
                                           column_name=attributes['name'],
                                           description='DOESNT_MATTER')
+        self.proxy._driver.client.put.assert_called_with(
+            '{}/api/atlas/v2/entity/guid/{}'.format(self.proxy._driver.base_url, self.test_column['guid']),
+            params={'name': 'description'}, data='DOESNT_MATTER')
+
+    def test_put_column_description_indexed_guid(self) -> None:
+        entity = MagicMock()
+        entity.entity = self.entity1
+        entity.referredEntities = {self.test_column['guid']: self.test_column}
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=entity)
+        column_name = cast(dict, self.test_column['attributes'])['name']
+
+        # reading the table indexes the guids of its columns
+        self.proxy._get_table_entity(table_uri=self.table_uri)
+        self.proxy.put_column_description(table_uri=self.table_uri, column_name=column_name,
+                                          description='DOESNT_MATTER')
+
+        self.assertEqual(self.proxy._driver.entity_unique_attribute.call_count, 1)
+        self.proxy._driver.client.put.assert_called_with(
+            '{}/api/atlas/v2/entity/guid/{}'.format(self.proxy._driver.base_url, self.test_column['guid']),
+            params={'name': 'description'}, data='DOESNT_MATTER')
+
+    def test_add_owner_indexed_guids(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=self.entity1))
+        self.proxy._driver.entity_post.create = MagicMock(return_value={'guidAssignments': {'-1': 'user_guid'}})
+
+        self.proxy.add_owner(table_uri=self.table_uri, owner='OWNER')
+        self.proxy.add_owner(table_uri=self.table_uri, owner='OWNER')
+
+        # the guids of the user and of the table are only looked up once
+        self.proxy._driver.entity_post.create.assert_called_once()
+        self.proxy._driver.entity_unique_attribute.assert_called_once()
+        self.proxy._driver.relationship.create.assert_called_with(
+            data={'typeName': 'DataSet_Users_Owner',
+                  'end1': {'guid': self.entity1['guid'], 'typeName': 'Table'},
+                  'end2': {'guid': 'user_guid', 'typeName': 'User'}})
+
+    def test_put_table_description_stale_guid(self) -> None:
+        self.proxy._guid_index.put(self.proxy._table_guid_key(self.table_uri), 'stale_guid')
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=self.entity1))
+        self.proxy._driver.client.put = MagicMock(side_effect=[NotFound(), None])
+
+        self.proxy.put_table_description(table_uri=self.table_uri, description='DOESNT_MATTER')
+
+        # retried once with the guid of the table entity
+        self.assertEqual([call[0][0].rsplit('/', 1)[-1] for call in self.proxy._driver.client.put.call_args_list],
+                         ['stale_guid', self.entity1['guid']])
+        self.assertEqual(self.proxy._guid_index.get(self.proxy._table_guid_key(self.table_uri)), self.entity1['guid'])
+
+    def test_put_table_description_not_found(self) -> None:
+        self.proxy._guid_index.put(self.proxy._table_guid_key(self.table_uri), 'stale_guid')
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=self.entity1))
+        self.proxy._driver.client.put = MagicMock(side_effect=NotFound())
+
+        with self.assertRaises(NotFoundException):
+            self.proxy.put_table_description(table_uri=self.table_uri, description='DOESNT_MATTER')
+
+        self.assertEqual(self.proxy._driver.client.put.call_count, 2)
+        self.assertIsNone(self.proxy._guid_index.get(self.proxy._table_guid_key(self.table_uri)))
+
+    def test_add_tag_conflict_with_fresh_guid(self) -> None:
+        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=MagicMock(entity=self.entity1))
+        self.proxy._driver.entity_bulk_classification.create = MagicMock(side_effect=Conflict())
+
+        # the guid did not come from the index, so it is not retried: the table already has the tag
+        with self.assertRaises(Conflict):
+            self.proxy.add_tag(id=self.table_uri, tag='TAG', tag_type='default')
+
+        self.proxy._driver.entity_bulk_classification.create.assert_called_once()
 
     def test_get_table_by_user_relation_follow(self) -> None:
         bookmark1 = copy.deepcopy(self.bookmark_entity1)
@@ -319,6 +714,26 @@ class TestAtlasProxy(unittest.TestCase, Data):
 
         self.assertEqual(res, {'table': expected})
 
+    def test_get_table_by_user_relation_follow_page(self) -> None:
+        self.app.config['ATLAS_SEARCH_PAGE_SIZE'] = 2
+        bookmark = self.to_class(copy.deepcopy(self.bookmark_entity1))
+        self.proxy._driver.search_basic.create = MagicMock(side_effect=[MagicMock(entities=[bookmark, bookmark]),
+                                                                        MagicMock(entities=[bookmark])])
+
+        res = self.proxy.get_table_by_user_relation(user_email='test_user_id',
+                                                    relation_type=UserResourceRel.follow,
+                                                    after=self.table_uri, limit=5)
+
+        self.assertEqual(len(res['table']), 3)
+        # the second page is shorter than requested, there is nothing left to fetch
+        self.assertEqual([(call[1]['data']['offset'], call[1]['data']['limit'])
+                          for call in self.proxy._driver.search_basic.create.call_args_list],
+                         [('0', '2'), ('2', '2')])
+        # only the bookmarks after the one of the last table of the previous page
+        criterion = self.proxy._driver.search_basic.create.call_args[1]['data']['entityFilters']['criterion']
+        bookmark_qn = f'{self.db}.{self.name}.{self.entity_type}.test_user_id.bookmark@{self.cluster}'
+        self.assertIn({'attributeName': 'qualifiedName', 'operator': 'gt', 'attributeValue': bookmark_qn}, criterion)
+
     def test_get_table_by_user_relation_own(self) -> None:
         unique_attr_response = MagicMock()
         unique_attr_response.entity = Data.user_entity_2
@@ -432,22 +847,44 @@ class TestAtlasProxy(unittest.TestCase, Data):
         self.assertEqual(res, expected)
 
     def test_get_frequently_used_tables(self) -> None:
-        entity_unique_attribute_result = MagicMock()
-        entity_unique_attribute_result.entity = DottedDict(self.user_entity_2)
-        self.proxy._driver.entity_unique_attribute = MagicMock(return_value=entity_unique_attribute_result)
-
-        entity_bulk_result = MagicMock()
-        entity_bulk_result.entities = [DottedDict(self.reader_entity_1)]
-        self.proxy._driver.entity_bulk = MagicMock(return_value=[entity_bulk_result])
+        self.app.config['ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC'] = 0
+        reader_entity_2 = copy.deepcopy(self.reader_entity_2)  # type: Dict[str, Any]
+        reader_entity_2['attributes']['entityUri'] = f'{self.entity_type}://{self.cluster}.{self.db}/Table2'
+        # same read count (5) as the first reader, both tables are returned
+        reader_entity_2['attributes']['count'] = 5
+        basic_search_response = MagicMock()
+        basic_search_response.entities = [DottedDict(self.reader_entity_1), DottedDict(reader_entity_2)]
+        self.proxy._driver.search_basic.create = MagicMock(return_value=basic_search_response)
 
         expected = {'table': [PopularTable(cluster=self.cluster,
                                            name='Table1',
                                            schema=self.db,
+                                           database=self.entity_type),
+                              PopularTable(cluster=self.cluster,
+                                           name='Table2',
+                                           schema=self.db,
                                            database=self.entity_type)]}
 
         res = self.proxy.get_frequently_used_tables(user_email='dummy')
 
         self.assertEqual(expected, res)
+        params = self.proxy._driver.search_basic.create.call_args[1]['data']
+        self.assertEqual(params['limit'], 50)
+        self.assertEqual(params['sortOrder'], 'DESCENDING')
+        self.proxy._driver.entity_bulk.assert_not_called()
+
+    def test_get_frequently_used_tables_cached(self) -> None:
+        self.app.config['ATLAS_FREQUENTLY_USED_TABLES_CACHE_TTL_SEC'] = 60
+        self.proxy._CACHE.get_cache('frequently_used_tables', type='memory', expire=60).clear()
+        basic_search_response = MagicMock()
+        basic_search_response.entities = [DottedDict(self.reader_entity_1)]
+        self.proxy._driver.search_basic.create = MagicMock(return_value=basic_search_response)
+
+        first = self.proxy.get_frequently_used_tables(user_email='cached_user')
+        second = self.proxy.get_frequently_used_tables(user_email='cached_user')
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.proxy._driver.search_basic.create.call_count, 1)
 
     def test_get_latest_updated_ts_when_exists(self) -> None:
         with patch.object(self.proxy._driver, 'admin_metrics', self.metrics_data):
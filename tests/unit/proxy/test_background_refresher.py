@@ -0,0 +1,110 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from threading import Event
+from typing import Any, List  # noqa: F401
+
+from flask import current_app
+from unittest.mock import patch
+
+from metadata_service import create_app
+from metadata_service.proxy.background_refresher import BackgroundRefresher
+
+
+class TestBackgroundRefresher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_warms_up_on_start(self) -> None:
+        refresher = BackgroundRefresher(name='test', refresh_fn=lambda: ['foo'], interval_sec=60)
+        try:
+            refresher.start()
+            self.assertEqual(refresher.get(timeout=5), ['foo'])
+            self.assertIsNotNone(refresher.staleness_sec)
+        finally:
+            refresher.stop()
+
+    def test_runs_in_app_context(self) -> None:
+        refresher = BackgroundRefresher(name='test',
+                                        refresh_fn=lambda: current_app.config['PROXY_HOST'],
+                                        interval_sec=60)
+        try:
+            refresher.start()
+            self.assertEqual(refresher.get(timeout=5), self.app.config['PROXY_HOST'])
+        finally:
+            refresher.stop()
+
+    def test_keeps_serving_previous_value_on_failure(self) -> None:
+        values = [['foo'], RuntimeError('boom')]  # type: List[Any]
+
+        def refresh_fn() -> Any:
+            value = values.pop(0)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        refresher = BackgroundRefresher(name='test', refresh_fn=refresh_fn, interval_sec=60)
+        with patch('metadata_service.proxy.background_refresher.statsd_utilities') as mock_statsd:
+            refresher.refresh()
+            refresher.refresh()
+
+            self.assertEqual(refresher.get(), ['foo'])
+            fail_stats = [c[1]['stat'] for c in mock_statsd.incr.call_args_list]
+            self.assertEqual(fail_stats, ['test.refresh_fail'])
+            self.assertEqual(mock_statsd.timing.call_count, 1)
+            self.assertEqual(mock_statsd.gauge.call_args[1]['stat'], 'test.staleness')
+
+    def test_serves_previous_value_while_refreshing(self) -> None:
+        refreshing = Event()
+        release = Event()
+        calls = []  # type: List[int]
+
+        def refresh_fn() -> List[int]:
+            calls.append(len(calls))
+            if len(calls) > 1:
+                refreshing.set()
+                release.wait(5)
+            return list(calls)
+
+        refresher = BackgroundRefresher(name='test', refresh_fn=refresh_fn, interval_sec=0.01)
+        try:
+            refresher.start()
+            self.assertEqual(refresher.get(timeout=5), [0])
+            self.assertTrue(refreshing.wait(5))
+            # the second refresh is in flight, readers get the first ranking without waiting
+            self.assertEqual(refresher.get(timeout=0), [0])
+        finally:
+            refresher.stop()
+            release.set()
+
+    def test_restarts_in_forked_process(self) -> None:
+        refresher = BackgroundRefresher(name='test', refresh_fn=lambda: ['foo'], interval_sec=60)
+        try:
+            refresher.start()
+            self.assertEqual(refresher.get(timeout=5), ['foo'])
+            parent_thread = refresher._thread
+            with patch('metadata_service.proxy.background_refresher.os.getpid', return_value=-1):
+                refresher.get(timeout=5)
+                forked_thread = refresher._thread
+                refresher.get(timeout=5)
+            self.assertIsNot(forked_thread, parent_thread)
+            # only restarted once per process
+            self.assertIs(refresher._thread, forked_thread)
+        finally:
+            refresher.stop()
+
+    def test_get_before_first_refresh_returns_none(self) -> None:
+        refresher = BackgroundRefresher(name='test', refresh_fn=lambda: ['foo'], interval_sec=60)
+        self.assertIsNone(refresher.get(timeout=0))
+        self.assertIsNone(refresher.staleness_sec)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import MagicMock
+
+from amundsen_common.models.table import Column, Table
+
+from metadata_service.entity.mutation import Mutation, MutationStatus, MutationType
+from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.base_proxy import BaseProxy
+
+
+class TestBaseProxy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.proxy = MagicMock(spec=BaseProxy)
+        self.proxy._apply_mutation.side_effect = lambda mutation: BaseProxy._apply_mutation(self.proxy, mutation)
+
+    def test_apply_mutations(self) -> None:
+        self.proxy.add_tag.side_effect = [None, NotFoundException('table bar does not exist')]
+        self.proxy.add_owner.side_effect = RuntimeError('boom')
+
+        results = BaseProxy.apply_mutations(self.proxy, mutations=[
+            Mutation(type=MutationType.AddTag, id='foo', tag='tag'),
+            Mutation(type=MutationType.AddTag, id='bar', tag='tag'),
+            Mutation(type=MutationType.AddOwner, id='foo', owner='owner'),
+            Mutation(type=MutationType.PutDescription, id='dash', description='desc',
+                     resource_type=ResourceType.Dashboard),
+        ])
+
+        self.assertEqual([result.status for result in results],
+                         [MutationStatus.Success, MutationStatus.NotFound, MutationStatus.Failed,
+                          MutationStatus.Success])
+        self.assertEqual(results[1].message, 'table bar does not exist')
+        self.proxy.add_tag.assert_called_with(id='bar', tag='tag', tag_type='default',
+                                              resource_type=ResourceType.Table)
+        self.proxy.put_dashboard_description.assert_called_once_with(id='dash', description='desc')
+
+    def test_apply_mutations_unsupported(self) -> None:
+        with self.assertRaises(ValueError):
+            BaseProxy._apply_mutation(self.proxy, MagicMock(type=None))
+
+        results = BaseProxy.apply_mutations(self.proxy, mutations=[MagicMock(type=None)])
+
+        self.assertEqual(results[0].status, MutationStatus.Failed)
+
+    def test_get_tables(self) -> None:
+        table = Table(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
+                      columns=[Column(name='col', col_type='int', sort_order=0)])
+        self.proxy.get_table.side_effect = [NotFoundException('missing'), table, table]
+
+        summaries = BaseProxy.get_tables(self.proxy, table_uris=['missing', 'foo'])
+        full = BaseProxy.get_tables(self.proxy, table_uris=['foo'], detail_level=TableDetailLevel.Full)
+
+        self.assertIsNone(summaries[0])
+        self.assertEqual(summaries[1].columns, [])  # type: ignore
+        self.assertIs(full[0], table)
+
+
+if __name__ == '__main__':
+    unittest.main()
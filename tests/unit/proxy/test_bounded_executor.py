@@ -0,0 +1,81 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from threading import Event
+from unittest.mock import patch
+
+from flask import current_app, g
+
+from metadata_service import create_app
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.bounded_executor import BoundedExecutor
+
+
+class TestBoundedExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.executor = BoundedExecutor(max_workers=1, name='test_executor')
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+        self.app_context.pop()
+
+    def test_runs_in_own_app_context(self) -> None:
+        g.marker = 'foo'
+        future = self.executor.submit(lambda: (current_app.name, g.get('marker')))
+
+        self.assertEqual(future.result(), (self.app.name, None))
+
+    def test_copies_g_attrs(self) -> None:
+        self.executor.shutdown()
+        self.executor = BoundedExecutor(max_workers=1, name='test_executor', g_attrs=('marker', 'missing'))
+        g.marker = 'foo'
+
+        def update_g() -> tuple:
+            values = (g.marker, 'missing' in g)
+            g.marker = 'bar'
+            return values
+
+        self.assertEqual(self.executor.submit(update_g).result(), ('foo', False))
+        # the task has a g of its own
+        self.assertEqual(g.marker, 'foo')
+
+    def test_propagates_exception(self) -> None:
+        def fail() -> None:
+            raise ValueError('bar')
+
+        self.assertRaises(ValueError, self.executor.submit(fail).result)
+        self.assertEqual(self.executor.active, 0)
+
+    def test_queue_depth(self) -> None:
+        started, release = Event(), Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(5)
+
+        with patch.object(statsd_utilities, 'gauge') as mock_gauge:
+            running = self.executor.submit(block)
+            started.wait(5)
+            queued = self.executor.submit(lambda: None)
+            cancelled = self.executor.submit(lambda: None)
+
+            self.assertEqual(self.executor.active, 1)
+            self.assertEqual(self.executor.queue_depth, 2)
+            mock_gauge.assert_any_call(prefix='metadata_service.proxy.bounded_executor',
+                                       stat='test_executor.queue_depth', value=2)
+
+            self.assertTrue(cancelled.cancel())
+            release.set()
+            running.result()
+            queued.result()
+
+        self.assertEqual(self.executor.queue_depth, 0)
+        self.assertEqual(self.executor.active, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
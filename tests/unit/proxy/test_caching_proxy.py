@@ -0,0 +1,127 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from metadata_service import create_app
+from metadata_service.entity.column_field import ColumnField
+from metadata_service.entity.mutation import Mutation, MutationType
+from metadata_service.entity.resource_type import ResourceType
+from metadata_service.proxy.base_proxy import BaseProxy
+from metadata_service.proxy.caching_proxy import CachingProxy
+
+
+class TestCachingProxy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.wrapped = MagicMock(spec=BaseProxy)
+        self.wrapped.get_table.side_effect = lambda **kwargs: object()
+        self.wrapped.get_dashboard.side_effect = lambda dashboard_uri: object()
+        self.proxy = CachingProxy(proxy=self.wrapped)
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_instantiates_cached_proxy_client(self) -> None:
+        with patch('metadata_service.proxy.caching_proxy.import_string') as mock_import_string:
+            proxy = CachingProxy(host='DOES_NOT_MATTER', port=0000)
+
+            mock_import_string.assert_called_with(self.app.config['CACHED_PROXY_CLIENT'])
+            mock_import_string.return_value.assert_called_with(host='DOES_NOT_MATTER', port=0000)
+            self.assertIs(proxy.proxy, mock_import_string.return_value.return_value)
+
+    def test_caches_reads(self) -> None:
+        table = self.proxy.get_table(table_uri='foo')
+
+        self.assertIs(self.proxy.get_table(table_uri='foo'), table)
+        self.assertIsNot(self.proxy.get_table(table_uri='bar'), table)
+        self.assertIsNot(self.proxy.get_table(table_uri='foo', column_limit=10), table)
+        self.assertIs(self.proxy.get_table(table_uri='foo', column_fields={ColumnField.Badges, ColumnField.Stats}),
+                      self.proxy.get_table(table_uri='foo', column_fields={ColumnField.Stats, ColumnField.Badges}))
+        self.assertEqual(self.wrapped.get_table.call_count, 4)
+
+    def test_does_not_cache_without_ttl(self) -> None:
+        self.proxy = CachingProxy(proxy=self.wrapped, ttls={'get_table': 0})
+
+        self.assertIsNot(self.proxy.get_table(table_uri='foo'), self.proxy.get_table(table_uri='foo'))
+
+    def test_expires_after_ttl(self) -> None:
+        with patch('time.time', return_value=1000):
+            table = self.proxy.get_table(table_uri='foo')
+        with patch('time.time', return_value=1000 + self.app.config['CACHING_PROXY_TTL_SEC']['get_table'] + 1):
+            self.assertIsNot(self.proxy.get_table(table_uri='foo'), table)
+
+    def test_keeps_max_size_results(self) -> None:
+        self.proxy = CachingProxy(proxy=self.wrapped, max_size=3)
+        tables = [self.proxy.get_table(table_uri='table_{}'.format(i)) for i in range(5)]
+        for i in range(20):
+            self.proxy.put_table_description(table_uri='table_4', description=str(i))
+            self.proxy.get_table(table_uri='table_4')
+
+        self.assertEqual(len(self.proxy._entries), 3)
+        self.assertIsNot(self.proxy.get_table(table_uri='table_0'), tables[0])
+
+    def test_forgets_generations_beyond_max_size(self) -> None:
+        self.proxy = CachingProxy(proxy=self.wrapped, max_size=3)
+        table = self.proxy.get_table(table_uri='foo')
+        for i in range(5):
+            self.proxy.put_table_description(table_uri='table_{}'.format(i), description='desc')
+
+        self.assertLessEqual(len(self.proxy._generations), 3)
+        self.assertIsNot(self.proxy.get_table(table_uri='foo'), table)
+
+    def test_mutations_invalidate_resource(self) -> None:
+        mutations = [
+            lambda: self.proxy.put_table_description(table_uri='foo', description='desc'),
+            lambda: self.proxy.add_owner(table_uri='foo', owner='owner'),
+            lambda: self.proxy.delete_owner(table_uri='foo', owner='owner'),
+            lambda: self.proxy.put_column_description(table_uri='foo', column_name='col', description='desc'),
+            lambda: self.proxy.add_tag(id='foo', tag='tag', tag_type='default', resource_type=ResourceType.Table),
+            lambda: self.proxy.delete_tag(id='foo', tag='tag', tag_type='default', resource_type=ResourceType.Table),
+            lambda: self.proxy.add_badge(id='foo', badge_name='badge', category='table_status',
+                                         resource_type=ResourceType.Table),
+            lambda: self.proxy.delete_badge(id='foo', badge_name='badge', category='table_status',
+                                            resource_type=ResourceType.Table),
+            lambda: self.proxy.apply_mutations(mutations=[Mutation(type=MutationType.AddTag, id='foo', tag='tag')]),
+        ]
+        for mutation in mutations:
+            table, table_page = self.proxy.get_table(table_uri='foo'), self.proxy.get_table(table_uri='foo',
+                                                                                            column_limit=1)
+            other_table = self.proxy.get_table(table_uri='bar')
+
+            mutation()
+
+            self.assertIsNot(self.proxy.get_table(table_uri='foo'), table)
+            self.assertIsNot(self.proxy.get_table(table_uri='foo', column_limit=1), table_page)
+            self.assertIs(self.proxy.get_table(table_uri='bar'), other_table)
+
+    def test_dashboard_mutations_invalidate_dashboard(self) -> None:
+        table, dashboard = self.proxy.get_table(table_uri='foo'), self.proxy.get_dashboard('foo')
+
+        self.proxy.add_tag(id='foo', tag='tag', tag_type='default', resource_type=ResourceType.Dashboard)
+
+        self.assertIsNot(self.proxy.get_dashboard('foo'), dashboard)
+        self.assertIs(self.proxy.get_table(table_uri='foo'), table)
+        self.wrapped.get_dashboard.assert_called_with('foo')
+
+    def test_bulk_mutations_invalidate_tags(self) -> None:
+        self.proxy.get_tags()
+        self.proxy.apply_mutations(mutations=[Mutation(type=MutationType.AddTag, id='foo', tag='tag')])
+        self.proxy.get_tags()
+
+        self.assertEqual(self.wrapped.get_tags.call_count, 2)
+
+    def test_failed_mutation_invalidates(self) -> None:
+        table = self.proxy.get_table(table_uri='foo')
+        self.wrapped.add_owner.side_effect = RuntimeError('partially applied')
+
+        self.assertRaises(RuntimeError, self.proxy.add_owner, table_uri='foo', owner='owner')
+        self.assertIsNot(self.proxy.get_table(table_uri='foo'), table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import unittest
+from typing import Any, List, Union  # noqa: F401
+from unittest.mock import patch
+
+from amundsen_common.models.popular_table import PopularTable
+from amundsen_common.models.table import (Application, Badge, Column, ProgrammaticDescription, Reader, Source,
+                                          Statistics, Table, Tag, User, Watermark)
+from gremlin_python.driver.protocol import GremlinServerError
+from gremlin_python.driver.remote_connection import RemoteConnection, RemoteTraversal
+from gremlin_python.process.traversal import Bytecode, Traverser
+
+from metadata_service import create_app
+from metadata_service.entity.column_field import ColumnField
+from metadata_service.entity.tag_detail import TagDetail
+from metadata_service.exception import NotFoundException
+from metadata_service.proxy.gremlin_proxy import AbstractGremlinProxy
+from metadata_service.proxy.neptune_proxy import _is_neptune_concurrent_modification_exception
+
+
+class _GremlinServerStandIn(RemoteConnection):
+    """
+    Stands in for a Gremlin Server: records the bytecode of each traversal submitted (one round trip each) and answers
+    it with the next of the given results, or fails with it when it is an exception
+    """
+
+    def __init__(self, *results: Union[List[Any], Exception]) -> None:
+        super().__init__('ws://stand-in:8182/gremlin', 'g')
+        self.results = list(results)
+        self.submitted = []  # type: List[Bytecode]
+
+    def submit(self, bytecode: Bytecode) -> RemoteTraversal:
+        self.submitted.append(bytecode)
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return RemoteTraversal(iter([Traverser(item) for item in result]), None)
+
+
+class _RetryingGremlinProxy(AbstractGremlinProxy):
+    @classmethod
+    def _is_retryable_exception(cls, *, method_name: str, exception: Exception) -> bool:
+        return _is_neptune_concurrent_modification_exception(exception)
+
+    def get_table_description(self, *, table_uri: str) -> Union[str, None]:
+        # calls another retried method, only the outermost call is retried
+        return super().get_table_description(table_uri=table_uri)
+
+
+def _concurrent_modification() -> GremlinServerError:
+    return GremlinServerError(dict(code=500, attributes={},
+                                   message=json.dumps(dict(code='ConcurrentModificationException'))))
+
+
+def _steps(bytecode: Bytecode) -> List[str]:
+    return [instruction[0] for instruction in bytecode.step_instructions]
+
+
+class TestGremlinProxy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.table_uri = 'hive://gold.test_schema/test_table'
+        self.table_record = {
+            'database': ['hive'],
+            'cluster': ['gold'],
+            'schema': ['test_schema'],
+            'name': ['test_table'],
+            'tbl': {'key': [self.table_uri], 'name': ['test_table'], 'is_view': [False]},
+            'tbl_dscrpt': ['test table description'],
+            'col_records': [
+                {'col': {'name': ['col_id2'], 'type': ['bigint'], 'sort_order': [1]},
+                 'col_dscrpt': [],
+                 'col_stats': [],
+                 'col_badges': [{'key': ['primary key'], 'category': ['column']}]},
+                {'col': {'name': ['col_id1'], 'type': ['bigint'], 'sort_order': [0]},
+                 'col_dscrpt': ['col_id1 description'],
+                 'col_stats': [{'stat_name': ['avg'], 'stat_val': ['1'], 'start_epoch': ['1'], 'end_epoch': ['1']}],
+                 'col_badges': []},
+            ],
+            'readers': [{'user': {'email': ['tester@example.com']}, 'read_count': 5}],
+            'wmk_records': [{'key': ['hive://gold.test_schema/test_table/high_watermark/'],
+                             'partition_key': ['ds'], 'partition_value': ['fake_value'],
+                             'create_time': ['fake_time']}],
+            'application': [{'application_url': ['airflow_host/admin/airflow/tree?dag_id=test_table'],
+                             'description': ['DAG generating a table'],
+                             'name': ['Airflow'], 'id': ['dag/task_id']}],
+            'last_updated_timestamp': [1],
+            'owner_records': [{'key': ['tester@example.com'], 'email': ['tester@example.com']}],
+            'tag_records': [{'key': ['test'], 'tag_type': ['default']}],
+            'badge_records': [{'key': ['golden'], 'category': ['table_status']}],
+            'src': [{'source': ['/source_file_loc'], 'source_type': ['github']}],
+            'prog_descriptions': [{'description_source': ['s3_crawler'], 'description': ['Test']}],
+        }
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def _proxy(self, *results: Union[List[Any], Exception]) -> AbstractGremlinProxy:
+        self.server = _GremlinServerStandIn(*results)
+        return AbstractGremlinProxy(key_property_name='key', remote_connection=self.server)
+
+    def test_get_table(self) -> None:
+        table = self._proxy([self.table_record]).get_table(table_uri=self.table_uri)
+
+        expected = Table(database='hive', cluster='gold', schema='test_schema', name='test_table',
+                         tags=[Tag(tag_name='test', tag_type='default')],
+                         badges=[Badge(badge_name='golden', category='table_status')],
+                         description='test table description',
+                         columns=[Column(name='col_id1', description='col_id1 description', col_type='bigint',
+                                         sort_order=0, stats=[Statistics(stat_type='avg', stat_val='1',
+                                                                         start_epoch=1, end_epoch=1)],
+                                         badges=[]),
+                                  Column(name='col_id2', description=None, col_type='bigint', sort_order=1,
+                                         stats=[], badges=[Badge(badge_name='primary key', category='column')])],
+                         owners=[User(email='tester@example.com')],
+                         table_readers=[Reader(user=User(email='tester@example.com'), read_count=5)],
+                         watermarks=[Watermark(watermark_type='high_watermark', partition_key='ds',
+                                               partition_value='fake_value', create_time='fake_time')],
+                         table_writer=Application(application_url='airflow_host/admin/airflow/tree?dag_id=test_table',
+                                                  description='DAG generating a table', name='Airflow',
+                                                  id='dag/task_id'),
+                         last_updated_timestamp=1,
+                         source=Source(source='/source_file_loc', source_type='github'),
+                         is_view=False,
+                         programmatic_descriptions=[ProgrammaticDescription(source='s3_crawler', text='Test')])
+        self.assertEqual(str(table), str(expected))
+
+        # columns, owners, tags, readers... all come back with the table
+        self.assertEqual(len(self.server.submitted), 1)
+        self.assertEqual(_steps(self.server.submitted[0])[:3], ['V', 'has', 'project'])
+        self.assertEqual(self.server.submitted[0].step_instructions[1], ['has', 'Table', 'key', self.table_uri])
+
+    def test_get_table_without_relations(self) -> None:
+        table_record = dict(self.table_record, tbl_dscrpt=[], col_records=[], readers=[], wmk_records=[],
+                            application=[], last_updated_timestamp=[], owner_records=[], tag_records=[],
+                            badge_records=[], src=[], prog_descriptions=[])
+
+        table = self._proxy([table_record]).get_table(table_uri=self.table_uri)
+
+        self.assertEqual(table.name, 'test_table')
+        self.assertIsNone(table.description)
+        self.assertIsNone(table.table_writer)
+        self.assertIsNone(table.source)
+        self.assertEqual((table.columns, table.owners, table.tags), ([], [], []))
+
+    def test_get_table_not_found(self) -> None:
+        with self.assertRaises(NotFoundException):
+            self._proxy([]).get_table(table_uri=self.table_uri)
+
+    def test_get_table_columns(self) -> None:
+        columns = self._proxy([{'col_records': self.table_record['col_records']}]).get_table_columns(
+            table_uri=self.table_uri, offset=10, limit=2, fields={ColumnField.Badges})
+
+        self.assertEqual([column.name for column in columns], ['col_id1', 'col_id2'])
+        self.assertEqual(len(self.server.submitted), 1)
+        column_records = self.server.submitted[0].step_instructions[3][1]
+        self.assertIn(['range', 10, 12], column_records.step_instructions)
+
+    def test_get_table_description(self) -> None:
+        description = self._proxy(['test table description']).get_table_description(table_uri=self.table_uri)
+
+        self.assertEqual(description, 'test table description')
+        self.assertEqual(len(self.server.submitted), 1)
+
+    def test_get_column_description(self) -> None:
+        proxy = self._proxy(['col_id1 description'], [])
+
+        self.assertEqual(proxy.get_column_description(table_uri=self.table_uri, column_name='col_id1'),
+                         'col_id1 description')
+        self.assertIsNone(proxy.get_column_description(table_uri=self.table_uri, column_name='col_id2'))
+        self.assertEqual(len(self.server.submitted), 2)
+
+    def test_get_tags(self) -> None:
+        tags = self._proxy([{'tag_name': 'tag_1', 'tag_count': 3},
+                            {'tag_name': 'tag_2', 'tag_count': 0}]).get_tags()
+
+        self.assertEqual(tags, [TagDetail(tag_name='tag_1', tag_count=3), TagDetail(tag_name='tag_2', tag_count=0)])
+        self.assertEqual(len(self.server.submitted), 1)
+
+    def test_get_popular_tables(self) -> None:
+        popular_tables = self._proxy([
+            {'database': ['hive'], 'cluster': ['gold'], 'schema': ['foo_schema'], 'name': ['foo_table'],
+             'description': ['foo description']},
+            {'database': ['hive'], 'cluster': ['gold'], 'schema': ['bar_schema'], 'name': ['bar_table'],
+             'description': []},
+        ]).get_popular_tables(num_entries=2)
+
+        self.assertEqual(popular_tables, [
+            PopularTable(database='hive', cluster='gold', schema='foo_schema', name='foo_table',
+                         description='foo description'),
+            PopularTable(database='hive', cluster='gold', schema='bar_schema', name='bar_table', description=None),
+        ])
+        # ranked and described in the same traversal
+        self.assertEqual(len(self.server.submitted), 1)
+        steps = _steps(self.server.submitted[0])
+        self.assertLess(steps.index('limit'), steps.index('select'))
+        self.assertIn(['limit', 2], self.server.submitted[0].step_instructions)
+
+    def test_retry(self) -> None:
+        self.server = _GremlinServerStandIn(_concurrent_modification(), _concurrent_modification(), ['description'])
+        proxy = _RetryingGremlinProxy(key_property_name='key', remote_connection=self.server)
+
+        with patch('metadata_service.proxy.gremlin_proxy.time.sleep') as mock_sleep, \
+                patch('metadata_service.proxy.gremlin_proxy.statsd_utilities') as mock_statsd:
+            description = proxy.get_table_description(table_uri=self.table_uri)
+
+        self.assertEqual(description, 'description')
+        self.assertEqual(len(self.server.submitted), 3)
+        # full jitter: between 0 and base delay * 2 ** retry
+        (first_delay,), _ = mock_sleep.call_args_list[0]
+        (second_delay,), _ = mock_sleep.call_args_list[1]
+        self.assertTrue(0 <= first_delay <= 0.1 and 0 <= second_delay <= 0.2)
+        self.assertEqual(mock_statsd.incr.call_count, 2)
+        mock_statsd.incr.assert_called_with(prefix=__name__, stat='get_table_description.retry')
+
+    def test_retry_deadline(self) -> None:
+        self.app.config['GREMLIN_RETRY_DEADLINE_SEC'] = 0
+        self.server = _GremlinServerStandIn(_concurrent_modification(), ['description'])
+        proxy = _RetryingGremlinProxy(key_property_name='key', remote_connection=self.server)
+
+        with patch('metadata_service.proxy.gremlin_proxy.statsd_utilities') as mock_statsd, \
+                self.assertRaises(GremlinServerError):
+            proxy.get_table_description(table_uri=self.table_uri)
+
+        self.assertEqual(len(self.server.submitted), 1)
+        mock_statsd.incr.assert_called_once_with(prefix=__name__, stat='get_table_description.retry_exhausted')
+
+    def test_not_retryable(self) -> None:
+        error = GremlinServerError(dict(code=500, attributes={}, message=json.dumps(dict(code='InternalFailure'))))
+        self.server = _GremlinServerStandIn(error, ['description'])
+        proxy = _RetryingGremlinProxy(key_property_name='key', remote_connection=self.server)
+
+        with self.assertRaises(GremlinServerError):
+            proxy.get_table_description(table_uri=self.table_uri)
+        self.assertEqual(len(self.server.submitted), 1)
+        # nor by default
+        with self.assertRaises(GremlinServerError):
+            self._proxy(_concurrent_modification()).get_tags()
+        self.assertEqual(len(self.server.submitted), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
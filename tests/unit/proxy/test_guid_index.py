@@ -0,0 +1,55 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import patch
+
+from metadata_service import create_app
+from metadata_service.proxy.guid_index import GuidIndex
+
+
+class TestGuidIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_lru_bounds(self) -> None:
+        index = GuidIndex(ttl_sec=60, max_size=2)
+        index.put('a', 'guid_a')
+        index.put('b', 'guid_b')
+        # 'a' becomes the most recently used key, 'b' is dropped to make room for 'c'
+        self.assertEqual(index.get('a'), 'guid_a')
+        index.put('c', 'guid_c')
+
+        self.assertIsNone(index.get('b'))
+        self.assertEqual(index.get('c'), 'guid_c')
+        self.assertEqual(len(index), 2)
+
+    def test_ttl(self) -> None:
+        index = GuidIndex(ttl_sec=60, max_size=10)
+        with patch('metadata_service.proxy.guid_index.time.time', return_value=1000):
+            index.put('a', 'guid_a')
+        with patch('metadata_service.proxy.guid_index.time.time', return_value=1059):
+            self.assertEqual(index.get('a'), 'guid_a')
+        with patch('metadata_service.proxy.guid_index.time.time', return_value=1060):
+            self.assertIsNone(index.get('a'))
+
+    def test_invalidate(self) -> None:
+        index = GuidIndex(ttl_sec=60, max_size=10)
+        index.put('a', 'guid_a')
+        index.put('b', 'guid_b')
+
+        index.invalidate('a', 'unknown')
+
+        self.assertIsNone(index.get('a'))
+        self.assertEqual(index.get('b'), 'guid_b')
+
+    def test_disabled(self) -> None:
+        index = GuidIndex(ttl_sec=0, max_size=10)
+        index.put('a', 'guid_a')
+
+        self.assertIsNone(index.get('a'))
@@ -4,27 +4,81 @@
 import copy
 import textwrap
 import unittest
-from typing import Any, Dict  # noqa: F401
+from threading import Event
+from typing import Any, Dict, List, Optional, Tuple, cast  # noqa: F401
 
 from amundsen_common.models.dashboard import DashboardSummary
 from amundsen_common.models.popular_table import PopularTable
-from amundsen_common.models.table import (Application, Column, Source,
+from amundsen_common.models.table import (Application, Column, Reader, Source,
                                           Statistics, Table, Tag, Badge, User,
                                           Watermark, ProgrammaticDescription)
 from amundsen_common.models.user import UserSchema
 from unittest.mock import MagicMock, patch
-from neo4j import GraphDatabase
+import neo4j
+from neo4j import READ_ACCESS, WRITE_ACCESS, GraphDatabase
 
 from metadata_service import create_app
+from metadata_service.entity.column_field import ColumnField
 from metadata_service.entity.dashboard_detail import DashboardDetail
 from metadata_service.entity.dashboard_query import DashboardQuery
+from metadata_service.entity.mutation import Mutation, MutationStatus, MutationType
 from metadata_service.entity.resource_type import ResourceType
+from metadata_service.entity.table_detail_level import TableDetailLevel
 from metadata_service.entity.tag_detail import TagDetail
 from metadata_service.exception import NotFoundException
 from metadata_service.proxy.neo4j_proxy import Neo4jProxy
 from metadata_service.util import UserResourceRel
 
 
+def _mock_write_transaction(mock_session: MagicMock) -> MagicMock:
+    """
+    Makes write_transaction of mock_session run its unit of work in the returned mock transaction
+    """
+    mock_transaction = MagicMock()
+    mock_session.write_transaction.side_effect = \
+        lambda unit_of_work, *args, **kwargs: unit_of_work(mock_transaction, *args, **kwargs)
+    return mock_transaction
+
+
+class _FakeSession:
+    def __init__(self, driver: '_FakeDriver', access_mode: Optional[str], bookmarks: Optional[List[str]]) -> None:
+        self._driver = driver
+        self._access_mode = access_mode
+        self._bookmarks = bookmarks
+        self._last_bookmark = None  # type: Optional[str]
+
+    def __enter__(self) -> '_FakeSession':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def run(self, statement: str, **params: Any) -> MagicMock:
+        self._driver.queries.append((self._access_mode or WRITE_ACCESS, self._bookmarks))
+        return MagicMock()
+
+    def write_transaction(self, unit_of_work: Any) -> Any:
+        self._driver.queries.append((WRITE_ACCESS, self._bookmarks))
+        result = unit_of_work(MagicMock())
+        self._last_bookmark = 'bookmark{}'.format(len(self._driver.queries))
+        return result
+
+    def last_bookmark(self) -> Optional[str]:
+        return self._last_bookmark
+
+
+class _FakeDriver:
+    """
+    Stands in for a routing driver, recording the access mode and bookmarks of each query
+    """
+
+    def __init__(self) -> None:
+        self.queries = []  # type: List[Tuple[str, Optional[List[str]]]]
+
+    def session(self, access_mode: Optional[str] = None, **parameters: Any) -> _FakeSession:
+        return _FakeSession(self, access_mode, parameters.get('bookmarks'))
+
+
 class TestNeo4jProxy(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -187,6 +241,56 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(str(expected), str(table))
 
+    def _tables_records(self) -> Any:
+        table_record = dict(self.col_usage_return_value[0], **self.table_level_return_value.single.return_value)
+        table_record['tbl'] = {'name': 'foo_table', 'key': 'foo'}
+        col_records = [dict(col, tbl_key='foo') for col in self.col_usage_return_value]
+        reader_records = [{'tbl_key': 'foo', 'readers': [{'email': 'reader@example.com', 'read_count': 3}]}]
+        return [table_record], col_records, reader_records
+
+    def test_get_tables_summary(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            table_records, _, _ = self._tables_records()
+            mock_execute.return_value = table_records
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            tables = neo4j_proxy.get_tables(table_uris=['missing', 'foo', 'foo'])
+
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(mock_execute.call_args[1]['param_dict']['tbl_keys'], ['missing', 'foo', 'foo'])
+            self.assertIn('WHERE tbl.key IN $tbl_keys', mock_execute.call_args[1]['statement'])
+            self.assertIsNone(tables[0])
+            table = cast(Table, tables[1])
+            self.assertIs(tables[2], table)
+            self.assertEqual(table.description, 'foo description')
+            self.assertEqual(table.owners, [User(email='tester@example.com')])
+            self.assertEqual(table.columns, [])
+            self.assertEqual(table.table_readers, [])
+
+    def test_get_tables_full(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = self._tables_records()
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            tables = neo4j_proxy.get_tables(table_uris=['foo', 'missing'], detail_level=TableDetailLevel.Full)
+
+            # table level fields, columns and readers of all the tables
+            self.assertEqual(mock_execute.call_count, 3)
+            table = cast(Table, tables[0])
+            self.assertEqual([col.name for col in table.columns], ['bar_id_1', 'bar_id_2'])
+            self.assertEqual(table.table_readers, [Reader(user=User(email='reader@example.com'), read_count=3)])
+            self.assertIsNone(tables[1])
+
+    def test_get_tables_none_found(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertEqual(neo4j_proxy.get_tables(table_uris=['missing'], detail_level=TableDetailLevel.Full),
+                             [None])
+            self.assertEqual(mock_execute.call_count, 1)
+
     def test_get_table_view_only(self) -> None:
         col_usage_return_value = copy.deepcopy(self.col_usage_return_value)
         for col in col_usage_return_value:
@@ -239,6 +343,119 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(str(expected), str(table))
 
+    def test_get_table_single_query(self) -> None:
+        readers = [{'email': 'reader@example.com', 'read_count': 10}]
+        single_record = MagicMock()
+        single_record.single.return_value = dict(self.table_level_return_value.single.return_value,
+                                                 db={'name': 'hive'},
+                                                 clstr={'name': 'gold'},
+                                                 schema={'name': 'foo_schema'},
+                                                 tbl={'name': 'foo_table'},
+                                                 tbl_dscrpt={'description': 'foo description'},
+                                                 # reversed to make sure columns are sorted by sort_order
+                                                 col_records=list(reversed(self.col_usage_return_value)),
+                                                 total_columns=2,
+                                                 readers=readers)
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [self.col_usage_return_value, readers, self.table_level_return_value]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            expected = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.app.config['NEO4J_GET_TABLE_MODE'] = 'single_query'
+            mock_execute.reset_mock()
+            mock_execute.side_effect = [single_record]
+            table = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.assertEqual(mock_execute.call_count, 1)
+            self.assertEqual(str(expected), str(table))
+
+    def test_get_table_single_query_not_found(self) -> None:
+        self.app.config['NEO4J_GET_TABLE_MODE'] = 'single_query'
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value.single.return_value = None
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertRaises(NotFoundException, neo4j_proxy.get_table, table_uri='dummy_uri')
+
+    def test_get_table_concurrent(self) -> None:
+        readers = [{'email': 'reader@example.com', 'read_count': 10}]
+
+        def execute(*, statement: str, param_dict: Dict[str, Any]) -> Any:
+            if 'READ' in statement:
+                return readers
+            if 'COLUMN' in statement:
+                return self.col_usage_return_value
+            return self.table_level_return_value
+
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = execute
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            expected = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.app.config['NEO4J_GET_TABLE_MODE'] = 'concurrent'
+            table = neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            self.assertEqual(mock_execute.call_count, 6)
+            self.assertEqual(str(expected), str(table))
+
+    def test_get_table_concurrent_not_found(self) -> None:
+        self.app.config['NEO4J_GET_TABLE_MODE'] = 'concurrent'
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertRaises(NotFoundException, neo4j_proxy.get_table, table_uri='dummy_uri')
+
+    def test_query_executor_size(self) -> None:
+        with patch.object(GraphDatabase, 'driver'):
+            self.assertEqual(Neo4jProxy(host='DOES_NOT_MATTER', port=0000, num_conns=10)._query_executor.max_workers,
+                             5)
+            self.app.config['NEO4J_QUERY_EXECUTOR_POOL_RATIO'] = 0.01
+            self.assertEqual(Neo4jProxy(host='DOES_NOT_MATTER', port=0000, num_conns=10)._query_executor.max_workers,
+                             1)
+
+    def test_get_table_queries_without_cartesian_product(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [self.col_usage_return_value, [], self.table_level_return_value]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.get_table(table_uri='dummy_uri')
+
+            col_statement = mock_execute.call_args_list[0][1]['statement']
+            table_statement = mock_execute.call_args_list[2][1]['statement']
+            # one-to-many relations must not be chained with OPTIONAL MATCH and de-duplicated afterwards
+            for statement in (col_statement, table_statement):
+                self.assertNotIn('collect(distinct', statement)
+            self.assertNotIn('OPTIONAL MATCH (col:Column)-[:STAT]', col_statement)
+            self.assertIn('[(col)-[:STAT]->(stat:Stat) | stat] as col_stats', col_statement)
+            self.assertEqual(table_statement.count('OPTIONAL MATCH'), 0)
+
+    def test_get_table_columns_paged(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = self.col_usage_return_value[1:]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            columns = neo4j_proxy.get_table_columns(table_uri='dummy_uri', offset=1, limit=1,
+                                                    fields={ColumnField.Badges})
+
+            self.assertEqual([column.name for column in columns], ['bar_id_2'])
+            call_kwargs = mock_execute.call_args[1]
+            self.assertEqual(call_kwargs['param_dict'], {'tbl_key': 'dummy_uri', 'col_offset': 1, 'col_limit': 1})
+            self.assertIn('SKIP $col_offset LIMIT $col_limit', call_kwargs['statement'])
+            self.assertIn('[] as col_stats', call_kwargs['statement'])
+            self.assertIn('[(col)-[:HAS_BADGE]->(badge:Badge) | badge] as col_badges', call_kwargs['statement'])
+
+    def test_get_table_columns_past_last_column(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.side_effect = [[], self.col_usage_return_value[:1], self.table_level_return_value, []]
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertEqual(neo4j_proxy.get_table_columns(table_uri='dummy_uri', offset=10), [])
+
+            mock_execute.side_effect = [[], self.col_usage_return_value[:1], [], self.table_level_return_value]
+            table = neo4j_proxy.get_table(table_uri='dummy_uri', column_offset=10)
+            self.assertEqual(table.name, 'foo_table')
+            self.assertEqual(table.columns, [])
+
     def test_get_table_with_valid_description(self) -> None:
         """
         Test description is returned for table
@@ -285,23 +502,16 @@ class TestNeo4jProxy(unittest.TestCase):
         :return:
         """
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.put_table_description(table_uri='test_table',
                                               description='test_description')
 
             self.assertEquals(mock_run.call_count, 2)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_get_column_with_valid_description(self) -> None:
         """
@@ -353,16 +563,9 @@ class TestNeo4jProxy(unittest.TestCase):
         :return:
         """
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.put_column_description(table_uri='test_table',
@@ -370,107 +573,256 @@ class TestNeo4jProxy(unittest.TestCase):
                                                description='test_description')
 
             self.assertEquals(mock_run.call_count, 2)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_add_owner(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.add_owner(table_uri='dummy_uri',
                                   owner='tester')
             # we call neo4j twice in add_owner call
             self.assertEquals(mock_run.call_count, 2)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_delete_owner(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.delete_owner(table_uri='dummy_uri',
                                      owner='tester')
             # we only call neo4j once in delete_owner call
             self.assertEquals(mock_run.call_count, 1)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_add_badge(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.add_badge(id='dummy_uri',
                                   badge_name='hive')
             # we call neo4j twice in add_tag call
             self.assertEquals(mock_run.call_count, 3)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_add_tag(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.add_tag(id='dummy_uri',
                                 tag='hive')
             # we call neo4j twice in add_tag call
             self.assertEquals(mock_run.call_count, 3)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
-    def test_delete_tag(self) -> None:
+    def test_apply_mutations(self) -> None:
+        self.app.config['NEO4J_BULK_MUTATION_CHUNK_SIZE'] = 3
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            # every row but the one of 'missing' matches a resource
+            mock_transaction.run.side_effect = \
+                lambda statement, params: [{'i': row['i']} for row in params['rows'] if row['key'] != 'missing']
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            results = neo4j_proxy.apply_mutations(mutations=[
+                Mutation(type=MutationType.AddTag, id='foo', tag='tag1'),
+                Mutation(type=MutationType.AddTag, id='missing', tag='tag1'),
+                Mutation(type=MutationType.AddOwner, id='foo', owner='owner'),
+                Mutation(type=MutationType.AddTag, id='bar', tag='tag1'),
+                Mutation(type=MutationType.AddTag, id='bar', tag='tag1', resource_type=ResourceType.Dashboard),
+            ])
+
+            self.assertEqual([result.status for result in results],
+                             [MutationStatus.Success, MutationStatus.NotFound, MutationStatus.Success,
+                              MutationStatus.Success, MutationStatus.Success])
+            # one transaction per chunk of 3, one statement per run of the same type and resource type
+            self.assertEqual(mock_session.write_transaction.call_count, 2)
+            statements = [c[0][0] for c in mock_transaction.run.call_args_list]
+            self.assertEqual(len(statements), 4)
+            self.assertIn('MATCH (n:Table {key: row.key})', statements[0])
+            self.assertIn('MERGE (n)-[:OWNER]->(u)', statements[1])
+            self.assertIn('MATCH (n:Dashboard {key: row.key})', statements[3])
+            self.assertEqual([row['key'] for row in mock_transaction.run.call_args_list[0][0][1]['rows']],
+                             ['foo', 'missing'])
+
+    def test_apply_mutations_failed_chunk(self) -> None:
+        self.app.config['NEO4J_BULK_MUTATION_CHUNK_SIZE'] = 1
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_transaction.run.side_effect = [RuntimeError('boom'), [{'i': 1}]]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            results = neo4j_proxy.apply_mutations(mutations=[
+                Mutation(type=MutationType.PutDescription, id='foo', description='desc'),
+                Mutation(type=MutationType.DeleteBadge, id='foo', badge_name='beta', category='table_status'),
+            ])
+
+            self.assertEqual(results[0].status, MutationStatus.Failed)
+            self.assertEqual(results[0].message, 'boom')
+            self.assertEqual(results[1].status, MutationStatus.Success)
+            self.assertEqual(mock_session.write_transaction.call_count, 2)
+            # both sessions were closed, failed or not
+            self.assertEqual(mock_driver.return_value.session.return_value.__exit__.call_count, 2)
+
+    def test_write_transaction_releases_session_on_error(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_transaction.run.return_value.single.return_value = None
 
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            with self.assertRaises(NotFoundException):
+                neo4j_proxy.add_tag(id='missing', tag='hive')
+
+            self.assertEqual(mock_transaction.run.call_count, 1)
+            self.assertEqual(mock_driver.return_value.session.return_value.__exit__.call_count, 1)
+            mock_driver.return_value.session.assert_called_with(max_retry_time=30.0)
+
+    def test_write_transaction_metrics(self) -> None:
+        self.app.config['NEO4J_WRITE_MAX_RETRY_TIME_SEC'] = 5
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch('metadata_service.proxy.neo4j_proxy.statsd_utilities') as mock_statsd:
+            mock_driver.return_value._pool.connections = {'a': [], 'b': []}
+            mock_driver.return_value._pool.in_use_connection_count.side_effect = {'a': 2, 'b': 1}.get
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
             mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
 
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            def write_transaction(unit_of_work: Any) -> Any:
+                # the driver retries the unit of work after a transient error
+                unit_of_work(mock_transaction)
+                return unit_of_work(mock_transaction)
+
+            mock_session.write_transaction.side_effect = write_transaction
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.delete_tag(id='dummy_uri', tag='hive')
+
+            mock_driver.return_value.session.assert_called_with(max_retry_time=5)
+            self.assertEqual(mock_statsd.timing.call_args[1]['stat'], 'write_transaction.pool_wait')
+            mock_statsd.gauge.assert_called_once_with(prefix='metadata_service.proxy.neo4j_proxy',
+                                                      stat='pool.in_use', value=3)
+            mock_statsd.incr.assert_called_once_with(prefix='metadata_service.proxy.neo4j_proxy',
+                                                     stat='write_transaction.retry')
+
+    def test_apply_mutations_unsupported(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_transaction.run.return_value = [{'i': 1}]
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            results = neo4j_proxy.apply_mutations(mutations=[
+                Mutation(type=MutationType.AddOwner, id='dash', owner='owner', resource_type=ResourceType.Dashboard),
+                Mutation(type=MutationType.PutDescription, id='foo', description='desc'),
+            ])
+
+            self.assertEqual(results[0].status, MutationStatus.Failed)
+            self.assertEqual(results[0].message, 'Owners can only be changed on tables')
+            self.assertEqual(results[1].status, MutationStatus.Success)
+            # the unsupported mutation is not sent
+            self.assertEqual([row['key'] for row in mock_transaction.run.call_args[0][1]['rows']], ['foo'])
+
+    def test_get_pool_stats(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            pool = mock_driver.return_value._pool
+            pool.acquire_direct.return_value = 'connection'
+            pool.connector.side_effect = lambda address, **kwargs: MagicMock()
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            self.assertEqual(pool.acquire_direct('a'), 'connection')
+
+            # the driver opens connections through its connector, and closes them itself
+            opened = [pool.connector(address) for address in ('a', 'a', 'b', 'b')]
+            opened[3].close()
+            pool.connections = {'a': [MagicMock(in_use=True), MagicMock(in_use=False)],
+                                'b': [MagicMock(in_use=True)]}
+            pool_stats = neo4j_proxy.get_pool_stats()
+
+        assert pool_stats is not None
+        self.assertEqual((pool_stats.in_use, pool_stats.idle, pool_stats.opened, pool_stats.closed,
+                          pool_stats.acquisitions),
+                         (2, 1, 4, 1, 1))
+
+    def test_driver_version_of_pool_internals(self) -> None:
+        # Neo4jProxy._get_driver_pool relies on internals of the connection pool of the neo4j 1.7 driver. Upgrading
+        # the driver means checking them again, the pool telemetry is disabled with a warning otherwise.
+        self.assertTrue(neo4j.__version__.startswith('1.7.'),
+                        'pool telemetry not checked against neo4j {}'.format(neo4j.__version__))
+
+    def test_get_pool_stats_unknown_driver_pool(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver, \
+                patch('metadata_service.proxy.neo4j_proxy.LOGGER') as mock_logger:
+            mock_driver.return_value._pool = object()
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+
+            self.assertIsNone(neo4j_proxy.get_pool_stats())
+            self.assertIsNone(neo4j_proxy.get_pool_stats())
+
+        # logged once, when the proxy is created
+        mock_logger.warning.assert_called_once()
+
+    def test_read_write_routing(self) -> None:
+        fake_driver = _FakeDriver()
+        with patch.object(GraphDatabase, 'driver', return_value=fake_driver):
+            neo4j_proxy = Neo4jProxy(host='bolt+routing://DOES_NOT_MATTER', port=0000)
+            neo4j_proxy.get_tags()
+            neo4j_proxy.get_table_description(table_uri='dummy_uri')
+            neo4j_proxy.delete_tag(id='dummy_uri', tag='hive')
+
+        self.assertEqual(fake_driver.queries, [(READ_ACCESS, None), (READ_ACCESS, None), (WRITE_ACCESS, None)])
+
+    def test_read_your_writes(self) -> None:
+        fake_driver = _FakeDriver()
+        with patch.object(GraphDatabase, 'driver', return_value=fake_driver):
+            neo4j_proxy = Neo4jProxy(host='bolt+routing://DOES_NOT_MATTER', port=0000)
+            with self.app.app_context(), self.app.test_request_context():
+                neo4j_proxy.delete_tag(id='dummy_uri', tag='hive')
+                neo4j_proxy.get_tags()
+                neo4j_proxy.delete_tag(id='dummy_uri', tag='hive')
+
+            # the bookmark is scoped to the request
+            with self.app.app_context(), self.app.test_request_context():
+                neo4j_proxy.get_tags()
+
+        self.assertEqual(fake_driver.queries, [(WRITE_ACCESS, None),
+                                               (READ_ACCESS, ['bookmark1']),
+                                               (WRITE_ACCESS, ['bookmark1']),
+                                               (READ_ACCESS, None)])
+
+    def test_read_your_writes_on_query_executor(self) -> None:
+        with patch.object(GraphDatabase, 'driver', return_value=_FakeDriver()):
+            neo4j_proxy = Neo4jProxy(host='bolt+routing://DOES_NOT_MATTER', port=0000)
+            with self.app.app_context(), self.app.test_request_context():
+                neo4j_proxy.delete_tag(id='dummy_uri', tag='hive')
+                bookmark_parameters = neo4j_proxy._query_executor.submit(neo4j_proxy._bookmark_parameters).result()
+
+        self.assertEqual(bookmark_parameters, {'bookmarks': ['bookmark1']})
+
+    def test_delete_tag(self) -> None:
+        with patch.object(GraphDatabase, 'driver') as mock_driver:
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.delete_tag(id='dummy_uri',
                                    tag='hive')
             # we only call neo4j once in delete_tag call
             self.assertEquals(mock_run.call_count, 1)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_get_tags(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
@@ -543,6 +895,52 @@ class TestNeo4jProxy(unittest.TestCase):
 
             self.assertEqual(actual.__repr__(), expected.__repr__())
 
+    def test_get_popular_tables_background_refresh(self) -> None:
+        self.app.config['NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC'] = 600
+        self.app.config['NEO4J_POPULAR_TABLES_REFRESH_NUM_ENTRIES'] = 3
+        with patch.object(GraphDatabase, 'driver'), \
+                patch.object(Neo4jProxy, '_query_popular_tables_uris') as mock_query, \
+                patch.object(Neo4jProxy, '_get_popular_tables_uris') as mock_cached, \
+                patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_query.return_value = ['foo', 'bar', 'baz']
+            mock_cached.return_value = ['foo', 'bar', 'baz', 'qux']
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            try:
+                neo4j_proxy.get_popular_tables(num_entries=2)
+                mock_query.assert_called_once_with(3)
+                self.assertEqual(mock_execute.call_args[1]['param_dict']['table_uris'], ['foo', 'bar'])
+                mock_cached.assert_not_called()
+
+                # more entries than the ranking holds
+                neo4j_proxy.get_popular_tables(num_entries=4)
+                mock_cached.assert_called_once_with(4)
+            finally:
+                neo4j_proxy._popular_tables_refresher.stop()  # type: ignore
+
+    def test_get_popular_tables_before_warm_up(self) -> None:
+        self.app.config['NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC'] = 600
+        self.app.config['NEO4J_POPULAR_TABLES_WARM_UP_TIMEOUT_SEC'] = 0.01
+        release = Event()
+        with patch.object(GraphDatabase, 'driver'), \
+                patch.object(Neo4jProxy, '_query_popular_tables_uris') as mock_query, \
+                patch.object(Neo4jProxy, '_get_popular_tables_uris') as mock_cached, \
+                patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            # the first ranking takes longer than the request is willing to wait
+            mock_query.side_effect = lambda num_entries: release.wait(5) and []
+            mock_cached.return_value = ['foo']
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            try:
+                neo4j_proxy.get_popular_tables(num_entries=2)
+                mock_cached.assert_called_once_with(2)
+                self.assertEqual(mock_execute.call_args[1]['param_dict']['table_uris'], ['foo'])
+            finally:
+                neo4j_proxy._popular_tables_refresher.stop()  # type: ignore
+                release.set()
+
     def test_get_user(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
             mock_execute.return_value.single.return_value = {
@@ -648,6 +1046,23 @@ class TestNeo4jProxy(unittest.TestCase):
             self.assertEqual(result['table'][0].cluster, 'cluster')
             self.assertEqual(result['table'][0].schema, 'schema')
 
+    def test_get_table_by_user_relation_page(self) -> None:
+        with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
+            mock_execute.return_value = []
+
+            neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
+            result = neo4j_proxy.get_table_by_user_relation(user_email='test_user',
+                                                            relation_type=UserResourceRel.follow,
+                                                            after='hive://gold.core/table', limit=10)
+
+            # an empty page past the first one is not an error
+            self.assertEqual(result, {'table': []})
+            statement = mock_execute.call_args[1]['statement']
+            self.assertIn('WHERE resource.key > $after', statement)
+            self.assertIn('ORDER BY resource.key LIMIT $limit', statement)
+            self.assertEqual(mock_execute.call_args[1]['param_dict'],
+                             {'user_key': 'test_user', 'after': 'hive://gold.core/table', 'limit': 10})
+
     def test_get_dashboard_by_user_relation(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
             mock_execute.return_value = [
@@ -683,16 +1098,9 @@ class TestNeo4jProxy(unittest.TestCase):
 
     def test_add_resource_relation_by_user(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.add_resource_relation_by_user(id='dummy_uri',
@@ -700,20 +1108,13 @@ class TestNeo4jProxy(unittest.TestCase):
                                                       relation_type=UserResourceRel.follow,
                                                       resource_type=ResourceType.Table)
             self.assertEquals(mock_run.call_count, 2)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_delete_resource_relation_by_user(self) -> None:
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.delete_resource_relation_by_user(id='dummy_uri',
@@ -721,7 +1122,7 @@ class TestNeo4jProxy(unittest.TestCase):
                                                          relation_type=UserResourceRel.follow,
                                                          resource_type=ResourceType.Table)
             self.assertEquals(mock_run.call_count, 1)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
     def test_get_invalid_user(self) -> None:
         with patch.object(GraphDatabase, 'driver'), patch.object(Neo4jProxy, '_execute_cypher_query') as mock_execute:
@@ -934,23 +1335,16 @@ class TestNeo4jProxy(unittest.TestCase):
         :return:
         """
         with patch.object(GraphDatabase, 'driver') as mock_driver:
-            mock_session = MagicMock()
-            mock_driver.return_value.session.return_value = mock_session
-
-            mock_transaction = MagicMock()
-            mock_session.begin_transaction.return_value = mock_transaction
-
-            mock_run = MagicMock()
-            mock_transaction.run = mock_run
-            mock_commit = MagicMock()
-            mock_transaction.commit = mock_commit
+            mock_session = mock_driver.return_value.session.return_value.__enter__.return_value
+            mock_transaction = _mock_write_transaction(mock_session)
+            mock_run = mock_transaction.run
 
             neo4j_proxy = Neo4jProxy(host='DOES_NOT_MATTER', port=0000)
             neo4j_proxy.put_dashboard_description(id='test_dashboard',
                                                   description='test_description')
 
             self.assertEquals(mock_run.call_count, 2)
-            self.assertEquals(mock_commit.call_count, 1)
+            self.assertEquals(mock_session.write_transaction.call_count, 1)
 
             expected_stmt = textwrap.dedent("""
             MATCH (n1:Description {key: $desc_key}), (n2:Dashboard {key: $key})
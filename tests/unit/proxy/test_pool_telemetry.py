@@ -0,0 +1,62 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+from metadata_service import create_app
+from metadata_service.entity.pool_stats import PoolStats
+from metadata_service.proxy import statsd_utilities
+from metadata_service.proxy.pool_telemetry import PoolTelemetry
+
+
+class TestPoolTelemetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.telemetry = PoolTelemetry(name='test_pool')
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_timed_acquisition(self) -> None:
+        acquire = self.telemetry.timed(lambda address: 'connection to {}'.format(address))
+
+        with patch.object(statsd_utilities, 'timing') as mock_timing:
+            self.assertEqual(acquire('foo'), 'connection to foo')
+            self.assertEqual(acquire('bar'), 'connection to bar')
+
+        self.assertEqual(self.telemetry.stats(in_use=0, idle=0).acquisitions, 2)
+        self.assertEqual(mock_timing.call_count, 2)
+        self.assertEqual(mock_timing.call_args[1]['stat'], 'test_pool.acquisition_wait')
+
+    def test_counted_connections(self) -> None:
+        connect = self.telemetry.counted(lambda address: MagicMock())
+        first, second, third = connect('a'), connect('a'), connect('b')
+        first.close()
+        # closing a connection again, e.g. when it is garbage collected, does not count it twice
+        first.close()
+        # opened and closed between two calls to stats
+        third.close()
+
+        stats = self.telemetry.stats(in_use=1, idle=0)
+
+        self.assertEqual(stats, PoolStats(in_use=1, idle=0, opened=3, closed=2))
+        self.assertEqual(second.close.call_count, 0)
+
+    def test_stats_metrics(self) -> None:
+        with patch.object(statsd_utilities, 'gauge') as mock_gauge, \
+                patch.object(statsd_utilities, 'incr') as mock_incr:
+            self.telemetry.stats(in_use=2, idle=3, opened=5, closed=0)
+            self.telemetry.stats(in_use=1, idle=3, opened=6, closed=2)
+
+        mock_gauge.assert_has_calls([call(prefix='metadata_service.proxy.pool_telemetry', stat='test_pool.in_use',
+                                          value=1),
+                                     call(prefix='metadata_service.proxy.pool_telemetry', stat='test_pool.idle',
+                                          value=3)])
+        # only the connections opened and closed since the previous call are counted
+        self.assertEqual(mock_incr.call_args_list,
+                         [call(prefix='metadata_service.proxy.pool_telemetry', stat='test_pool.opened', count=5),
+                          call(prefix='metadata_service.proxy.pool_telemetry', stat='test_pool.opened', count=1),
+                          call(prefix='metadata_service.proxy.pool_telemetry', stat='test_pool.closed', count=2)])
@@ -0,0 +1,152 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import time
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor  # noqa: F401
+from threading import Event, Thread
+from typing import Any, Callable, List, Optional  # noqa: F401
+from unittest.mock import MagicMock, patch
+
+from flask import g
+
+from metadata_service import create_app
+from metadata_service.proxy.neo4j_proxy import Neo4jProxy
+from metadata_service.proxy.single_flight import SingleFlight, single_flight
+
+
+class _Proxy:
+    def __init__(self) -> None:
+        self.calls = []  # type: List[Any]
+        self.release = Event()
+
+    @single_flight
+    def get_table(self, *, table_uri: str) -> List[str]:
+        self.calls.append(table_uri)
+        self.release.wait(5)
+        if table_uri == 'error':
+            raise RuntimeError(table_uri)
+        return [table_uri]
+
+
+class _CausalProxy(_Proxy):
+    _bookmark_parameters = staticmethod(Neo4jProxy._bookmark_parameters)
+    _single_flight_scope = Neo4jProxy._single_flight_scope
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+        self.statsd_patcher = patch('metadata_service.proxy.single_flight.statsd_utilities')
+        self.mock_statsd = self.statsd_patcher.start()
+
+    def tearDown(self) -> None:
+        self.statsd_patcher.stop()
+        self.app_context.pop()
+
+    def _stats(self, name: str) -> List[str]:
+        return [c[1]['stat'] for c in self.mock_statsd.incr.call_args_list if c[1]['stat'].endswith(name)]
+
+    def _run_concurrently(self, count: int, fn: Callable[[], Any], release: Event) -> List[Future]:
+        """
+        Calls fn from count threads and releases the leader once all the others joined its call
+        """
+        executor = ThreadPoolExecutor(max_workers=count)
+        futures = [executor.submit(fn) for _ in range(count)]
+        deadline = time.time() + 5
+        while len(self._stats('.hit')) < count - 1 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        executor.shutdown(wait=True)
+        return futures
+
+    def test_coalesces_concurrent_calls(self) -> None:
+        proxy = _Proxy()
+        futures = self._run_concurrently(5, lambda: proxy.get_table(table_uri='foo'), proxy.release)
+
+        results = [future.result() for future in futures]
+        self.assertEqual(proxy.calls, ['foo'])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(self._stats('.hit'), ['get_table.single_flight.hit'] * 4)
+        self.assertEqual(self._stats('.miss'), ['get_table.single_flight.miss'])
+        self.assertEqual(self.mock_statsd.timing.call_count, 4)
+
+    def test_propagates_error_to_all_callers(self) -> None:
+        proxy = _Proxy()
+        futures = self._run_concurrently(3, lambda: proxy.get_table(table_uri='error'), proxy.release)
+
+        for future in futures:
+            self.assertIsInstance(future.exception(), RuntimeError)
+        self.assertEqual(proxy.calls, ['error'])
+
+    def test_different_arguments_are_not_coalesced(self) -> None:
+        proxy = _Proxy()
+        proxy.release.set()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(lambda uri: proxy.get_table(table_uri=uri), ['foo', 'bar']))
+
+        self.assertEqual(results, [['foo'], ['bar']])
+        self.assertEqual(sorted(proxy.calls), ['bar', 'foo'])
+
+    def test_different_instances_are_not_coalesced(self) -> None:
+        first, second = _Proxy(), _Proxy()
+        first.release.set()
+        second.release.set()
+        first.get_table(table_uri='foo')
+        second.get_table(table_uri='foo')
+
+        self.assertEqual(first.calls, ['foo'])
+        self.assertEqual(second.calls, ['foo'])
+
+    def test_bookmarked_calls_are_not_coalesced(self) -> None:
+        proxy = _CausalProxy()
+        results = []  # type: List[Any]
+
+        def get_table(bookmark: Optional[str]) -> None:
+            with self.app.app_context():
+                if bookmark:
+                    setattr(g, '_neo4j_bookmark', bookmark)
+                results.append(proxy.get_table(table_uri='foo'))
+
+        reader = Thread(target=get_table, args=(None,))
+        reader.start()
+        deadline = time.time() + 5
+        while not proxy.calls and time.time() < deadline:
+            time.sleep(0.001)
+        writer = Thread(target=get_table, args=('bookmark:1',))
+        writer.start()
+        while len(proxy.calls) < 2 and time.time() < deadline:
+            time.sleep(0.001)
+        proxy.release.set()
+        reader.join(5)
+        writer.join(5)
+
+        self.assertEqual(proxy.calls, ['foo', 'foo'])
+        self.assertEqual(self._stats('.hit'), [])
+        self.assertEqual(len(results), 2)
+
+    def test_does_not_cache(self) -> None:
+        flight = SingleFlight(name='test')
+        fn = MagicMock(return_value='foo')
+
+        self.assertEqual(flight.do('key', fn), 'foo')
+        self.assertEqual(flight.do('key', fn), 'foo')
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(flight._calls, {})
+
+    def test_disabled(self) -> None:
+        self.app.config['PROXY_SINGLE_FLIGHT'] = False
+        proxy = _Proxy()
+        proxy.release.set()
+        proxy.get_table(table_uri='foo')
+
+        self.assertEqual(proxy.calls, ['foo'])
+        self.mock_statsd.incr.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# Copyright Contributors to the Amundsen project.
+# SPDX-License-Identifier: Apache-2.0
+
+import unittest
+from typing import Any, Dict, List, Optional  # noqa: F401
+from unittest.mock import MagicMock
+
+from metadata_service import create_app
+from metadata_service.proxy.user_details import UserDetailCache, get_user_details, get_users_details
+
+
+class TestUserDetails(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = create_app(config_module_class='metadata_service.config.LocalConfig')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self) -> None:
+        self.app_context.pop()
+
+    def test_no_method_configured(self) -> None:
+        self.assertIsNone(get_user_details('foo'))
+
+    def test_detail_method_cached(self) -> None:
+        detail_method = MagicMock(side_effect=lambda user_id: {'email': user_id} if user_id != 'unknown' else None)
+        self.app.config['USER_DETAIL_METHOD'] = detail_method
+
+        self.assertEqual(get_user_details('foo'), {'email': 'foo'})
+        self.assertIsNone(get_user_details('unknown'))
+        self.assertEqual(get_users_details(['foo', 'unknown']), {'foo': {'email': 'foo'}, 'unknown': None})
+
+        self.assertEqual(detail_method.call_count, 2)
+
+    def test_detail_method_error_not_cached(self) -> None:
+        detail_method = MagicMock(side_effect=[ValueError('directory unavailable'), {'email': 'foo'}])
+        self.app.config['USER_DETAIL_METHOD'] = detail_method
+
+        self.assertRaises(ValueError, get_user_details, 'foo')
+        self.assertEqual(get_user_details('foo'), {'email': 'foo'})
+
+    def test_batch_method(self) -> None:
+        batch_method = MagicMock(side_effect=lambda user_ids: {user_id: {'email': user_id}
+                                                               for user_id in user_ids if user_id != 'unknown'})
+        self.app.config['USER_DETAIL_METHOD'] = MagicMock()
+        self.app.config['USER_DETAIL_BATCH_METHOD'] = batch_method
+
+        self.assertEqual(get_users_details(['foo', 'bar', 'foo', 'unknown']),
+                         {'foo': {'email': 'foo'}, 'bar': {'email': 'bar'}, 'unknown': None})
+        self.assertEqual(get_users_details(['bar', 'baz']), {'bar': {'email': 'bar'}, 'baz': {'email': 'baz'}})
+
+        self.assertEqual([call[0][0] for call in batch_method.call_args_list], [['foo', 'bar', 'unknown'], ['baz']])
+        self.app.config['USER_DETAIL_METHOD'].assert_not_called()
+
+    def test_cache_bounds(self) -> None:
+        cache = UserDetailCache(ttl_sec=60, negative_ttl_sec=0, max_size=2)
+        lookup = MagicMock(side_effect=lambda user_ids: {user_id: {'email': user_id} for user_id in user_ids
+                                                         if user_id != 'unknown'})
+
+        cache.get_many(['a', 'b', 'unknown'], lookup)
+        # unknown users are not cached when negative_ttl_sec is 0, 'a' becomes the most recently used user
+        cache.get_many(['unknown', 'a'], lookup)
+        # 'b' is dropped to make room for 'c'
+        cache.get_many(['c'], lookup)
+        cache.get_many(['b', 'a'], lookup)
+
+        self.assertEqual([call[0][0] for call in lookup.call_args_list], [['a', 'b', 'unknown'], ['unknown'], ['c'],
+                                                                          ['b']])
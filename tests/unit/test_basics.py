@@ -2,10 +2,16 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import unittest
+from unittest.mock import patch
 
 from flask import current_app
 
 from metadata_service import create_app
+from metadata_service.config import LocalConfig
+
+
+class PopularTablesRefreshConfig(LocalConfig):
+    NEO4J_POPULAR_TABLES_REFRESH_INTERVAL_SEC = 600
 
 
 class BasicTestCase(unittest.TestCase):
@@ -24,3 +30,11 @@ class BasicTestCase(unittest.TestCase):
 
     def test_app_exists(self) -> None:
         self.assertFalse(current_app is None)
+
+    def test_proxy_client_created_with_app_when_popular_tables_refresh(self) -> None:
+        with patch('metadata_service.get_proxy_client') as mock_get_proxy_client:
+            create_app(config_module_class='metadata_service.config.LocalConfig')
+            mock_get_proxy_client.assert_not_called()
+
+            create_app(config_module_class='tests.unit.test_basics.PopularTablesRefreshConfig')
+            mock_get_proxy_client.assert_called_once_with()